@@ -0,0 +1,68 @@
+"""Agent for condensing inspiration transcripts into briefs."""
+
+import logging
+from typing import Optional
+
+from app.llm.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+# Briefs are language-independent so one brief serves projects in any language
+BRIEF_LANGUAGE = "en"
+
+
+class CondensationAgent(BaseAgent):
+    """Agent specialized in summarizing transcript excerpts and merging them into briefs.
+
+    Its calls are many and simple: give it a cheap model in AGENT_PROFILES.
+    """
+
+    def __init__(self, temperature: float = 0.3):
+        """Initialize condensation agent.
+
+        Args:
+            temperature: Low temperature for faithful summaries
+        """
+        super().__init__(prompt_name=None, temperature=temperature, translate_prompt=False)
+
+    def _get_max_tokens(self) -> Optional[int]:
+        """Get maximum tokens for notes and briefs.
+
+        Returns:
+            Max tokens (a brief is at most ~1000 words)
+        """
+        return 2000
+
+    async def summarize_chunk(self, chunk: str, position: str) -> str:
+        """Summarize one excerpt of a transcript into notes (map step).
+
+        Args:
+            chunk: Transcript excerpt
+            position: Position of the excerpt, e.g. "2/5"
+
+        Returns:
+            Notes on the excerpt
+        """
+        notes = await super().generate(
+            language=BRIEF_LANGUAGE,
+            prompt_name="condensation_chunk_prompt",
+            chunk=chunk,
+            position=position
+        )
+        return notes.strip()
+
+    async def write_brief(self, material: str) -> str:
+        """Merge notes (or a short transcript) into one brief (reduce step).
+
+        Args:
+            material: Notes or transcript of one video
+
+        Returns:
+            Inspiration brief
+        """
+        brief = await super().generate(
+            language=BRIEF_LANGUAGE,
+            prompt_name="condensation_brief_prompt",
+            material=material
+        )
+        return brief.strip()
@@ -31,6 +31,14 @@ class DescriptionAgent(BaseAgent):
         """
         return 500
 
+    def _get_input_token_budget(self) -> Optional[int]:
+        """Get token budget of the prompt inputs.
+
+        Returns:
+            Token budget
+        """
+        return 6000
+
     async def generate_description(
         self,
         script_text: str,
@@ -49,6 +57,9 @@ class DescriptionAgent(BaseAgent):
         """
         logger.info(f"Generating description for script ({len(script_text)} chars)")
 
+        fitted = self._fit_inputs({"script text": script_text}, {"keywords": keywords or ""})
+        script_text, keywords = fitted["script text"], fitted["keywords"]
+
         description = await super().generate(
             language=language,
             script_text=script_text,
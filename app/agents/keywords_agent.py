@@ -27,9 +27,17 @@ class KeywordsAgent(BaseAgent):
         """Get maximum tokens for keywords generation.
 
         Returns:
-            Max tokens
+            Max tokens (a comma-separated list is short)
         """
-        return 4000
+        return 300
+
+    def _get_input_token_budget(self) -> Optional[int]:
+        """Get token budget of the prompt inputs.
+
+        Returns:
+            Token budget (the beginning of a long script is enough for keywords)
+        """
+        return 6000
 
     async def generate_keywords(
         self,
@@ -50,8 +58,9 @@ class KeywordsAgent(BaseAgent):
             Comma-separated keywords
         """
         logger.info(f"Generating keywords for use_case={use_case}")
-        
-        # Truncate texts if too long
+
+        fitted = self._fit_inputs({"script text": script_text}, {"description": description, "use case": use_case or ""})
+        script_text, description = fitted["script text"], fitted["description"]
         logger.info("Generation des keywords")
 
         keywords = await super().generate(
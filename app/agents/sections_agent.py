@@ -1,16 +1,61 @@
 """Agent for generating script sections."""
 
 import logging
-from typing import Optional, Tuple, List
+from typing import Awaitable, Callable, Optional, Tuple, List
 from pathlib import Path
 
 from app.core.config import settings
 from string import Template
 from app.llm.base_agent import BaseAgent
+from app.services.transcription_service import TRANSCRIPT_SEPARATOR
 
 
 logger = logging.getLogger(__name__)
 
+SECTION_MARKER = "---SECTION---"
+
+
+class SectionStreamParser:
+    """Splits streamed script text into sections as soon as each one is complete.
+
+    A section is complete when the next SECTION_MARKER arrives; the last one
+    when the stream ends. Markers split across deltas are handled, and empty
+    sections are skipped like in the non-streaming parser.
+    """
+
+    def __init__(self, marker: Optional[str] = SECTION_MARKER):
+        """Initialize parser.
+
+        Args:
+            marker: Section separator (None keeps the whole text as one section)
+        """
+        self.marker = marker
+        self.buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """Add a text delta.
+
+        Args:
+            delta: Text received from the stream
+
+        Returns:
+            Sections completed by this delta (stripped)
+        """
+        self.buffer += delta
+        if self.marker is None:
+            return []
+        *completed, self.buffer = self.buffer.split(self.marker)
+        return [section.strip() for section in completed if section.strip()]
+
+    def finish(self) -> List[str]:
+        """Flush the last section once the stream has ended.
+
+        Returns:
+            The remaining section, if not empty
+        """
+        section, self.buffer = self.buffer.strip(), ""
+        return [section] if section else []
+
 
 class SectionsAgent(BaseAgent):
     """Agent specialized in generating structured script sections."""
@@ -30,6 +75,14 @@ class SectionsAgent(BaseAgent):
         """Get maximum tokens for this agent (8000 for sections)."""
         return 8000
 
+    def _get_input_token_budget(self) -> Optional[int]:
+        """Get token budget of the prompt inputs (description + inspiration transcripts).
+
+        Returns:
+            Token budget
+        """
+        return 24000
+
     async def generate_section(
         self,
         description: str,
@@ -38,7 +91,9 @@ class SectionsAgent(BaseAgent):
         language: str = "en",
         duration: Optional[int] = None,
         nb_section: Optional[int] = None,
-        inspiration_content: str = ""
+        inspirations: Optional[List[str]] = None,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_section: Optional[Callable[[int, str], Awaitable[None]]] = None
     ) -> Tuple[List[str], str]:
         """Generate script sections.
 
@@ -49,7 +104,12 @@ class SectionsAgent(BaseAgent):
             language: Target language
             duration: Target duration in seconds
             nb_section: Number of sections
-            inspiration_content: Transcribed inspiration videos
+            inspirations: Transcripts of the inspiration videos (trimmed to
+                the agent's input token budget, split fairly between videos)
+            on_delta: Optional callback receiving text deltas as they are
+                generated (switches the LLM call to streaming mode)
+            on_section: Optional callback receiving (index, text) of each
+                section as soon as it is complete (also switches to streaming)
 
         Returns:
             Tuple of (list of sections, concatenated script text)
@@ -64,26 +124,57 @@ class SectionsAgent(BaseAgent):
         )
 
         # Prepare inspiration content message
+        inspirations = [text for text in inspirations or [] if text]
+        if inspirations:
+            names = [f"inspiration transcript {index}" for index in range(1, len(inspirations) + 1)]
+            fitted = self._fit_inputs(
+                dict(zip(names, inspirations)),
+                {"description": description, "use case": use_case or "", "style": style or ""},
+            )
+            description = fitted["description"]
+            inspirations = [fitted[name] for name in names if fitted[name]]
+        inspiration_content = TRANSCRIPT_SEPARATOR.join(inspirations)
         if inspiration_content:
             inspiration_content = "Inspiration Content : " + inspiration_content
         
 
         # Select appropriate prompt name
+        # (passed per call: the agent instance is shared by concurrent requests)
         if nb_section == 1:
-            self.prompt_name = "sections_prompt_single"
+            prompt_name = "sections_prompt_single"
         else:
-            self.prompt_name = "sections_prompt_multiple"
+            prompt_name = "sections_prompt_multiple"
         
+        prompt_values = dict(
+            description=description,
+            use_case=use_case,
+            style=style,
+            duration=duration,
+            nb_section=nb_section,
+            inspiration_content=inspiration_content,
+        )
         try:
-            script_output = await super().generate(
-                language=language,
-                description=description,
-                use_case=use_case,
-                style=style,
-                duration=duration,
-                nb_section=nb_section,
-                inspiration_content=inspiration_content,
-            )
+            if on_delta is None and on_section is None:
+                script_output = await super().generate(language=language, prompt_name=prompt_name, **prompt_values)
+            else:
+                chunks: List[str] = []
+                # A single-section script is never split, even if the model emits a marker
+                parser = SectionStreamParser(marker=SECTION_MARKER if nb_section > 1 else None)
+                completed = 0
+                async for delta in super().generate_stream(
+                    language=language, prompt_name=prompt_name, **prompt_values
+                ):
+                    chunks.append(delta)
+                    if on_delta:
+                        await on_delta(delta)
+                    for section in parser.feed(delta):
+                        if on_section:
+                            await on_section(completed, section)
+                        completed += 1
+                for section in parser.finish():
+                    if on_section:
+                        await on_section(completed, section)
+                script_output = "".join(chunks)
         except Exception as e:
             logger.error(f"Sections generation failed: {e}")
             raise
@@ -97,7 +188,7 @@ class SectionsAgent(BaseAgent):
             # Multiple sections separated by marker
             sections = [
                 section.strip()
-                for section in script_output.split("---SECTION---")
+                for section in script_output.split(SECTION_MARKER)
                 if section.strip()
             ]
             script_text = "\n\n".join(sections)
@@ -4,6 +4,8 @@ import logging
 import traceback
 from typing import Optional
 
+from openai.types.chat import ChatCompletionMessageParam
+
 from app.core.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
@@ -54,7 +56,7 @@ class TranslationAgent:
         logger.info(f"Translating prompt to {language_name}")
 
         try:
-            messages = [
+            messages: list[ChatCompletionMessageParam] = [
                 {"role": "system", "content": "You are a highly accurate and concise translation engine. Your ONLY task is to translate the provided English text into the specified target language. You MUST extract and output ONLY the translated text that was enclosed within '--- TEXT TO TRANSLATE ---' and '--- END TEXT ---' delimiters. DO NOT include the delimiters themselves, any conversational remarks, introductions, conclusions, or any other extraneous information. Provide ONLY the translated content."},
                 {"role": "user", "content": f"Please translate the following English text into {language_name}:\n\n--- TEXT TO TRANSLATE ---\n{prompt}\n--- END TEXT ---"}
             ]
@@ -62,7 +64,8 @@ class TranslationAgent:
             translated = await self.llm_client.chat_completion(
                 messages=messages,
                 temperature=0.3,  # Low temperature for accurate translation
-                max_tokens=2000
+                max_tokens=2000,
+                agent=self.__class__.__name__
             )
 
             logger.debug(f"Prompt translated: {len(prompt)} → {len(translated)} chars")
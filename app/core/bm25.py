@@ -0,0 +1,85 @@
+"""BM25 ranking of text chunks with an in-process inverted index."""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase terms (single characters are dropped).
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms, in order
+    """
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1]
+
+
+def term_counts(text: str) -> Counter:
+    """Count the terms of a text.
+
+    Args:
+        text: Text to index
+
+    Returns:
+        Term frequencies
+    """
+    return Counter(tokenize(text))
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents.
+
+    Postings map each term to its (document, term frequency) pairs, so a
+    query only touches the documents that contain its terms. IDF and the
+    length normalization of every document are computed once at build time.
+    """
+
+    def __init__(self, documents: list[Counter], k1: float = 1.5, b: float = 0.75):
+        """Build the index.
+
+        Args:
+            documents: Term frequencies of each document (see term_counts)
+            k1: Term frequency saturation
+            b: Document length normalization strength
+        """
+        self.k1 = k1
+        self.size = len(documents)
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for index, counts in enumerate(documents):
+            for term, frequency in counts.items():
+                self.postings[term].append((index, frequency))
+
+        lengths = [sum(counts.values()) for counts in documents]
+        average = sum(lengths) / len(lengths) if lengths else 0.0
+        self.norms = [k1 * (1 - b + b * length / average) if average else k1 for length in lengths]
+        # Non-negative IDF variant: terms present in most chunks still count a little
+        self.idf = {
+            term: math.log(1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query: str, k: int) -> list[tuple[int, float]]:
+        """Rank documents against a query.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            Up to k (document index, score) pairs, best first; documents
+            sharing no term with the query are not returned
+        """
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for index, frequency in self.postings[term]:
+                scores[index] += idf * frequency * (self.k1 + 1) / (frequency + self.norms[index])
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -1,12 +1,51 @@
 """Configuration service using Pydantic Settings."""
 
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 from pathlib import Path
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class LLMProviderConfig(BaseModel):
+    """One OpenAI-compatible LLM endpoint (entry of LLM_PROVIDERS)."""
+
+    name: str
+    base_url: str
+    api_key: str
+    model: str  # Model used when the caller does not ask for one
+    model_aliases: dict[str, str] = {}  # Requested model -> model name on this provider
+    priority: int = 0  # Lower is preferred; latency decides between equal priorities
+
+
+class AgentProfile(BaseModel):
+    """LLM call parameters of an agent (entry of AGENT_PROFILES or a request override).
+
+    Unset fields fall back to the next level: request override, then
+    AGENT_PROFILES, then the agent's built-in defaults.
+    """
+
+    model: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    timeout: Optional[float] = None  # seconds per LLM request
+    input_token_budget: Optional[int] = None  # Max tokens of variable prompt inputs (None = unlimited)
+
+    def merged(self, override: Optional["AgentProfile"]) -> "AgentProfile":
+        """Return a copy with the fields set in override replacing these ones.
+
+        Args:
+            override: Higher-priority profile (None = no change)
+
+        Returns:
+            Merged profile
+        """
+        if override is None:
+            return self
+        return self.model_copy(update=override.model_dump(exclude_none=True))
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -33,6 +72,9 @@ class Settings(BaseSettings):
     DB_NAME: str = "fastapi_db"
     mongodb_min_pool_size: int = 10
     mongodb_max_pool_size: int = 100
+    prompt_cache_ttl_seconds: int = 60  # In-memory prompt cache, i.e. max staleness on other replicas (0 = disabled)
+    # Static template first, request values appended after it (provider prefix cache hits)
+    prompt_prefix_layout: bool = True
 
     # Logging
     log_level: str = "INFO"
@@ -43,21 +85,133 @@ class Settings(BaseSettings):
     openai_api_base: str = "https://api.deepseek.com/v1"  # DeepSeek endpoint
     openai_model: str = "deepseek-chat"  # Default model
 
+    # LLM providers (JSON list of LLMProviderConfig; empty = DeepSeek settings above)
+    llm_providers: list[LLMProviderConfig] = []
+    llm_provider_health_window: int = 50  # Recent calls used for error rate and latency
+    llm_circuit_failure_threshold: int = 5  # Consecutive failures that open the circuit
+    llm_circuit_error_rate: float = 0.5  # Error rate over the window that opens the circuit
+    llm_circuit_min_samples: int = 10  # Calls in the window before the error rate counts
+    llm_circuit_cooldown: float = 30.0  # seconds before a probe call is let through
+
+    # Per-agent LLM parameters, keyed by agent class name, e.g.
+    # {"KeywordsAgent": {"model": "deepseek-chat", "max_tokens": 200, "timeout": 30, "input_token_budget": 4000}}
+    agent_profiles: dict[str, AgentProfile] = {}
+
+    # LLM prices per million tokens by model, for usage cost estimates, e.g.
+    # {"deepseek-chat": {"prompt": 0.27, "cached_prompt": 0.07, "completion": 1.1}}
+    llm_pricing: dict[str, dict[str, float]] = {}
+
+    # LLM HTTP connection pool
+    llm_http2: bool = True
+    llm_http_max_connections: int = 100
+    llm_http_max_keepalive_connections: int = 50
+    llm_http_keepalive_expiry: float = 60.0  # seconds
+    llm_connect_timeout: float = 10.0  # seconds
+    llm_read_timeout: float = 180.0  # seconds (long section generations)
+    llm_write_timeout: float = 30.0  # seconds
+    llm_pool_timeout: float = 30.0  # seconds waiting for a free connection
+    llm_prewarm_connections: int = 2  # Connections opened at startup (0 = disabled)
+
+    # LLM retries (exponential backoff with jitter, honours Retry-After)
+    llm_retry_max_attempts: int = 4  # Including the first attempt
+    llm_retry_base_delay: float = 0.5  # seconds
+    llm_retry_max_delay: float = 20.0  # seconds
+    llm_retry_total_budget: float = 180.0  # seconds for all attempts of one call
+    # Per-agent overrides, e.g. {"SectionsAgent": {"max_attempts": 2, "total_budget": 300}}
+    llm_retry_overrides: dict[str, dict[str, float]] = {}
+
+    # LLM client-side rate limiting (shared by all agents)
+    llm_rate_limit_rpm: int = 0  # Requests per minute (0 = unlimited)
+    llm_rate_limit_tpm: int = 0  # Tokens per minute, prompt + completion (0 = unlimited)
+    llm_concurrency_initial: int = 8  # Starting AIMD concurrency window
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 64
+    llm_concurrency_latency_tolerance: float = 2.0  # Latency/token ratio over baseline that shrinks the window
+
+    # LLM response cache (opt-in per agent, in-memory LRU + MongoDB TTL collection)
+    llm_cache_agents: list[str] = []  # Agent class names, or ["*"] for all agents
+    llm_cache_ttl_seconds: int = 86400  # 0 = disabled
+    llm_cache_memory_max_entries: int = 1000  # In-process LRU size (0 = MongoDB only)
+    llm_singleflight_enabled: bool = True  # Identical concurrent completions share one call
+
+    # LLM hedged requests (backup request when a call is slower than usual)
+    llm_hedge_agents: list[str] = []  # Agent class names, e.g. ["TitleAgent", "KeywordsAgent"]
+    llm_hedge_percentile: float = 0.9  # Latency percentile after which the hedge is sent
+    llm_hedge_min_delay: float = 1.0  # seconds, lower bound of the hedge delay
+    llm_hedge_window: int = 200  # Latencies kept per agent and max_tokens class
+    llm_hedge_min_samples: int = 20  # Latencies observed before hedging starts
+    llm_hedge_budget_ratio: float = 0.1  # Max extra requests per call (0.1 = +10%)
+    llm_hedge_budget_burst: float = 5.0  # Hedges that can be saved up for slow bursts
+
     # Transcription
     assemblyai_api_key: str = ""
+    assemblyai_base_url: str = "https://api.assemblyai.com"
+    assemblyai_http_timeout: float = 60.0
+    assemblyai_webhook_url: str = ""  # Public URL of POST /api/v1/webhooks/assemblyai (empty: polling only)
+    assemblyai_webhook_secret: str = ""  # Sent back by AssemblyAI in the webhook auth header
+    assemblyai_poll_initial_interval: float = 1.0  # Seconds between the first status polls
+    assemblyai_poll_max_interval: float = 15.0  # Cap of the growing poll interval
+    assemblyai_max_wait_seconds: int = 3600  # Give up on a transcript after this long
+    transcription_max_concurrency: int = 8  # Videos downloaded at once (all requests)
+    transcription_max_pending: int = 200  # AssemblyAI transcripts awaited at once (all requests)
+    transcription_max_concurrency_per_request: int = 4  # Videos of one request processed at once
+    inspiration_max_minutes: int = 0  # Download/transcribe only the first N minutes of a video (0 = whole video)
+    audio_min_bitrate_kbps: int = 48  # Lowest audio stream bitrate deemed good enough for transcription
+    audio_preferred_codecs: list[str] = ["opus", "mp4a"]  # Tie-break between streams of equal bitrate
+
+    # Cross-replica deduplication of downloads/transcriptions (MongoDB leases)
+    media_lease_enabled: bool = False  # Enable when several replicas share the database
+    lease_ttl_seconds: int = 60  # Lease lifetime without renewal (crashed holder)
+    lease_result_ttl_seconds: int = 300  # Result kept for the replicas that waited
+    lease_poll_interval: float = 1.0  # seconds between checks of a lease held elsewhere
+
+    # Thread pools for blocking I/O (separate from the default executor)
+    executor_download_workers: int = 4  # Concurrent video downloads (pytubefix)
+    executor_disk_workers: int = 8  # Concurrent media cache file operations
+    executor_queue_warning_seconds: float = 1.0  # Queue wait logged as a saturation warning
 
     # Storage
     videos_storage_path: str = "resources/videos"
+    media_cache_path: str = "resources/media-cache"  # Audio and transcripts shared by all projects
 
     # Script generation defaults
     default_duration: int = 30  # seconds
     default_nb_sections: int = 1
 
+    # Inspiration transcripts
+    # truncate = trim raw transcripts to the SectionsAgent input budget,
+    # condense = summarize long transcripts into cached briefs (map-reduce),
+    # retrieve = keep the transcript chunks most relevant to the request (BM25)
+    inspiration_strategy: Literal["truncate", "condense", "retrieve"] = "truncate"
+    condense_min_tokens: int = 3000  # Shorter transcripts are used as-is
+    condense_chunk_tokens: int = 4000  # Transcript tokens summarized per map call
+    condense_max_parallel_chunks: int = 8  # Map calls in flight per transcript
+    inspiration_brief_ttl_seconds: int = 2592000  # Cached briefs lifetime (0 = no cache)
+    retrieval_chunk_tokens: int = 300  # Transcript tokens per retrieval chunk
+    retrieval_top_k: int = 8  # Chunks kept per request (all videos together)
+    retrieval_cache_max_transcripts: int = 256  # Segmented transcripts kept in memory
+
+    # Asynchronous script generation jobs
+    jobs_worker_concurrency: int = 4  # Jobs processed in parallel
+    jobs_queue_max_size: int = 100  # Pending jobs before new ones are rejected
+    jobs_result_ttl_seconds: int = 86400  # Job documents are purged after this
+    jobs_heartbeat_interval_seconds: float = 15.0  # Owner refreshes its pending jobs this often
+    jobs_heartbeat_timeout_seconds: float = 90.0  # Pending jobs without heartbeat for this long are failed
+
+    # Batch script generation
+    batch_max_items: int = 200  # Maximum requests per batch
+    batch_max_concurrency: int = 8  # Batch items generated in parallel (all batches)
+
     @property
     def videos_storage_dir(self) -> Path:
         """Get videos storage directory as Path object."""
         return Path(self.videos_storage_path)
 
+    @property
+    def media_cache_dir(self) -> Path:
+        """Get media cache directory as Path object."""
+        return Path(self.media_cache_path)
+
 
 @lru_cache
 def get_settings() -> Settings:
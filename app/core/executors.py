@@ -0,0 +1,172 @@
+"""Named, bounded thread pools for blocking I/O, kept apart from the default executor."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Executor names
+DOWNLOADS = "downloads"
+DISK = "disk"
+
+
+class BoundedExecutor:
+    """A fixed-size thread pool with queue-depth metrics.
+
+    Work of one kind (network downloads, disk I/O) runs in its own pool, so a
+    burst of slow downloads or a slow disk only delays work of the same kind
+    instead of every to_thread() call of the process. Tasks submitted while
+    all workers are busy wait in the pool's queue; a warning is logged when
+    the queue starts filling up and when a task waited longer than
+    EXECUTOR_QUEUE_WARNING_SECONDS.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """Initialize executor.
+
+        Args:
+            name: Executor name (thread name prefix, logs and metrics)
+            max_workers: Number of threads
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-io")
+        # Updated from worker threads
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.peak_queued = 0
+        self.max_wait = 0.0
+        self.metrics: Counter = Counter()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking function in the pool.
+
+        Args:
+            func: Function to run
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of func
+
+        Raises:
+            Exception: Whatever func raised
+        """
+        with self.lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            waiting = self.active + self.queued - self.max_workers
+        self.metrics["submitted"] += 1
+        if waiting > 0:
+            self.metrics["queued_submissions"] += 1
+            # Logged once per burst: when the first task has to wait
+            if waiting == 1:
+                logger.warning(f"Executor {self.name} saturated: {self.max_workers} worker(s) busy, tasks queuing")
+
+        future = self.executor.submit(self._call, func, args, kwargs, time.perf_counter())
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, func: Callable[..., T], args: tuple, kwargs: dict, submitted_at: float) -> T:
+        """Run func on a worker thread, accounting for its queue wait."""
+        wait = time.perf_counter() - submitted_at
+        with self.lock:
+            self.queued -= 1
+            self.active += 1
+            self.max_wait = max(self.max_wait, wait)
+        if wait > settings.executor_queue_warning_seconds:
+            logger.warning(f"Executor {self.name}: task waited {wait:.2f}s in queue")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def _on_done(self, future: Future) -> None:
+        """Drop a task cancelled before it started (the caller was cancelled) from the queue."""
+        if future.cancelled():
+            with self.lock:
+                self.queued -= 1
+
+    def shutdown(self) -> None:
+        """Stop the pool (queued tasks are cancelled, running ones finish)."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Get executor statistics.
+
+        Returns:
+            Workers, running and queued tasks, queue peaks and counters
+        """
+        with self.lock:
+            return {
+                "workers": self.max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "max_wait_seconds": round(self.max_wait, 3),
+                **self.metrics,
+            }
+
+
+# Global registry
+_executors: dict[str, BoundedExecutor] = {}
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Get or create a named executor, sized from settings.
+
+    Args:
+        name: DOWNLOADS or DISK
+
+    Returns:
+        BoundedExecutor instance
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        sizes = {
+            DOWNLOADS: settings.executor_download_workers,
+            DISK: settings.executor_disk_workers,
+        }
+        executor = _executors[name] = BoundedExecutor(name, sizes[name])
+    return executor
+
+
+async def run_disk(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking filesystem call in the disk executor.
+
+    Args:
+        func: Function to run
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Result of func
+    """
+    return await get_executor(DISK).run(func, *args, **kwargs)
+
+
+def executors_stats() -> dict[str, Any]:
+    """Get the statistics of every executor created so far.
+
+    Returns:
+        Statistics keyed by executor name
+    """
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors() -> None:
+    """Stop every executor."""
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
@@ -0,0 +1,231 @@
+"""Hedged requests: fire a backup call when the first one is slower than usual."""
+
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bounds of the max_tokens classes latencies are tracked for
+MAX_TOKENS_CLASSES = (256, 1024, 4096, 16384)
+
+
+def max_tokens_class(max_tokens: Optional[int]) -> str:
+    """Bucket a max_tokens value so calls with similar output caps share statistics.
+
+    Args:
+        max_tokens: Maximum tokens to generate (None = provider default)
+
+    Returns:
+        Class label, e.g. "<=1024"
+    """
+    if max_tokens is None:
+        return "default"
+    for bound in MAX_TOKENS_CLASSES:
+        if max_tokens <= bound:
+            return f"<={bound}"
+    return f">{MAX_TOKENS_CLASSES[-1]}"
+
+
+# Latency statistics key: (agent, max tokens class)
+LatencyKey = tuple[str, str]
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per key."""
+
+    def __init__(self, window: int, min_samples: int):
+        """Initialize tracker.
+
+        Args:
+            window: Latencies kept per key
+            min_samples: Samples needed before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self.samples: dict[LatencyKey, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, key: LatencyKey, latency: float) -> None:
+        """Add a latency sample.
+
+        Args:
+            key: Statistics key
+            latency: Call duration in seconds
+        """
+        self.samples[key].append(latency)
+
+    def percentile(self, key: LatencyKey, q: float) -> Optional[float]:
+        """Get a latency percentile.
+
+        Args:
+            key: Statistics key
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None while there are too few samples
+        """
+        samples = self.samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgeBudget:
+    """Caps hedges to a fraction of calls.
+
+    Every call deposits `ratio` credits (up to `max_credits`) and every hedge
+    withdraws one, so over time at most ratio * calls extra requests are sent.
+    """
+
+    def __init__(self, ratio: float, max_credits: float):
+        """Initialize budget.
+
+        Args:
+            ratio: Hedges allowed per call (e.g. 0.1 = at most 10% extra requests)
+            max_credits: Credits that can be saved up for bursts of slow calls
+        """
+        self.ratio = ratio
+        self.max_credits = max_credits
+        self.credits = 0.0
+
+    def deposit(self) -> None:
+        """Earn credits for one call."""
+        self.credits = min(self.max_credits, self.credits + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one credit on a hedge.
+
+        Returns:
+            True if the budget allows the hedge
+        """
+        if self.credits < 1:
+            return False
+        self.credits -= 1
+        return True
+
+
+class Hedger:
+    """Runs calls with an optional hedge after an adaptive delay.
+
+    The delay is the observed latency percentile (LLM_HEDGE_PERCENTILE) for
+    the agent and max_tokens class, never below LLM_HEDGE_MIN_DELAY. No hedge
+    is sent until enough latencies have been observed. The first successful
+    request wins and the other one is cancelled; if one fails, the other is
+    still awaited.
+    """
+
+    def __init__(self) -> None:
+        """Initialize hedger from settings."""
+        self.agents = set(settings.llm_hedge_agents)
+        self.percentile = settings.llm_hedge_percentile
+        self.min_delay = settings.llm_hedge_min_delay
+        self.latencies = LatencyTracker(settings.llm_hedge_window, settings.llm_hedge_min_samples)
+        self.budget = HedgeBudget(settings.llm_hedge_budget_ratio, settings.llm_hedge_budget_burst)
+        self.metrics: dict[str, Counter] = defaultdict(Counter)
+
+    def enabled_for(self, agent: str) -> bool:
+        """Check whether calls of an agent may be hedged.
+
+        Args:
+            agent: Agent name (class name)
+
+        Returns:
+            True if the agent is listed in LLM_HEDGE_AGENTS
+        """
+        return agent in self.agents
+
+    def delay(self, agent: str, max_tokens: Optional[int]) -> Optional[float]:
+        """Get the time after which a call of this kind is hedged.
+
+        Args:
+            agent: Agent name
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Delay in seconds, or None if the call must not be hedged
+        """
+        if not self.enabled_for(agent):
+            return None
+        threshold = self.latencies.percentile((agent, max_tokens_class(max_tokens)), self.percentile)
+        return None if threshold is None else max(self.min_delay, threshold)
+
+    async def run(self, agent: str, max_tokens: Optional[int], func: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Run func, hedging it with a second identical call if it is slow.
+
+        Args:
+            agent: Agent name
+            max_tokens: Maximum tokens to generate (selects the latency class)
+            func: Coroutine function performing one request
+
+        Returns:
+            Result of the first request to succeed
+
+        Raises:
+            Exception: The first error, if every request failed
+        """
+        key: LatencyKey = (agent, max_tokens_class(max_tokens))
+        delay = self.delay(agent, max_tokens)
+        if self.enabled_for(agent):
+            self.budget.deposit()
+
+        started: dict[asyncio.Task[T], float] = {}
+
+        def launch() -> asyncio.Task[T]:
+            task: asyncio.Task[T] = asyncio.create_task(func())
+            started[task] = time.monotonic()
+            return task
+
+        pending = {launch()}
+        primary = next(iter(pending))
+        errors: list[BaseException] = []
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    if self.budget.withdraw():
+                        logger.info(f"{agent}: no response after {delay:.2f}s, sending hedged request")
+                        self.metrics[agent]["hedges"] += 1
+                        pending.add(launch())
+                    else:
+                        self.metrics[agent]["budget_denied"] += 1
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(error)
+                        continue
+                    self.latencies.record(key, time.monotonic() - started[task])
+                    if task is not primary:
+                        self.metrics[agent]["hedge_wins"] += 1
+                    return task.result()
+            raise errors[0]
+        finally:
+            # Cancel the losing request (or every request if our caller was cancelled)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Get hedging statistics.
+
+        Returns:
+            Hedging agents, budget credits, per-agent counters and current delays
+        """
+        return {
+            "enabled_agents": sorted(self.agents),
+            "budget_credits": round(self.budget.credits, 2),
+            "agents": {agent: dict(counters) for agent, counters in self.metrics.items()},
+            "latency_percentiles": {
+                f"{agent}/{tokens_class}": self.latencies.percentile((agent, tokens_class), self.percentile)
+                for agent, tokens_class in self.latencies.samples
+            },
+        }
@@ -0,0 +1,186 @@
+"""MongoDB leases: at most one replica runs a given piece of work at a time."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.helpers.datetime_utils import now_utc, to_utc
+
+logger = logging.getLogger(__name__)
+
+# Lease states
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class LeaseManager:
+    """Cross-replica deduplication of work keyed by an ID, backed by a MongoDB lease.
+
+    The first replica to insert the lease document of a key runs the work and
+    renews the lease while it runs; when it ends, the result is written to the
+    document (kept LEASE_RESULT_TTL_SECONDS) so the replicas waiting on the
+    key reuse it. A lease that is not renewed (crashed replica) expires after
+    LEASE_TTL_SECONDS and is taken over by a waiter.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase, name: str):
+        """Initialize lease manager.
+
+        Args:
+            database: MongoDB database
+            name: Collection name
+        """
+        self.collection = database[name]
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.ttl = timedelta(seconds=settings.lease_ttl_seconds)
+        self.result_ttl = timedelta(seconds=settings.lease_result_ttl_seconds)
+        self.metrics: Counter = Counter()
+
+    async def start(self) -> None:
+        """Create the TTL index of the lease collection."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def run_exclusive(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """Run func unless another replica is already running it for this key.
+
+        Args:
+            key: Identity of the work
+            func: Coroutine function performing the work
+
+        Returns:
+            Result of func, or of the replica that held the lease (None if it failed)
+        """
+        while True:
+            if await self._acquire(key):
+                return await self._run(key, func)
+
+            document = await self._wait(key)
+            if document is not None and document["state"] == DONE:
+                self.metrics["reused"] += 1
+                logger.info(f"Reusing result of {key} from replica {document['owner']}")
+                return document["result"]
+            if document is not None and document["state"] == FAILED:
+                self.metrics["reused_failures"] += 1
+                return None
+            # Lease expired without a result: try to take it over
+
+    async def _run(self, key: str, func: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """Run func under the lease, renewing it, then publish the result."""
+        self.metrics["acquired"] += 1
+        heartbeat = asyncio.create_task(self._heartbeat(key))
+        result: Optional[str] = None
+        completed = False
+        try:
+            result = await func()
+            completed = True
+            return result
+        finally:
+            heartbeat.cancel()
+            # Shielded so a cancelled caller still hands the lease over to the waiters
+            await asyncio.shield(self._release(key, result) if completed else self._abandon(key))
+
+    async def _acquire(self, key: str) -> bool:
+        """Create the lease, or take over an expired one."""
+        now = now_utc()
+        lease = {"owner": self.owner, "state": RUNNING, "result": None, "expires_at": now + self.ttl}
+        try:
+            await self.collection.insert_one({"_id": key, **lease})
+            return True
+        except DuplicateKeyError:
+            pass
+        # The TTL monitor runs about once a minute: expired leases may still be there
+        previous = await self.collection.find_one_and_update(
+            {"_id": key, "expires_at": {"$lte": now}},
+            {"$set": lease},
+        )
+        if previous is not None:
+            self.metrics["taken_over"] += 1
+            logger.warning(f"Took over expired lease of {key} from {previous['owner']}")
+            return True
+        return False
+
+    async def _wait(self, key: str) -> Optional[dict[str, Any]]:
+        """Wait until the lease of a key is finished or expired.
+
+        Returns:
+            Finished lease document, or None if the lease expired or vanished
+        """
+        self.metrics["waits"] += 1
+        while True:
+            await asyncio.sleep(settings.lease_poll_interval)
+            document = await self.collection.find_one({"_id": key})
+            if document is None or document["state"] != RUNNING:
+                return document
+            if to_utc(document["expires_at"]) <= now_utc():
+                return None
+
+    async def _heartbeat(self, key: str) -> None:
+        """Renew the lease while the work runs."""
+        while True:
+            await asyncio.sleep(self.ttl.total_seconds() / 3)
+            try:
+                await self.collection.update_one(
+                    {"_id": key, "owner": self.owner},
+                    {"$set": {"expires_at": now_utc() + self.ttl}},
+                )
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of {key}: {e}")
+
+    async def _release(self, key: str, result: Optional[str]) -> None:
+        """Publish the outcome of the work for the waiting replicas."""
+        try:
+            await self.collection.update_one(
+                {"_id": key, "owner": self.owner},
+                {"$set": {
+                    "state": DONE if result else FAILED,
+                    "result": result,
+                    "expires_at": now_utc() + self.result_ttl,
+                }},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to release lease of {key}: {e}")
+
+    async def _abandon(self, key: str) -> None:
+        """Drop the lease of work that did not finish, so a waiter takes it over."""
+        try:
+            await self.collection.delete_one({"_id": key, "owner": self.owner})
+        except Exception as e:
+            logger.warning(f"Failed to drop lease of {key}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Get lease statistics.
+
+        Returns:
+            Owner ID and counters (acquired, waits, reused, taken over...)
+        """
+        return {"owner": self.owner, **self.metrics}
+
+
+# Singleton instance
+_media_leases: Optional[LeaseManager] = None
+
+
+async def get_media_leases() -> LeaseManager:
+    """
+    Dependency to get the singleton LeaseManager of video downloads and transcriptions.
+    """
+    global _media_leases
+    if _media_leases is None:
+        database = await get_database()
+        _media_leases = LeaseManager(database, "media_leases")
+    return _media_leases
@@ -0,0 +1,202 @@
+"""Two-tier cache of LLM completions (in-memory LRU in front of MongoDB)."""
+
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, OrderedDict, defaultdict
+from datetime import timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from openai.types.chat import ChatCompletionMessageParam
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.helpers.datetime_utils import now_utc, to_utc
+
+logger = logging.getLogger(__name__)
+
+# Enables the cache for every agent in LLM_CACHE_AGENTS
+ALL_AGENTS = "*"
+
+
+def make_cache_key(
+    model: str,
+    messages: list[ChatCompletionMessageParam],
+    temperature: float,
+    max_tokens: Optional[int],
+) -> str:
+    """Build the cache key of a completion request.
+
+    Args:
+        model: Model name
+        messages: List of message dicts with 'role' and 'content'
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+
+    Returns:
+        SHA-256 hex digest of the canonical request
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Caches completion texts per request key.
+
+    Lookups go to a bounded in-process LRU first, then to the llm_cache
+    collection shared by all replicas (expired by a TTL index). MongoDB
+    errors are logged and treated as misses: the cache never fails a call.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize cache.
+
+        Args:
+            database: MongoDB database
+        """
+        self.collection = database["llm_cache"]
+        self.ttl = settings.llm_cache_ttl_seconds
+        self.max_entries = settings.llm_cache_memory_max_entries
+        self.agents = set(settings.llm_cache_agents)
+        self.memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.metrics: dict[str, Counter] = defaultdict(Counter)
+
+    async def start(self) -> None:
+        """Create the TTL index of the shared collection."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info(
+            f"LLM response cache enabled for {sorted(self.agents) or 'no agent'} "
+            f"(ttl {self.ttl}s, {self.max_entries} entries in memory)"
+        )
+
+    def enabled_for(self, agent: str) -> bool:
+        """Check whether completions of an agent are cached.
+
+        Args:
+            agent: Agent name (class name)
+
+        Returns:
+            True if the agent opted in through LLM_CACHE_AGENTS
+        """
+        return self.ttl > 0 and (ALL_AGENTS in self.agents or agent in self.agents)
+
+    async def get(self, key: str, agent: str) -> Optional[str]:
+        """Look up a cached completion.
+
+        Args:
+            key: Request key (see make_cache_key)
+            agent: Agent name, for metrics
+
+        Returns:
+            Cached completion text, or None on a miss
+        """
+        entry = self.memory.get(key)
+        if entry is not None:
+            expiry, content = entry
+            if expiry > time.monotonic():
+                self.memory.move_to_end(key)
+                self.metrics[agent]["memory_hits"] += 1
+                return content
+            del self.memory[key]
+
+        try:
+            document = await self.collection.find_one({"_id": key, "expires_at": {"$gt": now_utc()}})
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            document = None
+
+        if document is None:
+            self.metrics[agent]["misses"] += 1
+            return None
+
+        remaining = (to_utc(document["expires_at"]) - now_utc()).total_seconds()
+        self._remember(key, document["content"], remaining)
+        self.metrics[agent]["mongo_hits"] += 1
+        return document["content"]
+
+    async def set(self, key: str, content: str, agent: str, model: str) -> None:
+        """Store a completion in both tiers.
+
+        Args:
+            key: Request key (see make_cache_key)
+            content: Completion text
+            agent: Agent name
+            model: Model that produced the completion
+        """
+        self._remember(key, content, self.ttl)
+        now = now_utc()
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "content": content,
+                    "agent": agent,
+                    "model": model,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+        self.metrics[agent]["stores"] += 1
+
+    def record_bypass(self, agent: str) -> None:
+        """Count a lookup skipped at the caller's request.
+
+        Args:
+            agent: Agent name
+        """
+        self.metrics[agent]["bypassed"] += 1
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the shared collection is left alone)."""
+        self.memory.clear()
+
+    def _remember(self, key: str, content: str, ttl: float) -> None:
+        """Put an entry in the LRU tier, evicting the least recently used ones."""
+        if self.max_entries <= 0:
+            return
+        self.memory[key] = (time.monotonic() + ttl, content)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Memory tier size and per-agent hit/miss counters with hit ratio
+        """
+        agents = {}
+        for agent, counters in self.metrics.items():
+            hits = counters["memory_hits"] + counters["mongo_hits"]
+            lookups = hits + counters["misses"]
+            agents[agent] = {**counters, "hit_ratio": round(hits / lookups, 3) if lookups else None}
+        return {
+            "enabled_agents": sorted(self.agents),
+            "memory_entries": len(self.memory),
+            "memory_max_entries": self.max_entries,
+            "agents": agents,
+        }
+
+
+# Singleton instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+async def get_llm_cache() -> LLMResponseCache:
+    """
+    Dependency to get a singleton instance of LLMResponseCache.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        database = await get_database()
+        _llm_cache = LLMResponseCache(database)
+    return _llm_cache
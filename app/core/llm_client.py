@@ -1,46 +1,414 @@
-"""LLM client configuration for DeepSeek API (OpenAI compatible)."""
+"""LLM client for OpenAI-compatible providers (DeepSeek by default)."""
 
+import asyncio
 import logging
-from typing import Optional
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 
-from openai import AsyncOpenAI
-import httpx
+import openai
+from openai import NOT_GIVEN, AsyncStream
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessageParam
 
 from app.core.config import settings
+from app.core.hedging import Hedger
+from app.core.llm_cache import LLMResponseCache, make_cache_key
+from app.core.llm_providers import LLMProvider, ProviderRegistry
+from app.core.request_context import llm_cache_bypassed
+from app.core.retry import RetryMetrics, call_with_retry, get_retry_policy, is_retryable
+from app.core.singleflight import SingleFlight
+from app.core.tokens import count_tokens
+from app.core.usage import record_cache_hit, record_coalesced_call, record_llm_usage
 
 logger = logging.getLogger(__name__)
 
+# Token reservation for calls without max_tokens
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+def estimate_request_tokens(messages: list[ChatCompletionMessageParam], max_tokens: Optional[int]) -> int:
+    """Estimate the tokens a completion request will consume (prompt + output cap).
+
+    Args:
+        messages: Chat messages
+        max_tokens: Completion token cap
+
+    Returns:
+        Estimated token count
+    """
+    prompt_tokens = sum(
+        count_tokens(content) for message in messages if isinstance(content := message.get("content"), str)
+    )
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: int) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate and capacity
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be consumed (0 if available now).
+
+        Args:
+            amount: Units needed (capped to the bucket capacity)
+
+        Returns:
+            Wait time in seconds
+        """
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Remove units from the bucket (the level may go negative after adjust)."""
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Correct a previous estimate: positive delta consumes more, negative refunds.
+
+        Args:
+            delta: Actual minus estimated units
+        """
+        self._refill()
+        self.level = min(self.capacity, self.level - delta)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency window driven by 429s and latency per output token.
+
+    The window grows by about one slot per window's worth of successful calls
+    and is halved on a 429, or when latency per completion token exceeds the
+    baseline observed for the same caller by the configured tolerance.
+    """
+
+    # Smoothing of the latency baseline (slow, so congestion stands out)
+    BASELINE_ALPHA = 0.05
+    # Minimum seconds between two multiplicative decreases
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_tolerance: float) -> None:
+        """Initialize window.
+
+        Args:
+            initial: Starting window
+            minimum: Lower bound
+            maximum: Upper bound
+            latency_tolerance: Latency ratio over baseline treated as congestion
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.window = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_tolerance = latency_tolerance
+        self.baselines: dict[str, float] = {}
+        self.last_decrease = 0.0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self.window)
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self.last_decrease < self.DECREASE_COOLDOWN:
+            return
+        self.last_decrease = now
+        self.decreases += 1
+        previous = self.window
+        self.window = max(float(self.minimum), self.window / 2)
+        logger.warning(f"LLM concurrency window {previous:.1f} -> {self.window:.1f} ({reason})")
+
+    def on_throttled(self) -> None:
+        """Record a 429 response."""
+        self._decrease("rate limited")
+
+    def on_success(self, latency: float, completion_tokens: int, key: str = "default") -> None:
+        """Record a successful call.
+
+        Args:
+            latency: Call duration in seconds
+            completion_tokens: Output tokens of the call
+            key: Caller label (agent); calls of different shapes keep separate baselines
+        """
+        per_token = latency / max(completion_tokens, 1)
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            self.baselines[key] = per_token
+        elif per_token > baseline * self.latency_tolerance:
+            self._decrease(f"{key} latency {per_token * 1000:.1f}ms/token vs baseline {baseline * 1000:.1f}ms")
+            return
+        else:
+            self.baselines[key] = baseline + self.BASELINE_ALPHA * (per_token - baseline)
+        self.window = min(float(self.maximum), self.window + 1 / self.window)
+
+
+class RateLimitPermit:
+    """Permission to run one LLM call, returned by LLMRateLimiter.acquire."""
+
+    def __init__(self, estimated_tokens: int) -> None:
+        self.estimated_tokens = estimated_tokens
+        self.started_at = time.monotonic()
+        # Set by the caller once the provider reports usage
+        self.total_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+
+
+class LLMRateLimiter:
+    """Client-side limiter shared by every LLM call of the process.
+
+    Calls wait in a FIFO queue until the concurrency window has a free slot
+    and the requests-per-minute and tokens-per-minute buckets can pay for
+    them, so bursts queue up instead of turning into 429s.
+    """
+
+    def __init__(self) -> None:
+        """Initialize limiter from settings."""
+        self.requests = TokenBucket(settings.llm_rate_limit_rpm) if settings.llm_rate_limit_rpm > 0 else None
+        self.tokens = TokenBucket(settings.llm_rate_limit_tpm) if settings.llm_rate_limit_tpm > 0 else None
+        self.concurrency = AdaptiveConcurrency(
+            initial=settings.llm_concurrency_initial,
+            minimum=settings.llm_concurrency_min,
+            maximum=settings.llm_concurrency_max,
+            latency_tolerance=settings.llm_concurrency_latency_tolerance,
+        )
+        self.in_use = 0
+        self.waiters: deque[tuple[asyncio.Future, int]] = deque()
+        self.wakeup: Optional[asyncio.TimerHandle] = None
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.granted = 0
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int, key: str = "default") -> AsyncIterator[RateLimitPermit]:
+        """Wait for a slot, run the caller's block, then feed back the outcome.
+
+        Args:
+            estimated_tokens: Estimated tokens of the call
+            key: Caller label (agent) for latency baselines
+
+        Yields:
+            Permit on which the caller may set reported token usage
+        """
+        queued_at = time.monotonic()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.waiters.append((future, estimated_tokens))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: give the slot back
+                self.in_use -= 1
+            self._dispatch()
+            raise
+
+        self.total_wait += time.monotonic() - queued_at
+        permit = RateLimitPermit(estimated_tokens)
+        try:
+            yield permit
+        except openai.RateLimitError:
+            self.throttled += 1
+            self.concurrency.on_throttled()
+            raise
+        else:
+            latency = time.monotonic() - permit.started_at
+            if permit.completion_tokens is not None:
+                self.concurrency.on_success(latency, permit.completion_tokens, key)
+            if self.tokens is not None and permit.total_tokens is not None:
+                self.tokens.adjust(permit.total_tokens - estimated_tokens)
+        finally:
+            self.in_use -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant queued calls in FIFO order while capacity allows."""
+        while self.waiters:
+            future, estimated_tokens = self.waiters[0]
+            if future.done():  # Cancelled while queued
+                self.waiters.popleft()
+                continue
+            if self.in_use >= self.concurrency.limit:
+                return  # A release will dispatch again
+
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(estimated_tokens))
+            if wait > 0:
+                if self.wakeup is None:
+                    self.wakeup = asyncio.get_running_loop().call_later(wait, self._on_wakeup)
+                return
+
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(estimated_tokens)
+            self.waiters.popleft()
+            self.in_use += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def _on_wakeup(self) -> None:
+        self.wakeup = None
+        self._dispatch()
+
+    def stats(self) -> dict[str, Any]:
+        """Get limiter statistics.
+
+        Returns:
+            Window, usage, queue depth and bucket levels
+        """
+        return {
+            "concurrency_window": round(self.concurrency.window, 2),
+            "in_use": self.in_use,
+            "queued": sum(1 for future, _ in self.waiters if not future.done()),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "window_decreases": self.concurrency.decreases,
+            "avg_queue_wait": round(self.total_wait / self.granted, 3) if self.granted else 0.0,
+            "requests_available": round(self.requests.level, 1) if self.requests else None,
+            "tokens_available": round(self.tokens.level, 1) if self.tokens else None,
+        }
+
+
+class ChatCompletionStream:
+    """Async iterator over the text deltas of a streaming chat completion.
+
+    Once iteration finishes, usage and finish_reason hold what the provider
+    reported. Use it as an async context manager (or call aclose()) to make
+    sure the HTTP response is released when stopping early.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty stream; LLMClient attaches the delta source."""
+        self._deltas: Optional[AsyncGenerator[str, None]] = None
+        self.chunks: list[str] = []
+        self.usage: Optional[CompletionUsage] = None
+        self.finish_reason: Optional[str] = None
+        self.model: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self.chunks)
+
+    def __aiter__(self) -> "ChatCompletionStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._deltas is None:
+            raise StopAsyncIteration
+        delta = await self._deltas.__anext__()
+        self.chunks.append(delta)
+        return delta
+
+    async def aclose(self) -> None:
+        """Stop the stream and release its connection and rate limiter slot."""
+        if self._deltas is not None:
+            await self._deltas.aclose()
+
+    async def __aenter__(self) -> "ChatCompletionStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
 
 class LLMClient:
-    """Wrapper for LLM API client (DeepSeek via OpenAI SDK)."""
+    """Wrapper for LLM API clients (OpenAI SDK, one client per provider)."""
 
     def __init__(self) -> None:
         """Initialize LLM client."""
-        if not settings.deepseek_api_key:
-            logger.warning("DEEPSEEK_API_KEY not set. LLM features will not work.")
-            self.client = None
+        self.in_flight = 0
+        self.retry_metrics = RetryMetrics()
+        self.rate_limiter = LLMRateLimiter()
+        # Attached at startup once MongoDB is connected (see app.main)
+        self.cache: Optional[LLMResponseCache] = None
+        self.singleflight: SingleFlight[str] = SingleFlight("llm")
+        self.hedger = Hedger()
+        self.providers = ProviderRegistry.from_settings()
+        if not self.providers.providers:
+            logger.warning("DEEPSEEK_API_KEY not set and no LLM_PROVIDERS. LLM features will not work.")
         else:
-            self.client = AsyncOpenAI(
-                api_key=settings.deepseek_api_key,
-                base_url=settings.openai_api_base,
-                http_client=httpx.AsyncClient(trust_env=False)
-            )
-            logger.info(f"LLM Client initialized with base URL: {settings.openai_api_base}")
+            logger.info(f"LLM Client initialized with {len(self.providers.providers)} provider(s)")
+
+    async def warmup(self) -> None:
+        """Pre-open pooled connections (DNS + TCP + TLS) before the first request.
+
+        Failures are logged and ignored: warmup is best effort.
+        """
+        if settings.llm_prewarm_connections <= 0:
+            return
+        await self.providers.warmup(settings.llm_prewarm_connections)
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        await self.providers.aclose()
+        logger.info("LLM HTTP clients closed")
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool statistics.
+
+        Returns:
+            Pool configuration, in-flight requests and connection counts per provider
+        """
+        return {
+            "http2": settings.llm_http2,
+            "max_connections": settings.llm_http_max_connections,
+            "max_keepalive_connections": settings.llm_http_max_keepalive_connections,
+            "keepalive_expiry": settings.llm_http_keepalive_expiry,
+            "in_flight_requests": self.in_flight,
+            "providers": {provider.name: provider.pool_stats() for provider in self.providers.providers},
+        }
 
     async def chat_completion(
         self,
-        messages: list[dict[str, str]],
+        messages: list[ChatCompletionMessageParam],
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        agent: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> str:
         """Generate chat completion.
 
+        Transient errors (connection errors, 429, 5xx) are retried with the
+        agent's retry policy; see app.core.retry. Every attempt waits for the
+        shared rate limiter first. For agents enabled in LLM_CACHE_AGENTS the
+        response cache is consulted first, unless the request bypasses it.
+        Identical requests (timeout included) in flight at the same time share
+        one API call; the callers that joined it account a coalesced call
+        instead of its tokens. Agents enabled in LLM_HEDGE_AGENTS send a hedged request when an
+        attempt is slower than usual (see app.core.hedging). Each request
+        goes to the best healthy provider and fails over to the others on
+        provider errors (see app.core.llm_providers).
+
         Args:
             messages: List of message dicts with 'role' and 'content'
-            model: Model name (defaults to settings.openai_model)
+            model: Model name (defaults to each provider's model)
             temperature: Sampling temperature (0-2)
             max_tokens: Maximum tokens to generate
+            agent: Calling agent name (selects the retry policy, labels metrics)
+            timeout: Per-request timeout in seconds (defaults to LLM_*_TIMEOUT)
 
         Returns:
             Generated text response
@@ -49,20 +417,217 @@ class LLMClient:
             ValueError: If client not initialized
             Exception: If API call fails
         """
-        if not self.client:
+        if not self.is_available():
             raise ValueError("LLM client not initialized. Check DEEPSEEK_API_KEY.")
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=model or settings.openai_model,
+        agent = agent or "default"
+        model_label = model or settings.openai_model
+
+        request_key = make_cache_key(model_label, messages, temperature, max_tokens)
+        cache = self.cache if self.cache and self.cache.enabled_for(agent) else None
+        if cache:
+            if llm_cache_bypassed():
+                cache.record_bypass(agent)
+            elif (cached := await cache.get(request_key, agent)) is not None:
+                logger.debug(f"{agent}: LLM cache hit")
+                record_cache_hit(agent, model_label)
+                return cached
+
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+
+        async def request(provider: LLMProvider) -> tuple[LLMProvider, ChatCompletion]:
+            response = await provider.client.chat.completions.create(
+                model=provider.resolve_model(model),
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                timeout=NOT_GIVEN if timeout is None else timeout,
+            )
+            return provider, response
+
+        async def attempt() -> str:
+            async with self.rate_limiter.acquire(estimated_tokens, agent) as permit:
+                self.in_flight += 1
+                start = time.monotonic()
+                try:
+                    provider, response = await self.providers.call(request)
+                except Exception as e:
+                    logger.error(f"LLM API error: {e}")
+                    raise
+                finally:
+                    self.in_flight -= 1
+                record_llm_usage(agent, response.model, response.usage, time.monotonic() - start, provider.name)
+                if response.usage:
+                    permit.total_tokens = response.usage.total_tokens
+                    permit.completion_tokens = response.usage.completion_tokens
+                return response.choices[0].message.content.strip()
+
+        led = False
+
+        async def fetch() -> str:
+            # Only runs for the caller that starts the shared call
+            nonlocal led
+            led = True
+            content = await call_with_retry(
+                lambda: self.hedger.run(agent, max_tokens, attempt),
+                get_retry_policy(agent),
+                agent,
+                self.retry_metrics,
             )
-            return response.choices[0].message.content.strip()
+            if cache:
+                await cache.set(request_key, content, agent, model_label)
+            return content
+
+        if not settings.llm_singleflight_enabled:
+            return await fetch()
+        content = await self.singleflight.do((request_key, timeout), fetch)
+        if not led:
+            record_coalesced_call(agent, model_label)
+        return content
+
+    def chat_completion_stream(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        agent: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> ChatCompletionStream:
+        """Generate chat completion as a stream of text deltas.
+
+        Nothing is sent until the stream is iterated. Opening the stream is
+        retried like chat_completion; errors after the first delta are not,
+        since output was already handed to the caller. The final usage is
+        requested from the provider and set on the stream when it ends.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model name (defaults to each provider's model)
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            agent: Calling agent name (selects the retry policy, labels metrics)
+            timeout: Per-request timeout in seconds (defaults to LLM_*_TIMEOUT)
+
+        Returns:
+            Stream yielding text deltas in generation order
+
+        Raises:
+            ValueError: If client not initialized
+        """
+        if not self.is_available():
+            raise ValueError("LLM client not initialized. Check DEEPSEEK_API_KEY.")
+
+        stream = ChatCompletionStream()
+        stream._deltas = self._stream_deltas(
+            stream, messages, model, temperature, max_tokens, agent or "default", timeout
+        )
+        return stream
+
+    async def _stream_deltas(
+        self,
+        result: ChatCompletionStream,
+        messages: list[ChatCompletionMessageParam],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        agent: str,
+        timeout: Optional[float],
+    ) -> AsyncGenerator[str, None]:
+        """Open a streaming completion and yield its text deltas.
+
+        Args:
+            result: Stream object receiving usage and finish reason
+            messages: List of message dicts with 'role' and 'content'
+            model: Model name (defaults to each provider's model)
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            agent: Calling agent name
+            timeout: Per-request timeout in seconds
+
+        Yields:
+            Text deltas
+        """
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+
+        async def request(provider: LLMProvider) -> tuple[LLMProvider, AsyncStream[ChatCompletionChunk]]:
+            stream = await provider.client.chat.completions.create(
+                model=provider.resolve_model(model),
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=NOT_GIVEN if timeout is None else timeout,
+            )
+            return provider, stream
+
+        async def open_stream() -> tuple[
+            AsyncExitStack, RateLimitPermit, tuple[LLMProvider, AsyncStream[ChatCompletionChunk]]
+        ]:
+            # The rate limiter slot is held until the stream is fully consumed
+            slot = AsyncExitStack()
+            permit = await slot.enter_async_context(self.rate_limiter.acquire(estimated_tokens, agent))
+            try:
+                opened = await self.providers.call(request)
+            except BaseException as e:
+                if isinstance(e, Exception):
+                    logger.error(f"LLM API error: {e}")
+                await slot.__aexit__(type(e), e, e.__traceback__)
+                raise
+            return slot, permit, opened
+
+        start = time.monotonic()
+        slot, permit, (provider, stream) = await call_with_retry(
+            open_stream, get_retry_policy(agent), agent, self.retry_metrics
+        )
+        self.in_flight += 1
+        try:
+            async for chunk in stream:
+                result.model = chunk.model
+                if chunk.usage:
+                    # Final chunk (include_usage): no choices, only usage
+                    result.usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    result.finish_reason = choice.finish_reason
+                if choice.delta.content:
+                    yield choice.delta.content
+            record_llm_usage(
+                agent, result.model or provider.resolve_model(model), result.usage,
+                time.monotonic() - start, provider.name
+            )
+            if result.usage:
+                permit.total_tokens = result.usage.total_tokens
+                permit.completion_tokens = result.usage.completion_tokens
         except Exception as e:
-            logger.error(f"LLM API error: {e}")
+            logger.error(f"LLM stream error: {e}")
+            if is_retryable(e):
+                provider.health.record_failure()
             raise
+        finally:
+            self.in_flight -= 1
+            await stream.close()
+            await slot.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Get LLM client statistics for monitoring.
+
+        Returns:
+            Dict of statistics grouped by component
+        """
+        return {
+            "available": self.is_available(),
+            "pool": self.pool_stats(),
+            "retries": self.retry_metrics.snapshot(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "cache": self.cache.stats() if self.cache else None,
+            "singleflight": self.singleflight.stats(),
+            "hedging": self.hedger.stats(),
+            "providers": self.providers.stats(),
+        }
 
     def is_available(self) -> bool:
         """Check if LLM client is available.
@@ -70,7 +635,7 @@ class LLMClient:
         Returns:
             True if client initialized, False otherwise
         """
-        return self.client is not None
+        return bool(self.providers.providers)
 
 
 # Global singleton instance
@@ -0,0 +1,372 @@
+"""Registry of OpenAI-compatible LLM providers with health tracking and failover."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import LLMProviderConfig, settings
+from app.core.retry import is_retryable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Weight of the error rate in the routing score (latency * (1 + penalty * error_rate))
+ERROR_RATE_PENALTY = 4.0
+
+
+class NoProviderError(Exception):
+    """Raised when no LLM provider is configured."""
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP client for one provider.
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    return httpx.AsyncClient(
+        trust_env=False,
+        http2=settings.llm_http2,
+        limits=httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=settings.llm_http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.llm_connect_timeout,
+            read=settings.llm_read_timeout,
+            write=settings.llm_write_timeout,
+            pool=settings.llm_pool_timeout,
+        ),
+    )
+
+
+class ProviderHealth:
+    """Rolling health window and circuit breaker of one provider.
+
+    The circuit opens after LLM_CIRCUIT_FAILURE_THRESHOLD consecutive
+    failures, or when the error rate over the window reaches
+    LLM_CIRCUIT_ERROR_RATE. After LLM_CIRCUIT_COOLDOWN seconds a single probe
+    call is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, name: str):
+        """Initialize health tracking.
+
+        Args:
+            name: Provider name, for logs
+        """
+        self.name = name
+        self.outcomes: deque[tuple[bool, float]] = deque(maxlen=settings.llm_provider_health_window)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls in the window."""
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self.outcomes if not ok) / len(self.outcomes)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Mean latency of successful calls in the window (None without data)."""
+        latencies = [latency for ok, latency in self.outcomes if ok]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def score(self) -> float:
+        """Routing score, lower is better. Providers without data score 0 so they get tried."""
+        return (self.latency or 0.0) * (1 + ERROR_RATE_PENALTY * self.error_rate)
+
+    def is_open(self) -> bool:
+        """Check whether the circuit currently rejects calls (cooldown not over)."""
+        if self.state == OPEN:
+            return time.monotonic() < self.opened_at + settings.llm_circuit_cooldown
+        return self.state == HALF_OPEN and self.probing
+
+    def allow_request(self) -> bool:
+        """Reserve the right to send a call (claims the probe when half-open).
+
+        Returns:
+            True if the call may be sent
+        """
+        if self.state == CLOSED:
+            return True
+        if self.is_open():
+            return False
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+            logger.info(f"LLM provider {self.name}: circuit half-open, sending probe")
+        self.probing = True
+        return True
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call.
+
+        Args:
+            latency: Call duration in seconds
+        """
+        if self.state != CLOSED:
+            logger.info(f"LLM provider {self.name}: probe succeeded, circuit closed")
+            self.state = CLOSED
+            self.outcomes.clear()
+        self.probing = False
+        self.consecutive_failures = 0
+        self.outcomes.append((True, latency))
+
+    def record_failure(self) -> None:
+        """Record a call that failed because of the provider."""
+        self.probing = False
+        self.consecutive_failures += 1
+        self.outcomes.append((False, 0.0))
+        if self.state == HALF_OPEN:
+            self._open("probe failed")
+        elif self.state == CLOSED:
+            if self.consecutive_failures >= settings.llm_circuit_failure_threshold:
+                self._open(f"{self.consecutive_failures} consecutive failures")
+            elif (
+                len(self.outcomes) >= settings.llm_circuit_min_samples
+                and self.error_rate >= settings.llm_circuit_error_rate
+            ):
+                self._open(f"error rate {self.error_rate:.0%}")
+
+    def release(self) -> None:
+        """Give back a probe whose call ended without a verdict (cancelled, bad request)."""
+        self.probing = False
+
+    def _open(self, reason: str) -> None:
+        """Open the circuit."""
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(
+            f"LLM provider {self.name}: circuit opened ({reason}), "
+            f"retrying in {settings.llm_circuit_cooldown:.0f}s"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Get health statistics.
+
+        Returns:
+            Circuit state, error rate, mean latency and sample count
+        """
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 3),
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "samples": len(self.outcomes),
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class LLMProvider:
+    """One OpenAI-compatible endpoint with its own client, pool and health."""
+
+    def __init__(self, config: LLMProviderConfig):
+        """Initialize provider.
+
+        Args:
+            config: Provider configuration
+        """
+        self.config = config
+        self.name = config.name
+        self.http_client = create_http_client()
+        self.client = AsyncOpenAI(
+            api_key=config.api_key,
+            base_url=config.base_url,
+            http_client=self.http_client,
+            max_retries=0,  # Retries are handled by call_with_retry
+        )
+        self.health = ProviderHealth(config.name)
+
+    def resolve_model(self, model: Optional[str]) -> str:
+        """Translate a requested model into this provider's model name.
+
+        Args:
+            model: Requested model (None = provider default)
+
+        Returns:
+            Model name to send
+        """
+        if model is None:
+            return self.config.model
+        return self.config.model_aliases.get(model, model)
+
+    async def warmup(self, connections: int) -> None:
+        """Pre-open pooled connections (DNS + TCP + TLS).
+
+        Failures are logged and ignored: warmup is best effort.
+
+        Args:
+            connections: Number of concurrent requests to send
+        """
+        url = f"{self.config.base_url.rstrip('/')}/models"
+        headers = {"Authorization": f"Bearer {self.config.api_key}"}
+        results = await asyncio.gather(
+            *(self.http_client.get(url, headers=headers) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.warning(
+                f"LLM provider {self.name} warmup: {len(errors)}/{len(results)} failed ({errors[0]})"
+            )
+        else:
+            logger.info(f"LLM provider {self.name} connection pool warmed up ({len(results)} request(s))")
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection counts of this provider's pool.
+
+        Returns:
+            Connection counts (empty if the pool cannot be inspected)
+        """
+        # httpx does not expose its pool publicly; read the httpcore pool if present
+        pool = getattr(getattr(self.http_client, "_transport", None), "_pool", None)
+        if pool is None:
+            return {}
+        connections = list(pool.connections)
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "queued_requests": len(getattr(pool, "_requests", [])),
+        }
+
+
+class ProviderRegistry:
+    """Routes calls to the best healthy provider and fails over on provider errors."""
+
+    def __init__(self, configs: list[LLMProviderConfig]):
+        """Initialize registry.
+
+        Args:
+            configs: Provider configurations (in preference order for ties)
+        """
+        self.providers = [LLMProvider(config) for config in configs]
+        for provider in self.providers:
+            logger.info(
+                f"LLM provider {provider.name} registered: {provider.config.base_url} "
+                f"(model {provider.config.model}, priority {provider.config.priority})"
+            )
+
+    @classmethod
+    def from_settings(cls) -> "ProviderRegistry":
+        """Build the registry from LLM_PROVIDERS, or from the DeepSeek settings if unset.
+
+        Returns:
+            Provider registry (empty if no provider is configured)
+        """
+        configs = list(settings.llm_providers)
+        if not configs and settings.deepseek_api_key:
+            configs = [LLMProviderConfig(
+                name="deepseek",
+                base_url=settings.openai_api_base,
+                api_key=settings.deepseek_api_key,
+                model=settings.openai_model,
+            )]
+        return cls(configs)
+
+    def candidates(self) -> list[LLMProvider]:
+        """Order providers for a call: closed circuits first by (priority, score).
+
+        When every circuit is open, the provider whose circuit opened first is
+        still returned so the service keeps trying rather than failing fast.
+
+        Returns:
+            Providers to try, best first
+        """
+        available = [p for p in self.providers if not p.health.is_open()]
+        if available:
+            return sorted(available, key=lambda p: (p.config.priority, p.health.score()))
+        if not self.providers:
+            return []
+        oldest = min(self.providers, key=lambda p: p.health.opened_at)
+        logger.warning(f"All LLM provider circuits are open, trying {oldest.name}")
+        return [oldest]
+
+    async def call(self, func: Callable[[LLMProvider], Awaitable[T]]) -> T:
+        """Call func with the best provider, failing over to the next ones.
+
+        Only provider errors (connection errors, 429, 5xx...) fail over and
+        count against provider health; other errors are raised immediately.
+
+        Args:
+            func: Coroutine function performing the request with a provider
+
+        Returns:
+            Result of the first provider to succeed
+
+        Raises:
+            NoProviderError: If no provider is configured
+            Exception: The last provider error if all providers failed
+        """
+        candidates = self.candidates()
+        # Every circuit open: the fallback provider is called regardless
+        forced = all(provider.health.is_open() for provider in candidates)
+        last_error: Optional[Exception] = None
+        for provider in candidates:
+            if not forced and not provider.health.allow_request():
+                continue
+            start = time.monotonic()
+            try:
+                result = await func(provider)
+            except Exception as e:
+                if not is_retryable(e):
+                    provider.health.release()
+                    raise
+                provider.health.record_failure()
+                last_error = e
+                logger.warning(f"LLM provider {provider.name} failed ({e}), failing over")
+                continue
+            except BaseException:
+                provider.health.release()
+                raise
+            provider.health.record_success(time.monotonic() - start)
+            return result
+
+        if last_error is not None:
+            raise last_error
+        raise NoProviderError("No LLM provider configured. Check DEEPSEEK_API_KEY or LLM_PROVIDERS.")
+
+    async def warmup(self, connections: int) -> None:
+        """Pre-open connections to every provider.
+
+        Args:
+            connections: Connections per provider
+        """
+        await asyncio.gather(*(provider.warmup(connections) for provider in self.providers))
+
+    async def aclose(self) -> None:
+        """Close every provider's HTTP client."""
+        for provider in self.providers:
+            await provider.http_client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Get per-provider statistics.
+
+        Returns:
+            Mapping of provider name to configuration and health
+        """
+        return {
+            provider.name: {
+                "base_url": provider.config.base_url,
+                "model": provider.config.model,
+                "priority": provider.config.priority,
+                **provider.health.stats(),
+            }
+            for provider in self.providers
+        }
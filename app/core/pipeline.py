@@ -0,0 +1,218 @@
+"""Small dependency-graph executor for async pipeline stages."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+StageFunc = Callable[[dict[str, Any]], Coroutine[Any, Any, Any]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A named unit of work that runs once all of its dependencies are done.
+
+    Attributes:
+        name: Unique stage name (also the key of its result)
+        func: Coroutine function receiving the results of finished stages
+        depends_on: Names of the stages whose results this stage needs
+    """
+
+    name: str
+    func: StageFunc
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock timing of a single stage run."""
+
+    started_at: float
+    finished_at: Optional[float] = None
+    status: str = "running"
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, or None while the stage is still running."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    """Lifecycle notification emitted to a pipeline listener.
+
+    Attributes:
+        stage: Stage name
+        status: One of "started", "completed", "failed" or "cancelled"
+        duration: Stage duration in seconds (None on "started")
+        result: Stage result (only set on "completed")
+        error: Stage error (only set on "failed")
+    """
+
+    stage: str
+    status: str
+    duration: Optional[float] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+StageListener = Callable[[StageEvent], None]
+
+
+@dataclass
+class PipelineResult:
+    """Results and timings of a completed pipeline run."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    total_duration: float = 0.0
+
+    def durations(self) -> dict[str, float]:
+        """Get per-stage durations in seconds, rounded for reporting.
+
+        Returns:
+            Mapping of stage name to duration
+        """
+        return {
+            name: round(timing.duration, 3)
+            for name, timing in self.timings.items()
+            if timing.duration is not None
+        }
+
+
+class StageFailedError(Exception):
+    """Raised when a pipeline stage fails; the original error is the cause."""
+
+    def __init__(self, stage: str, error: BaseException) -> None:
+        self.stage = stage
+        self.error = error
+        super().__init__(f"Stage '{stage}' failed: {error}")
+
+
+class StagePipeline:
+    """Run stages concurrently, each one as soon as its inputs are ready.
+
+    A failing stage cancels every other running stage and the error is
+    re-raised as StageFailedError. Cancelling the caller cancels all stages.
+    """
+
+    def __init__(self, stages: list[Stage], listener: Optional[StageListener] = None) -> None:
+        """Initialize pipeline and validate the stage graph.
+
+        Args:
+            stages: Stages to run
+            listener: Optional callback notified when stages start and finish
+
+        Raises:
+            ValueError: If names are duplicated, a dependency is unknown
+                or the graph contains a cycle
+        """
+        self.listener = listener
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        """Ensure the stage graph has no cycles (Kahn's algorithm).
+
+        Raises:
+            ValueError: If a cycle is found
+        """
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle detected between stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _notify(self, event: StageEvent) -> None:
+        """Forward an event to the listener, never letting it break the run."""
+        if self.listener is None:
+            return
+        try:
+            self.listener(event)
+        except Exception as e:
+            logger.warning(f"Pipeline listener failed on {event.status} of '{event.stage}': {e}")
+
+    async def run(self) -> PipelineResult:
+        """Execute all stages.
+
+        Returns:
+            Pipeline results and per-stage timings
+
+        Raises:
+            StageFailedError: If any stage raises
+        """
+        result = PipelineResult()
+        pending = dict(self.stages)
+        running: dict[asyncio.Task, str] = {}
+        pipeline_start = time.perf_counter()
+
+        def start_ready_stages() -> None:
+            for name, stage in list(pending.items()):
+                if all(dep in result.results for dep in stage.depends_on):
+                    del pending[name]
+                    result.timings[name] = StageTiming(started_at=time.perf_counter())
+                    logger.debug(f"Stage '{name}' started")
+                    self._notify(StageEvent(stage=name, status="started"))
+                    task: asyncio.Task = asyncio.create_task(stage.func(result.results), name=f"stage:{name}")
+                    running[task] = name
+
+        try:
+            start_ready_stages()
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    timing = result.timings[name]
+                    timing.finished_at = time.perf_counter()
+                    if task.cancelled():
+                        timing.status = "cancelled"
+                        self._notify(StageEvent(stage=name, status="cancelled", duration=timing.duration))
+                        raise StageFailedError(name, asyncio.CancelledError())
+                    error = task.exception()
+                    if error is not None:
+                        timing.status = "failed"
+                        self._notify(StageEvent(stage=name, status="failed", duration=timing.duration, error=error))
+                        raise StageFailedError(name, error) from error
+                    timing.status = "completed"
+                    result.results[name] = task.result()
+                    self._notify(StageEvent(
+                        stage=name,
+                        status="completed",
+                        duration=timing.duration,
+                        result=result.results[name],
+                    ))
+                    logger.debug(f"Stage '{name}' completed in {timing.duration:.3f}s")
+                start_ready_stages()
+        finally:
+            # Failure or caller cancellation: stop everything still in flight
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+                now = time.perf_counter()
+                for name in running.values():
+                    result.timings[name].finished_at = now
+                    result.timings[name].status = "cancelled"
+                    self._notify(StageEvent(stage=name, status="cancelled", duration=result.timings[name].duration))
+
+        result.total_duration = time.perf_counter() - pipeline_start
+        return result
@@ -0,0 +1,94 @@
+"""Per-request options visible to every coroutine of a script generation.
+
+Values live in context variables: they are set once by the orchestrator and
+inherited by the pipeline stage tasks, so agents and the LLM client can read
+them without threading extra arguments through every call.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from app.core.config import AgentProfile
+
+if TYPE_CHECKING:
+    from app.core.usage import UsageCollector
+
+_llm_cache_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+_agent_overrides: ContextVar[dict[str, AgentProfile]] = ContextVar("agent_overrides", default={})
+_usage_collector: ContextVar[Optional["UsageCollector"]] = ContextVar("usage_collector", default=None)
+
+
+def llm_cache_bypassed() -> bool:
+    """Check whether the current request asked to skip LLM cache lookups.
+
+    Returns:
+        True if cached completions must not be returned
+    """
+    return _llm_cache_bypass.get()
+
+
+@contextmanager
+def bypass_llm_cache(enabled: bool = True) -> Iterator[None]:
+    """Skip LLM cache lookups for the enclosed code (fresh results are still stored).
+
+    Args:
+        enabled: Whether to bypass the cache
+    """
+    token = _llm_cache_bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _llm_cache_bypass.reset(token)
+
+
+def get_agent_override(agent: str) -> Optional[AgentProfile]:
+    """Get the current request's LLM parameter overrides for an agent.
+
+    Args:
+        agent: Agent name (class name)
+
+    Returns:
+        Override profile, or None if the request did not set one
+    """
+    return _agent_overrides.get().get(agent)
+
+
+@contextmanager
+def use_agent_overrides(overrides: Optional[dict[str, AgentProfile]]) -> Iterator[None]:
+    """Apply per-agent LLM parameter overrides to the enclosed code.
+
+    Args:
+        overrides: Profiles keyed by agent class name (None = no override)
+    """
+    token = _agent_overrides.set(overrides or {})
+    try:
+        yield
+    finally:
+        _agent_overrides.reset(token)
+
+
+def current_usage_collector() -> Optional["UsageCollector"]:
+    """Get the usage collector of the current request.
+
+    Returns:
+        Collector, or None outside a script generation request
+    """
+    return _usage_collector.get()
+
+
+@contextmanager
+def collect_usage(collector: "UsageCollector") -> Iterator["UsageCollector"]:
+    """Account the LLM usage of the enclosed code to a collector.
+
+    Args:
+        collector: Usage collector of the request
+
+    Yields:
+        The collector
+    """
+    token = _usage_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _usage_collector.reset(token)
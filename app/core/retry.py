@@ -0,0 +1,250 @@
+"""Retry policy with exponential backoff for LLM (and other HTTP) API calls."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, fields, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying besides 429 and 5xx
+RETRYABLE_STATUS_CODES = {408, 409, 425}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter, bounded by attempts and a time budget.
+
+    Attributes:
+        max_attempts: Total attempts including the first one
+        base_delay: Delay before the first retry in seconds
+        max_delay: Cap on a single backoff delay in seconds
+        multiplier: Backoff growth factor between retries
+        jitter: Fraction of the delay randomized (0 = none, 1 = full jitter)
+        total_budget: Time budget for all attempts and delays in seconds
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    multiplier: float = 2.0
+    jitter: float = 1.0
+    total_budget: float = 180.0
+
+    def backoff(self, retry_number: int) -> float:
+        """Compute the delay before a retry.
+
+        Args:
+            retry_number: 1 for the first retry, 2 for the second...
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (retry_number - 1))
+        return delay * (1 - self.jitter * random.random())
+
+
+def get_retry_policy(agent: Optional[str] = None) -> RetryPolicy:
+    """Get the retry policy for an agent.
+
+    Defaults come from LLM_RETRY_* settings; LLM_RETRY_OVERRIDES may override
+    any field per agent, e.g. {"SectionsAgent": {"max_attempts": 2}}.
+
+    Args:
+        agent: Agent name (class name)
+
+    Returns:
+        Retry policy
+    """
+    policy = RetryPolicy(
+        max_attempts=settings.llm_retry_max_attempts,
+        base_delay=settings.llm_retry_base_delay,
+        max_delay=settings.llm_retry_max_delay,
+        total_budget=settings.llm_retry_total_budget,
+    )
+    # Coerce each override to its field's type (max_attempts is an int)
+    field_types = {field.name: field.type for field in fields(RetryPolicy)}
+    overrides: dict[str, Any] = {}
+    for name, value in settings.llm_retry_overrides.get(agent or "", {}).items():
+        field_type = field_types.get(name)
+        if field_type is None:
+            logger.warning(f"Ignoring unknown retry override {name!r} for {agent}")
+            continue
+        overrides[name] = int(value) if field_type is int else float(value)
+    return replace(policy, **overrides) if overrides else policy
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify an error as transient (retryable) or fatal.
+
+    Args:
+        error: Error raised by an API call
+
+    Returns:
+        True if the call may succeed when retried
+    """
+    if isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+        return True
+    if isinstance(error, (openai.APIStatusError, httpx.HTTPStatusError)):
+        status_code = _status_code(error)
+        if status_code is None:
+            return False
+        return status_code == 429 or status_code >= 500 or status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read the server-requested delay from Retry-After headers.
+
+    Args:
+        error: Error raised by an API call
+
+    Returns:
+        Delay in seconds, or None if the server did not ask for one
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an API error (OpenAI errors carry it, httpx ones on their response)."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+    return status_code
+
+
+def _error_reason(error: BaseException) -> str:
+    """Short label for an error, used as a metrics key."""
+    status_code = _status_code(error)
+    return f"http_{status_code}" if status_code else error.__class__.__name__
+
+
+class RetryMetrics:
+    """Per-agent retry counters."""
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.counters: dict[str, Counter] = defaultdict(Counter)
+        self.reasons: dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, agent: str, event: str, reason: Optional[str] = None) -> None:
+        """Increment a counter.
+
+        Args:
+            agent: Agent name
+            event: Counter name (calls, retries, successes, fatal_errors, exhausted)
+            reason: Optional error label for retries and failures
+        """
+        self.counters[agent][event] += 1
+        if reason:
+            self.reasons[agent][reason] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a copy of all counters.
+
+        Returns:
+            Mapping of agent name to counters and error reasons
+        """
+        return {
+            agent: {**counters, "reasons": dict(self.reasons[agent])}
+            for agent, counters in self.counters.items()
+        }
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    agent: str = "default",
+    metrics: Optional[RetryMetrics] = None,
+) -> T:
+    """Call func, retrying transient errors according to policy.
+
+    Args:
+        func: Coroutine function performing one attempt
+        policy: Retry policy
+        agent: Agent name for logs and metrics
+        metrics: Optional metrics collector
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        Exception: The last error once it is fatal, attempts are exhausted
+            or the time budget would be exceeded
+    """
+    start = time.monotonic()
+    if metrics:
+        metrics.record(agent, "calls")
+
+    attempt = 1
+    while True:
+        try:
+            result = await func()
+        except Exception as e:
+            reason = _error_reason(e)
+            if not is_retryable(e):
+                if metrics:
+                    metrics.record(agent, "fatal_errors", reason)
+                raise
+
+            delay = policy.backoff(attempt)
+            server_delay = retry_after_seconds(e)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+
+            elapsed = time.monotonic() - start
+            if attempt >= policy.max_attempts or elapsed + delay > policy.total_budget:
+                logger.error(
+                    f"{agent}: giving up after {attempt} attempt(s) in {elapsed:.1f}s ({reason}: {e})"
+                )
+                if metrics:
+                    metrics.record(agent, "exhausted", reason)
+                raise
+
+            logger.warning(
+                f"{agent}: attempt {attempt}/{policy.max_attempts} failed ({reason}), "
+                f"retrying in {delay:.2f}s"
+            )
+            if metrics:
+                metrics.record(agent, "retries", reason)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        if metrics:
+            metrics.record(agent, "successes")
+        return result
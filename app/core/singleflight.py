@@ -0,0 +1,87 @@
+"""Coalescing of identical concurrent calls (singleflight)."""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Callable, Coroutine, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """A shared call and the number of callers waiting for it."""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one call per key at a time; concurrent callers share its outcome.
+
+    The first caller of a key starts the call in a task; callers arriving
+    while it runs await the same task. Every waiter gets the result or the
+    exception. A cancelled waiter only stops waiting: the call keeps running
+    for the others, and is cancelled when its last waiter goes away. Nothing
+    is remembered once the call has finished.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        """Initialize singleflight group.
+
+        Args:
+            name: Label used in logs
+        """
+        self.name = name
+        self.calls: dict[Hashable, _Call[T]] = {}
+        self.metrics: Counter = Counter()
+
+    async def do(self, key: Hashable, func: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Run func, or join the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            func: Coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        call = self.calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(func()))
+            self.calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.metrics["executions"] += 1
+        else:
+            self.metrics["coalesced"] += 1
+            logger.debug(f"{self.name}: joining in-flight call ({call.waiters} waiter(s))")
+
+        call.waiters += 1
+        try:
+            # Shielded so one waiter's cancellation does not cancel the shared call
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last waiter gone: nobody needs the result anymore
+                self._forget(key, call)
+                call.task.cancel()
+                self.metrics["abandoned"] += 1
+
+    def _forget(self, key: Hashable, call: _Call[T]) -> None:
+        """Remove a call from the in-flight table (if it is still the current one)."""
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Get singleflight statistics.
+
+        Returns:
+            Calls in flight and counters (executions, coalesced, abandoned)
+        """
+        return {"in_flight": len(self.calls), **self.metrics}
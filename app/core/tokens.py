@@ -0,0 +1,139 @@
+"""Token counting and token-budgeted trimming of prompt inputs."""
+
+import math
+import re
+
+# Rough characters-per-token ratio of DeepSeek/OpenAI tokenizers on prose
+CHARS_PER_TOKEN = 4
+
+# End of a sentence: terminal punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"[.!?…](?:[\"'”’»)\]]*)\s")
+
+# Share of an input budget kept for the main input (script, transcripts) whatever the other inputs' size
+MAIN_INPUT_MIN_SHARE = 0.5
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    This is a character-based estimate, not the provider's tokenizer: it is
+    meant for budgets and rate limiting, not billing.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim a text to a token budget, preferably at a sentence boundary.
+
+    Falls back to a word boundary when no sentence ends in the second half
+    of the allowed text, and to a hard cut for text without spaces.
+
+    Args:
+        text: Text to trim
+        max_tokens: Token budget
+
+    Returns:
+        The text itself if it fits, otherwise its trimmed beginning
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    limit = max_tokens * CHARS_PER_TOKEN
+    head = text[:limit + 1]
+    sentence_ends = [m.end() for m in _SENTENCE_END.finditer(head)]
+    if sentence_ends and sentence_ends[-1] >= limit // 2:
+        return head[:sentence_ends[-1]].rstrip()
+    space = head.rfind(" ", 0, limit)
+    if space >= limit // 2:
+        return head[:space].rstrip()
+    return text[:limit]
+
+
+def allocate_budget(sizes: list[int], budget: int) -> list[int]:
+    """Split a token budget fairly between texts (max-min fairness).
+
+    Texts smaller than an equal share keep their full size and the rest of
+    their share goes to the larger texts.
+
+    Args:
+        sizes: Token count of each text
+        budget: Total token budget
+
+    Returns:
+        Token allowance of each text, in the same order
+    """
+    allowances = [0] * len(sizes)
+    remaining = max(0, budget)
+    by_size = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for position, index in enumerate(by_size):
+        share = remaining // (len(sizes) - position)
+        allowances[index] = min(sizes[index], share)
+        remaining -= allowances[index]
+    return allowances
+
+
+def fit_texts(texts: list[str], budget: int) -> list[str]:
+    """Trim texts so that together they fit a token budget.
+
+    Args:
+        texts: Texts to fit (e.g. one transcript per inspiration video)
+        budget: Total token budget
+
+    Returns:
+        Trimmed texts, in the same order
+    """
+    allowances = allocate_budget([count_tokens(text) for text in texts], budget)
+    return [truncate_to_tokens(text, allowance) for text, allowance in zip(texts, allowances)]
+
+
+def fit_prompt_inputs(main: list[str], others: list[str], budget: int) -> tuple[list[str], list[str]]:
+    """Fit the main and the secondary inputs of a prompt into one token budget.
+
+    The main inputs (the text the agent works on) are guaranteed
+    MAIN_INPUT_MIN_SHARE of the budget, or what they need if less: the
+    secondary inputs (description, keywords...) are trimmed first to the
+    rest, so a long description cannot squeeze the main text out of the
+    prompt. The main inputs then share what the secondary ones left.
+
+    Args:
+        main: Main input texts
+        others: Secondary input texts
+        budget: Total token budget
+
+    Returns:
+        Trimmed main texts and trimmed secondary texts, in the same order
+    """
+    main_size = sum(count_tokens(text) for text in main)
+    reserved = min(main_size, int(budget * MAIN_INPUT_MIN_SHARE))
+    fitted_others = fit_texts(others, budget - reserved)
+    fitted_main = fit_texts(main, budget - sum(count_tokens(text) for text in fitted_others))
+    return fitted_main, fitted_others
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """Split a text into consecutive chunks that each fit a token budget.
+
+    Chunks end at sentence boundaries where possible (see truncate_to_tokens).
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget of each chunk
+
+    Returns:
+        Non-empty chunks, in order
+    """
+    chunks = []
+    rest = text.strip()
+    while rest:
+        chunk = truncate_to_tokens(rest, max(1, max_tokens))
+        chunks.append(chunk)
+        rest = rest[len(chunk):].strip()
+    return chunks
@@ -0,0 +1,323 @@
+"""Token usage, cost and latency accounting of LLM calls."""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from openai.types import CompletionUsage
+
+from app.core.config import settings
+from app.core.request_context import current_usage_collector
+
+logger = logging.getLogger(__name__)
+
+# Label used when a call is made outside a script generation request
+UNKNOWN = "unknown"
+
+
+def cached_prompt_tokens(usage: CompletionUsage) -> int:
+    """Read the prompt tokens served from the provider's prompt cache.
+
+    DeepSeek reports prompt_cache_hit_tokens, OpenAI-style providers
+    prompt_tokens_details.cached_tokens; others report nothing.
+
+    Args:
+        usage: Usage returned by the provider
+
+    Returns:
+        Cached prompt tokens (0 if not reported)
+    """
+    deepseek_hits = getattr(usage, "prompt_cache_hit_tokens", None)
+    if deepseek_hits is not None:
+        return int(deepseek_hits)
+    details = usage.prompt_tokens_details
+    if details is not None and details.cached_tokens:
+        return details.cached_tokens
+    return 0
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> Optional[float]:
+    """Estimate the cost of a call from LLM_PRICING.
+
+    Args:
+        model: Model name
+        prompt_tokens: Prompt tokens (including cached ones)
+        completion_tokens: Completion tokens
+        cached_tokens: Prompt tokens served from the provider's cache
+
+    Returns:
+        Cost in the pricing currency, or None if the model has no pricing
+    """
+    pricing = settings.llm_pricing.get(model)
+    if pricing is None:
+        return None
+    prompt_price = pricing.get("prompt", 0.0)
+    cached_price = pricing.get("cached_prompt", prompt_price)
+    cost = (
+        (prompt_tokens - cached_tokens) * prompt_price
+        + cached_tokens * cached_price
+        + completion_tokens * pricing.get("completion", 0.0)
+    )
+    return cost / 1_000_000
+
+
+@dataclass
+class UsageRecord:
+    """One LLM call (or cache hit) as seen by the accounting."""
+
+    agent: str
+    model: str
+    provider: Optional[str]
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    latency: float
+    cost: Optional[float]
+    cache_hit: bool = False
+    coalesced: bool = False
+
+
+class UsageTotals:
+    """Running totals of a group of usage records."""
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self.calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.latency = 0.0
+        self.cost = 0.0
+        self.priced = True
+
+    def add(self, record: UsageRecord) -> None:
+        """Add a record.
+
+        Args:
+            record: Usage record
+        """
+        if record.cache_hit:
+            self.cache_hits += 1
+            return
+        if record.coalesced:
+            self.coalesced += 1
+            return
+        self.calls += 1
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+        self.latency += record.latency
+        if record.cost is None:
+            self.priced = False
+        else:
+            self.cost += record.cost
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the totals.
+
+        Returns:
+            Counters, prompt cache hit ratio, mean latency and cost
+            (None if a call used a model without pricing)
+        """
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "prompt_cache_hit_ratio": (
+                round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None
+            ),
+            "total_latency": round(self.latency, 3),
+            "avg_latency": round(self.latency / self.calls, 3) if self.calls else None,
+            "cost": round(self.cost, 6) if self.priced and self.calls else None,
+        }
+
+
+class UsageCollector:
+    """Usage of a single script generation request."""
+
+    def __init__(self, language: Optional[str] = None, use_case: Optional[str] = None):
+        """Initialize collector.
+
+        Args:
+            language: Request language
+            use_case: Request use case
+        """
+        self.language = language or UNKNOWN
+        self.use_case = use_case or UNKNOWN
+        self.total = UsageTotals()
+        self.agents: dict[str, UsageTotals] = defaultdict(UsageTotals)
+
+    def add(self, record: UsageRecord) -> None:
+        """Add a record.
+
+        Args:
+            record: Usage record
+        """
+        self.total.add(record)
+        self.agents[record.agent].add(record)
+
+    def summary(self) -> dict[str, Any]:
+        """Get the request's usage.
+
+        Returns:
+            Totals and per-agent totals
+        """
+        return {
+            "total": self.total.to_dict(),
+            "agents": {agent: totals.to_dict() for agent, totals in self.agents.items()},
+        }
+
+
+class UsageTracker:
+    """Process-wide usage aggregated per agent, language, use case and model."""
+
+    DIMENSIONS = ("agent", "language", "use_case", "model")
+
+    def __init__(self) -> None:
+        """Initialize tracker."""
+        self.total = UsageTotals()
+        self.groups: dict[str, dict[str, UsageTotals]] = {
+            dimension: defaultdict(UsageTotals) for dimension in self.DIMENSIONS
+        }
+
+    def add(self, record: UsageRecord, language: str, use_case: str) -> None:
+        """Add a record.
+
+        Args:
+            record: Usage record
+            language: Request language
+            use_case: Request use case
+        """
+        self.total.add(record)
+        self.groups["agent"][record.agent].add(record)
+        self.groups["language"][language].add(record)
+        self.groups["use_case"][use_case].add(record)
+        self.groups["model"][record.model].add(record)
+
+    def summary(self) -> dict[str, Any]:
+        """Get the aggregated usage since startup.
+
+        Returns:
+            Totals and totals per dimension
+        """
+        return {
+            "total": self.total.to_dict(),
+            **{
+                f"by_{dimension}": {key: totals.to_dict() for key, totals in groups.items()}
+                for dimension, groups in self.groups.items()
+            },
+        }
+
+
+# Global singleton
+_usage_tracker: Optional[UsageTracker] = None
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Get or create usage tracker singleton.
+
+    Returns:
+        UsageTracker instance
+    """
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = UsageTracker()
+    return _usage_tracker
+
+
+def record_llm_usage(
+    agent: str,
+    model: str,
+    usage: Optional[CompletionUsage],
+    latency: float,
+    provider: Optional[str] = None,
+) -> UsageRecord:
+    """Account a completed LLM call.
+
+    Adds it to the process-wide tracker and to the current request's
+    collector, if any.
+
+    Args:
+        agent: Agent name
+        model: Model that served the call
+        usage: Usage returned by the provider (None if not reported)
+        latency: Call duration in seconds
+        provider: Provider name
+
+    Returns:
+        The recorded usage
+    """
+    prompt_tokens = usage.prompt_tokens if usage else 0
+    completion_tokens = usage.completion_tokens if usage else 0
+    cached_tokens = cached_prompt_tokens(usage) if usage else 0
+    record = UsageRecord(
+        agent=agent,
+        model=model,
+        provider=provider,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cached_tokens=cached_tokens,
+        latency=latency,
+        cost=estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+    )
+    _add(record)
+    return record
+
+
+def record_cache_hit(agent: str, model: str) -> None:
+    """Account a completion served from the response cache.
+
+    Args:
+        agent: Agent name
+        model: Requested model
+    """
+    _add(UsageRecord(
+        agent=agent,
+        model=model,
+        provider=None,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cached_tokens=0,
+        latency=0.0,
+        cost=0.0,
+        cache_hit=True,
+    ))
+
+
+def record_coalesced_call(agent: str, model: str) -> None:
+    """Account a completion shared with an identical call already in flight.
+
+    The tokens, latency and cost are recorded once, by the caller that made
+    the call; the callers that joined it only count it here.
+
+    Args:
+        agent: Agent name
+        model: Requested model
+    """
+    _add(UsageRecord(
+        agent=agent,
+        model=model,
+        provider=None,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cached_tokens=0,
+        latency=0.0,
+        cost=0.0,
+        coalesced=True,
+    ))
+
+
+def _add(record: UsageRecord) -> None:
+    """Add a record to the tracker and the current request's collector."""
+    collector = current_usage_collector()
+    language = collector.language if collector else UNKNOWN
+    use_case = collector.use_case if collector else UNKNOWN
+    get_usage_tracker().add(record, language, use_case)
+    if collector:
+        collector.add(record)
@@ -15,8 +15,10 @@ def extract_youtube_id(url: str) -> Optional[str]:
     """
     patterns = [
         r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([\w-]+)',
+        r'youtube\.com\/watch\?.*&v=([\w-]+)',
         r'youtube\.com\/embed\/([\w-]+)',
         r'youtube\.com\/v\/([\w-]+)',
+        r'youtube\.com\/shorts\/([\w-]+)',
     ]
     
     for pattern in patterns:
@@ -47,6 +49,27 @@ def extract_facebook_video_id(url: str) -> Optional[str]:
     return None
 
 
+def parse_video_url(url: str) -> Optional[tuple[str, str]]:
+    """Identify the platform and canonical video ID of a video URL.
+
+    Different URLs of the same video (watch, short link, embed, shorts...)
+    give the same result.
+
+    Args:
+        url: YouTube or Facebook URL
+
+    Returns:
+        Tuple of (platform, video ID), or None if the URL is not recognized
+    """
+    video_id = extract_youtube_id(url)
+    if video_id:
+        return "youtube", video_id
+    video_id = extract_facebook_video_id(url)
+    if video_id:
+        return "facebook", video_id
+    return None
+
+
 def clean_text(text: str) -> str:
     """Clean and normalize text.
 
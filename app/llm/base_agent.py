@@ -4,17 +4,42 @@ from collections import defaultdict
 import logging
 from abc import ABC, abstractmethod
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
-from string import Template
-from typing import Optional
+from string import Formatter, Template
+from typing import Any, AsyncIterator, Optional
 
 import humanize
+from openai.types.chat import ChatCompletionMessageParam
 
+from app.core.config import AgentProfile, settings
 from app.core.llm_client import get_llm_client
+from app.core.request_context import get_agent_override
+from app.core.tokens import count_tokens, fit_prompt_inputs
 from app.services.prompt_service import get_prompt_service
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "YYou are an AI assistant specialized in video content creation. Your mission is to generate catchy titles, compelling descriptions, structured sections, and complete content, ensuring that each element is relevant and tailored to the target theme and language."
+
+
+@lru_cache(maxsize=256)
+def split_prompt_template(template: str) -> tuple[str, tuple[str, ...]]:
+    """Turn a template into a static prefix and the names of its inputs.
+
+    Placeholders are replaced by references to tagged input blocks (e.g.
+    {description} -> <description>), so the prefix only depends on the
+    template and is byte-identical across requests.
+
+    Args:
+        template: Prompt template with str.format placeholders
+
+    Returns:
+        Tuple of (prefix, input names in order of first use)
+    """
+    names = tuple(dict.fromkeys(name for _, name, _, _ in Formatter().parse(template) if name))
+    return template.format_map({name: f"<{name}>" for name in names}), names
+
 
 class BaseAgent(ABC):
     """Abstract base class for LLM agents."""
@@ -36,14 +61,14 @@ class BaseAgent(ABC):
         self.temperature = temperature
         self.translate_prompt = translate_prompt
         self.prompt_name = prompt_name # Store prompt_name
-        self.prompt_template: Optional[str] = None # Will be loaded dynamically
         logger.info(f"Initialized {self.__class__.__name__} with prompt_name={self.prompt_name}")
 
-    async def _load_prompt_from_db(self, language: str) -> str:
+    async def _load_prompt_from_db(self, language: str, prompt_name: Optional[str] = None) -> str:
         """Load prompt template from database.
 
         Args:
             language: Target language for the prompt
+            prompt_name: Prompt to load (defaults to the agent's prompt_name)
 
         Returns:
             Prompt template string
@@ -51,24 +76,100 @@ class BaseAgent(ABC):
         Raises:
             ValueError: If prompt not found in database
         """
-        if not self.prompt_name:
+        prompt_name = prompt_name or self.prompt_name
+        if not prompt_name:
             raise ValueError("Prompt name not provided for agent.")
 
         prompt_service = await get_prompt_service()
-        prompt_content = await prompt_service.get_prompt_content(self.prompt_name, language)
+        prompt_content = await prompt_service.get_prompt_content(prompt_name, language)
 
         if not prompt_content:
             # Fallback to English if French not found, or raise error if English also not found
             if language != "en":
-                logger.warning(f"Prompt '{self.prompt_name}' not found for language '{language}', trying 'en'.")
-                prompt_content = await prompt_service.get_prompt_content(self.prompt_name, "en")
+                logger.warning(f"Prompt '{prompt_name}' not found for language '{language}', trying 'en'.")
+                prompt_content = await prompt_service.get_prompt_content(prompt_name, "en")
             
             if not prompt_content:
-                raise ValueError(f"Prompt '{self.prompt_name}' not found in database for any language.")
+                raise ValueError(f"Prompt '{prompt_name}' not found in database for any language.")
         
         return prompt_content
 
-    def _format_prompt(self, template: str, **kwargs) -> str:
+    def _get_profile(self) -> AgentProfile:
+        """Resolve the LLM parameters of this agent for the current request.
+
+        The agent's defaults (temperature, _get_max_tokens,
+        _get_input_token_budget) are overridden by AGENT_PROFILES, then by the
+        request's agent_overrides.
+
+        Returns:
+            Agent profile
+        """
+        name = self.__class__.__name__
+        defaults = AgentProfile(
+            temperature=self.temperature,
+            max_tokens=self._get_max_tokens(),
+            input_token_budget=self._get_input_token_budget(),
+        )
+        return defaults.merged(settings.agent_profiles.get(name)).merged(get_agent_override(name))
+
+    def _fit_inputs(self, main: dict[str, str], others: dict[str, str]) -> dict[str, str]:
+        """Trim the prompt inputs to the agent's input token budget.
+
+        See fit_prompt_inputs: the secondary inputs are trimmed first so the
+        main ones keep at least MAIN_INPUT_MIN_SHARE of the budget. Inputs
+        cut to nothing are logged as warnings.
+
+        Args:
+            main: Main inputs by name (e.g. the script text)
+            others: Secondary inputs by name (e.g. the description)
+
+        Returns:
+            Trimmed inputs by name
+        """
+        inputs = {**main, **others}
+        budget = self._get_profile().input_token_budget
+        if budget is None:
+            return inputs
+        fitted_main, fitted_others = fit_prompt_inputs(list(main.values()), list(others.values()), budget)
+        fitted = dict(zip(inputs, fitted_main + fitted_others))
+        for name, text in inputs.items():
+            if len(fitted[name]) == len(text):
+                continue
+            if not fitted[name]:
+                logger.warning(
+                    f"{self.__class__.__name__}: {name} dropped from the prompt "
+                    f"({count_tokens(text)} tokens, input budget {budget})"
+                )
+            else:
+                logger.info(
+                    f"{self.__class__.__name__}: {name} truncated from {count_tokens(text)} "
+                    f"to {count_tokens(fitted[name])} tokens (input budget {budget})"
+                )
+        return fitted
+
+    def _layout_prompt(self, template: str, **kwargs: Any) -> str:
+        """Build a prompt as static template prefix followed by the variable inputs.
+
+        Keeping request values out of the template lets the provider reuse
+        its prefix cache for every call of an agent in a language. Only the
+        inputs referenced by the template are appended, as in _format_prompt.
+
+        Args:
+            template: Prompt template
+            **kwargs: Placeholder values
+
+        Returns:
+            Prompt text
+        """
+        prefix, names = split_prompt_template(template)
+        if not names:
+            return prefix
+        inputs = "\n\n".join(
+            f"<{name}>\n{'' if kwargs.get(name) is None else kwargs[name]}\n</{name}>" for name in names
+        )
+        return f"{prefix}\n\nInputs:\n\n{inputs}"
+
+    def _format_prompt(self, template: str, **kwargs: Any) -> str:
     # Remplacer None par ""
         cleaned = {k: ("" if v is None else v) for k, v in kwargs.items()}
 
@@ -77,15 +178,21 @@ class BaseAgent(ABC):
 
         return template.format_map(dd)
 
-    async def generate(self, language: str = "en", **kwargs) -> str:
-        """Generate output using LLM.
+    async def _build_messages(
+        self,
+        language: str,
+        prompt_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> list[ChatCompletionMessageParam]:
+        """Load the prompt for a language and build the chat messages.
 
         Args:
             language: Target language for response
+            prompt_name: Prompt to use (defaults to the agent's prompt_name)
             **kwargs: Placeholder values for prompt template
 
         Returns:
-            Generated text
+            List of message dicts with 'role' and 'content'
 
         Raises:
             ValueError: If LLM client not available or prompt not found
@@ -94,7 +201,7 @@ class BaseAgent(ABC):
             raise ValueError(f"{self.__class__.__name__} requires LLM client. Check API key configuration.")
         
         # Load prompt dynamically based on language
-        self.prompt_template = await self._load_prompt_from_db(language)
+        prompt_template = await self._load_prompt_from_db(language, prompt_name)
         
         # Format duration if present
         if 'duration' in kwargs and kwargs['duration'] is not None:
@@ -111,21 +218,50 @@ class BaseAgent(ABC):
                 # If conversion fails, keep original value
                 logger.warning(f"Could not convert duration '{kwargs['duration']}' to numeric seconds")
         
-        formatted_prompt = self._format_prompt(self.prompt_template, **kwargs)
+        if settings.prompt_prefix_layout:
+            formatted_prompt = self._layout_prompt(prompt_template, **kwargs)
+        else:
+            formatted_prompt = self._format_prompt(prompt_template, **kwargs)
         logger.info(f"Prompt brut ({language}) : {formatted_prompt}")
         
-        # Prepare messages
-        messages = [
-            {"role": "system", "content": "YYou are an AI assistant specialized in video content creation. Your mission is to generate catchy titles, compelling descriptions, structured sections, and complete content, ensuring that each element is relevant and tailored to the target theme and language."},
+        # Prepare messages (system message first: it is part of the cacheable prefix)
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": formatted_prompt}
         ]
 
+    async def generate(
+        self,
+        language: str = "en",
+        prompt_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> str:
+        """Generate output using LLM.
+
+        Args:
+            language: Target language for response
+            prompt_name: Prompt to use (defaults to the agent's prompt_name)
+            **kwargs: Placeholder values for prompt template
+
+        Returns:
+            Generated text
+
+        Raises:
+            ValueError: If LLM client not available or prompt not found
+        """
+        messages = await self._build_messages(language, prompt_name, **kwargs)
+        profile = self._get_profile()
+        temperature = self.temperature if profile.temperature is None else profile.temperature
+
         # Generate response
         try:
             response = await self.llm_client.chat_completion(
                 messages=messages,
-                temperature=self.temperature,
-                max_tokens=self._get_max_tokens()
+                model=profile.model,
+                temperature=temperature,
+                max_tokens=profile.max_tokens,
+                agent=self.__class__.__name__,
+                timeout=profile.timeout
             )
             logger.debug(f"{self.__class__.__name__} generated response: {len(response)} chars")
             return response
@@ -133,11 +269,64 @@ class BaseAgent(ABC):
             logger.error(f"{self.__class__.__name__} generation failed: {e}")
             raise
 
+    async def generate_stream(
+        self,
+        language: str = "en",
+        prompt_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Generate output using LLM, yielding text deltas as they arrive.
+
+        Args:
+            language: Target language for response
+            prompt_name: Prompt to use (defaults to the agent's prompt_name)
+            **kwargs: Placeholder values for prompt template
+
+        Yields:
+            Generated text deltas
+
+        Raises:
+            ValueError: If LLM client not available or prompt not found
+        """
+        messages = await self._build_messages(language, prompt_name, **kwargs)
+        profile = self._get_profile()
+        temperature = self.temperature if profile.temperature is None else profile.temperature
+
+        try:
+            # Leaving the block (also when the consumer stops early) closes the HTTP stream
+            async with self.llm_client.chat_completion_stream(
+                messages=messages,
+                model=profile.model,
+                temperature=temperature,
+                max_tokens=profile.max_tokens,
+                agent=self.__class__.__name__,
+                timeout=profile.timeout
+            ) as stream:
+                async for delta in stream:
+                    yield delta
+            usage = stream.usage
+            logger.debug(
+                f"{self.__class__.__name__} streamed response: {len(stream.text)} chars, "
+                f"finish_reason={stream.finish_reason}, "
+                f"tokens={usage.prompt_tokens if usage else '?'}+{usage.completion_tokens if usage else '?'}"
+            )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__} streaming generation failed: {e}")
+            raise
+
     @abstractmethod
     def _get_max_tokens(self) -> Optional[int]:
-        """Get maximum tokens for this agent.
+        """Get default maximum tokens for this agent (see _get_profile).
 
         Returns:
             Max tokens or None for default
         """
         pass
+
+    def _get_input_token_budget(self) -> Optional[int]:
+        """Get default token budget of the variable prompt inputs (see _get_profile).
+
+        Returns:
+            Token budget or None for unlimited
+        """
+        return None
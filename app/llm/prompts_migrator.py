@@ -72,6 +72,20 @@ PROMPT_FILES = {
         "es_path": None, # Add if Spanish version exists
         "type": "contextual_description",
         "name": "contextual_description_x_things_to_do"
+    },
+    "condensation_chunk_prompt": {
+        "path": "condensation_chunk_prompt.txt",
+        "fr_path": None, # Briefs are written in English whatever the script language
+        "es_path": None,
+        "type": "condensation",
+        "name": "condensation_chunk_prompt"
+    },
+    "condensation_brief_prompt": {
+        "path": "condensation_brief_prompt.txt",
+        "fr_path": None, # Briefs are written in English whatever the script language
+        "es_path": None,
+        "type": "condensation",
+        "name": "condensation_brief_prompt"
     }
 }
 
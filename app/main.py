@@ -11,9 +11,17 @@ from app.core.api_keyp_formatter import ApiKeyFormatter
 from app.core.config import settings
 from app.core.database import db # Import the MongoDB instance
 from app.core.exceptions import setup_exception_handlers
+from app.core.executors import run_disk, shutdown_executors
+from app.core.llm_cache import get_llm_cache
+from app.core.lease import get_media_leases
+from app.core.llm_client import get_llm_client
 from app.core.logging import get_logger, setup_logging
 from app.llm.prompts_migrator import migrate_prompts_to_mongodb # Import the migration function
-from app.routes import scripts, admin, prompts # Import the new admin router
+from app.routes import scripts, admin, prompts, webhooks # Import the new admin router
+from app.services.assemblyai_client import get_assemblyai_client
+from app.services.condensation_service import get_condensation_service
+from app.services.job_service import get_job_service
+from app.services.media_cache import get_media_cache
 
 # Setup logging
 setup_logging()
@@ -25,6 +33,16 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
     logger.info("Starting Script Generation Service")
     await db.connect() # Connect to MongoDB
+    await run_disk(get_media_cache().sweep_partials) # Delete temporary files of downloads cut by a crash
+    job_service = await get_job_service()
+    await job_service.start() # Start script job workers
+    llm_cache = await get_llm_cache()
+    await llm_cache.start() # Create LLM cache TTL index
+    get_llm_client().cache = llm_cache
+    await (await get_condensation_service()).start() # Create inspiration brief TTL index
+    if settings.media_lease_enabled:
+        await (await get_media_leases()).start() # Create media lease TTL index
+    await get_llm_client().warmup() # Pre-open LLM connections
     # Removed automatic prompt migration at startup
     print("✅ Script Generation Service started")
     print("✅ DEEPSEEK api key :", ApiKeyFormatter.mask(settings.deepseek_api_key))
@@ -34,6 +52,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Shutdown
     logger.info("Shutting down application")
+    await job_service.stop() # Stop script job workers
+    await get_llm_client().aclose() # Close LLM connection pool
+    if settings.assemblyai_api_key:
+        await get_assemblyai_client().aclose() # Close AssemblyAI connection pool
+    shutdown_executors() # Stop blocking I/O thread pools
     await db.close() # Close MongoDB connection
     print("❌ Script Generation Service stopped")
 
@@ -91,6 +114,7 @@ def create_app() -> FastAPI:
     app.include_router(scripts.router, prefix=settings.api_v1_prefix)
     app.include_router(admin.router, prefix=f"{settings.api_v1_prefix}/admin", tags=["Admin"])
     app.include_router(prompts.router, prefix=settings.api_v1_prefix, tags=["Prompts"])
+    app.include_router(webhooks.router, prefix=settings.api_v1_prefix)
 
     return app
 
@@ -0,0 +1,70 @@
+"""Pydantic models for asynchronous script generation jobs."""
+
+from datetime import datetime
+from typing import Optional, Literal
+from pydantic import BaseModel, Field
+
+from app.models.script import ScriptGenerationRequest, ScriptGenerationResponse
+
+
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+class ScriptJob(BaseModel):
+    """A script generation job as stored in MongoDB."""
+
+    job_id: str = Field(..., alias="_id", description="Job identifier")
+    status: JobStatus = Field(..., description="Current job status")
+    request: ScriptGenerationRequest = Field(..., description="Original generation request")
+    result: Optional[ScriptGenerationResponse] = Field(
+        default=None,
+        description="Generation result (set when status=completed)"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Error message (set when status=failed)"
+    )
+    owner: Optional[str] = Field(default=None, description="Instance that queued and runs the job")
+    created_at: datetime = Field(..., description="Time the job was enqueued")
+    started_at: Optional[datetime] = Field(default=None, description="Time a worker picked the job up")
+    finished_at: Optional[datetime] = Field(default=None, description="Time the job completed or failed")
+    heartbeat_at: Optional[datetime] = Field(default=None, description="Last time the owner reported the job alive")
+    expires_at: datetime = Field(..., description="Time after which the job is purged")
+
+    class Config:
+        populate_by_name = True
+
+
+class ScriptJobCreatedResponse(BaseModel):
+    """Response model returned when a job is enqueued."""
+
+    job_id: str = Field(..., description="Job identifier, poll GET /scripts/jobs/{job_id}")
+    status: JobStatus = Field(default="queued", description="Job status")
+    created_at: datetime = Field(..., description="Time the job was enqueued")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "3f7c9b2e4d1a4c5f8e6b0a9d2c1e7f34",
+                "status": "queued",
+                "created_at": "2025-01-01T12:00:00Z"
+            }
+        }
+
+
+class ScriptJobResponse(BaseModel):
+    """Response model for job status polling."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Current job status")
+    result: Optional[ScriptGenerationResponse] = Field(
+        default=None,
+        description="Generation result (set when status=completed)"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Error message (set when status=failed)"
+    )
+    created_at: datetime = Field(..., description="Time the job was enqueued")
+    started_at: Optional[datetime] = Field(default=None, description="Time a worker picked the job up")
+    finished_at: Optional[datetime] = Field(default=None, description="Time the job completed or failed")
@@ -3,6 +3,8 @@
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 
+from app.core.config import AgentProfile
+
 
 class ScriptGenerationRequest(BaseModel):
     """Request model for script generation."""
@@ -45,6 +47,27 @@ class ScriptGenerationRequest(BaseModel):
         default=None,
         description="Number of sections (1 = single continuous script)"
     )
+    inspiration_strategy: Optional[Literal["truncate", "condense", "retrieve"]] = Field(
+        default=None,
+        description="How inspiration transcripts feed the script: truncate (trim raw transcripts), condense (cached per-video briefs) or retrieve (chunks most relevant to description and use_case); defaults to INSPIRATION_STRATEGY"
+    )
+    max_inspiration_minutes: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Only download and transcribe the first N minutes of each inspiration video; defaults to INSPIRATION_MAX_MINUTES"
+    )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Skip cached LLM responses and generate fresh ones"
+    )
+    agent_overrides: Optional[dict[str, AgentProfile]] = Field(
+        default=None,
+        description="LLM parameters per agent class name, e.g. {\"TitleAgent\": {\"model\": \"deepseek-chat\", \"max_tokens\": 60}}"
+    )
+    include_usage: bool = Field(
+        default=False,
+        description="Attach LLM token usage, cost and latency to the response"
+    )
 
     class Config:
         json_schema_extra = {
@@ -60,6 +83,28 @@ class ScriptGenerationRequest(BaseModel):
         }
 
 
+class LLMUsage(BaseModel):
+    """Token usage, cost and latency of a group of LLM calls."""
+
+    calls: int = Field(..., description="LLM API calls")
+    cache_hits: int = Field(..., description="Completions served from the response cache")
+    coalesced: int = Field(default=0, description="Completions shared with an identical call in flight")
+    prompt_tokens: int = Field(..., description="Prompt tokens")
+    completion_tokens: int = Field(..., description="Completion tokens")
+    cached_tokens: int = Field(..., description="Prompt tokens served from the provider's prompt cache")
+    prompt_cache_hit_ratio: Optional[float] = Field(default=None, description="cached_tokens / prompt_tokens")
+    total_latency: float = Field(..., description="Summed call latency in seconds")
+    avg_latency: Optional[float] = Field(default=None, description="Mean call latency in seconds")
+    cost: Optional[float] = Field(default=None, description="Estimated cost (None if a model has no pricing)")
+
+
+class ScriptUsage(BaseModel):
+    """LLM usage of a script generation request."""
+
+    total: LLMUsage = Field(..., description="All calls of the request")
+    agents: dict[str, LLMUsage] = Field(default_factory=dict, description="Calls per agent class name")
+
+
 class ScriptGenerationResponse(BaseModel):
     """Response model for script generation."""
 
@@ -84,6 +129,14 @@ class ScriptGenerationResponse(BaseModel):
         default=None,
         description="Generated or refined title"
     )
+    stage_timings: Optional[dict[str, float]] = Field(
+        default=None,
+        description="Wall-clock duration of each pipeline stage in seconds"
+    )
+    usage: Optional[ScriptUsage] = Field(
+        default=None,
+        description="LLM usage (set when include_usage=true)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -95,3 +148,28 @@ class ScriptGenerationResponse(BaseModel):
                 "title": "Master Python Programming in 30 Days"
             }
         }
+
+
+class ScriptBatchRequest(BaseModel):
+    """Request model for batch script generation."""
+
+    items: list[ScriptGenerationRequest] = Field(
+        ...,
+        min_length=1,
+        description="Script generation requests (e.g. all scripts of a campaign)"
+    )
+
+
+class ScriptBatchItemResult(BaseModel):
+    """One NDJSON line of a batch script generation response."""
+
+    index: int = Field(..., description="Position of the item in the batch request")
+    status: Literal["completed", "failed"] = Field(..., description="Item outcome")
+    result: Optional[ScriptGenerationResponse] = Field(
+        default=None,
+        description="Generation result (set when status=completed)"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Error message (set when status=failed)"
+    )
@@ -0,0 +1,10 @@
+"""Pydantic models for incoming webhooks."""
+
+from pydantic import BaseModel, Field
+
+
+class AssemblyAIWebhook(BaseModel):
+    """Notification AssemblyAI posts when a transcript finishes."""
+
+    transcript_id: str = Field(..., description="ID of the finished transcript")
+    status: str = Field(..., description="Transcript status (completed or error)")
@@ -2,7 +2,18 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from app.core.config import settings
+from app.core.executors import executors_stats, run_disk
+from app.core.lease import get_media_leases
+from app.core.llm_client import get_llm_client
+from app.core.usage import get_usage_tracker
 from app.llm.prompts_migrator import migrate_prompts_to_mongodb
+from app.services.assemblyai_client import get_assemblyai_client
+from app.services.condensation_service import get_condensation_service
+from app.services.media_cache import get_media_cache
+from app.services.prompt_service import get_prompt_service
+from app.services.transcription_service import get_transcription_service
+from app.services.video_download_service import get_video_download_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +28,7 @@ async def trigger_prompt_migration():
     logger.info("Admin endpoint /migrate_prompts called.")
     try:
         update = await migrate_prompts_to_mongodb()
+        (await get_prompt_service()).clear_cache()
         return update
     except Exception as e:
         logger.error(f"Prompt migration failed: {e}")
@@ -24,3 +36,67 @@ async def trigger_prompt_migration():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to migrate prompts: {e}"
         )
+
+
+@router.post("/media-cache/migrate", summary="Move per-project video files to the global media cache")
+async def trigger_media_cache_migration() -> dict:
+    """
+    Moves audio and transcript files of the legacy per-project layout into the
+    global media cache and records them in the project manifests. Safe to run again.
+    """
+    logger.info("Admin endpoint /media-cache/migrate called.")
+    try:
+        return await run_disk(get_media_cache().migrate_legacy_files)
+    except Exception as e:
+        logger.error(f"Media cache migration failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to migrate media cache: {e}"
+        )
+
+
+@router.get("/media-cache/stats", summary="Download and transcription deduplication statistics")
+async def media_cache_stats() -> dict:
+    """
+    Returns in-flight download/transcription counters, AssemblyAI job counters, cache
+    file integrity counters and, when enabled, cross-replica lease counters.
+    """
+    return {
+        "transcriptions": get_transcription_service().singleflight.stats(),
+        "assemblyai": get_assemblyai_client().stats() if settings.assemblyai_api_key else None,
+        "downloads": get_video_download_service().singleflight.stats(),
+        "files": get_media_cache().stats(),
+        "leases": (await get_media_leases()).stats() if settings.media_lease_enabled else None,
+    }
+
+
+@router.get("/executors/stats", summary="Blocking I/O thread pool statistics")
+async def executor_stats() -> dict:
+    """
+    Returns workers, running and queued tasks and queue wait peaks of the download and disk thread pools.
+    """
+    return executors_stats()
+
+
+@router.get("/llm/stats", summary="LLM client statistics")
+async def llm_stats() -> dict:
+    """
+    Returns LLM client statistics (connection pool usage).
+    """
+    return get_llm_client().stats()
+
+
+@router.get("/llm/usage", summary="LLM token usage, cost and latency")
+async def llm_usage() -> dict:
+    """
+    Returns LLM usage since startup, in total and per agent, language, use case and model.
+    """
+    return get_usage_tracker().summary()
+
+
+@router.get("/inspirations/stats", summary="Inspiration condensation statistics")
+async def inspiration_stats() -> dict:
+    """
+    Returns inspiration brief counters (short transcripts, cache hits, condensations, failures).
+    """
+    return (await get_condensation_service()).stats()
@@ -1,16 +1,25 @@
 """API routes for script generation."""
 
+import json
 import logging
 import traceback
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
-from app.models.script import ScriptGenerationRequest, ScriptGenerationResponse
+from app.models.script import ScriptBatchRequest, ScriptGenerationRequest, ScriptGenerationResponse
+from app.models.job import ScriptJobCreatedResponse, ScriptJobResponse
 from app.models.contextual_description import (
     ContextualDescriptionRequest,
     ContextualDescriptionResponse,
 )
 from app.services.script_orchestrator import get_orchestrator
+from app.services.job_service import JobQueueFullError, get_job_service
+from app.services.batch_service import get_batch_service
 from app.services.contextual_description_service import create_contextual_description_service # Changed import
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +74,177 @@ async def generate_script(
         )
 
 
+def _format_sse(event: str, data: dict[str, Any]) -> str:
+    """Format a Server-Sent Events message.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        SSE-encoded message
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post(
+    "/generate/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Generate video script (Server-Sent Events)",
+    description="""
+    Same pipeline as /scripts/generate, streamed as Server-Sent Events.
+
+    Events:
+    - stage_started / stage_completed / stage_failed: pipeline progress
+    - token: script text deltas as they are generated
+    - script, title, keywords, description: each output as soon as it is ready
+    - result: the complete ScriptGenerationResponse
+    - error: generation failed (the stream ends after it)
+    """,
+    response_class=StreamingResponse,
+)
+async def generate_script_stream(
+    request: ScriptGenerationRequest
+) -> StreamingResponse:
+    """Stream video script generation progress for a project.
+
+    Args:
+        request: Script generation request
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Received streaming script generation request for {request.title}")
+    orchestrator = get_orchestrator()
+
+    async def event_stream() -> AsyncIterator[str]:
+        async with aclosing(orchestrator.generate_script_stream(request)) as events:
+            async for event, data in events:
+                yield _format_sse(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        },
+    )
+
+
+@router.post(
+    "/generate/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Generate many video scripts (NDJSON)",
+    description="""
+    Generate scripts for a list of requests (e.g. a whole campaign).
+
+    - Inspiration videos shared by several items are transcribed once
+    - Items run under a global concurrency limit (BATCH_MAX_CONCURRENCY)
+    - Results stream back as NDJSON, one line per item in completion order:
+      {"index": 0, "status": "completed", "result": {...}, "error": null}
+    """,
+    response_class=StreamingResponse,
+)
+async def generate_script_batch(
+    request: ScriptBatchRequest
+) -> StreamingResponse:
+    """Generate video scripts for a batch of requests.
+
+    Args:
+        request: Batch of script generation requests
+
+    Returns:
+        application/x-ndjson response
+
+    Raises:
+        HTTPException: If the batch is larger than allowed
+    """
+    logger.info(f"Received batch script generation request ({len(request.items)} items)")
+    if len(request.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch too large: {len(request.items)} items (max {settings.batch_max_items})"
+        )
+
+    batch_service = get_batch_service()
+
+    async def result_lines() -> AsyncIterator[str]:
+        async with aclosing(batch_service.generate_batch(request.items)) as results:
+            async for item in results:
+                yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/jobs",
+    response_model=ScriptJobCreatedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enqueue a script generation job",
+    description="""
+    Enqueue a script generation request and return a job id immediately.
+    Poll GET /scripts/jobs/{job_id} for status and result.
+    Returns 429 when the job queue is full.
+    """
+)
+async def create_script_job(
+    request: ScriptGenerationRequest
+) -> ScriptJobCreatedResponse:
+    """Enqueue a script generation job.
+
+    Args:
+        request: Script generation request
+
+    Returns:
+        Created job id and status
+
+    Raises:
+        HTTPException: If the queue is full
+    """
+    logger.info(f"Received script job request for {request.title}")
+    job_service = await get_job_service()
+
+    try:
+        job = await job_service.submit(request)
+    except JobQueueFullError as e:
+        logger.warning(f"Rejecting script job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
+        )
+
+    return ScriptJobCreatedResponse(job_id=job.job_id, status=job.status, created_at=job.created_at)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ScriptJobResponse,
+    summary="Get script generation job status",
+    description="Get the status of a script generation job and its result once completed."
+)
+async def get_script_job(job_id: str) -> ScriptJobResponse:
+    """Get a script generation job.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        Job status, result or error
+
+    Raises:
+        HTTPException: If the job is unknown or expired
+    """
+    job_service = await get_job_service()
+    job = await job_service.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    return ScriptJobResponse(**job.model_dump(exclude={"request", "expires_at"}))
+
+
 @router.post(
     "/description-contextuel/generate",
     response_model=ContextualDescriptionResponse,
@@ -0,0 +1,36 @@
+"""API routes receiving third-party webhooks."""
+
+import hmac
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.config import settings
+from app.models.webhook import AssemblyAIWebhook
+from app.services.assemblyai_client import WEBHOOK_AUTH_HEADER, get_assemblyai_client
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+
+@router.post("/assemblyai", summary="AssemblyAI transcript completion callback")
+async def assemblyai_webhook(
+    payload: AssemblyAIWebhook,
+    secret: Optional[str] = Header(default=None, alias=WEBHOOK_AUTH_HEADER),
+) -> dict:
+    """
+    Wakes up the transcription waiting for this transcript, which then fetches its result.
+
+    Requests must carry ASSEMBLYAI_WEBHOOK_SECRET in the X-Webhook-Secret header when it is set.
+    """
+    expected = settings.assemblyai_webhook_secret
+    if expected and not hmac.compare_digest(secret or "", expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook secret")
+
+    awaited = get_assemblyai_client().notify(payload.transcript_id)
+    if not awaited:
+        # Transcript submitted by another replica (which keeps polling) or already handled
+        logger.info(f"AssemblyAI webhook for transcript {payload.transcript_id} not awaited here")
+    return {"transcript_id": payload.transcript_id, "awaited": awaited}
@@ -0,0 +1,243 @@
+"""Async AssemblyAI client: upload, submit and await transcripts without holding threads."""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.executors import run_disk
+from app.core.retry import RetryMetrics, RetryPolicy, call_with_retry
+
+logger = logging.getLogger(__name__)
+
+# Header AssemblyAI sends with webhooks when ASSEMBLYAI_WEBHOOK_SECRET is set
+WEBHOOK_AUTH_HEADER = "X-Webhook-Secret"
+
+# Size of the file reads streamed to the upload endpoint
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Label of AssemblyAI calls in retry logs and metrics
+RETRY_LABEL = "AssemblyAI"
+
+
+class TranscriptionError(Exception):
+    """Raised when AssemblyAI reports a failed transcript or does not finish in time."""
+
+
+def _open_binary(path: Path) -> BinaryIO:
+    """Open a file for binary reading."""
+    return open(path, "rb")
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """Stream a file in chunks, reading each one in the disk executor."""
+    file = await run_disk(_open_binary, path)
+    try:
+        while chunk := await run_disk(file.read, UPLOAD_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file.close()
+
+
+class AssemblyAIClient:
+    """Talks to the AssemblyAI REST API (ASSEMBLYAI_BASE_URL) with httpx.
+
+    A transcription is an upload, a job submission, then a wait for the job
+    to finish. The wait holds no thread: the coroutine sleeps between status
+    polls spaced by a growing interval (ASSEMBLYAI_POLL_INITIAL_INTERVAL up to
+    ASSEMBLYAI_POLL_MAX_INTERVAL), and is woken up early by the job's webhook
+    when ASSEMBLYAI_WEBHOOK_URL is set. Polling goes on with webhooks enabled
+    since a webhook may be lost or delivered to another replica.
+    """
+
+    def __init__(self) -> None:
+        """Initialize client from settings."""
+        self.http_client = httpx.AsyncClient(
+            base_url=settings.assemblyai_base_url,
+            headers={"authorization": settings.assemblyai_api_key},
+            timeout=settings.assemblyai_http_timeout,
+        )
+        self.retry_policy = RetryPolicy()
+        self.retry_metrics = RetryMetrics()
+        self.poll_policy = RetryPolicy(
+            base_delay=settings.assemblyai_poll_initial_interval,
+            max_delay=settings.assemblyai_poll_max_interval,
+            multiplier=1.5,
+            jitter=0.2,
+        )
+        # Transcripts being awaited, woken up by their webhook
+        self.waiters: dict[str, asyncio.Event] = {}
+        self.metrics: Counter = Counter()
+
+    async def transcribe(self, audio_path: Path) -> str:
+        """Transcribe an audio file.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Transcribed text
+
+        Raises:
+            TranscriptionError: If the transcript failed or timed out
+            httpx.HTTPError: If the API could not be reached
+        """
+        upload_url = await self.upload(audio_path)
+        transcript_id = await self.submit(upload_url)
+        transcript = await self.wait(transcript_id)
+        return transcript.get("text") or ""
+
+    async def upload(self, audio_path: Path) -> str:
+        """Upload an audio file to AssemblyAI's storage.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            URL of the uploaded file, usable as audio_url
+        """
+        async def attempt() -> str:
+            response = await self.http_client.post("/v2/upload", content=_read_chunks(audio_path))
+            response.raise_for_status()
+            return response.json()["upload_url"]
+
+        return await call_with_retry(attempt, self.retry_policy, RETRY_LABEL, self.retry_metrics)
+
+    async def submit(self, audio_url: str) -> str:
+        """Create a transcription job.
+
+        Args:
+            audio_url: URL of the audio (see upload)
+
+        Returns:
+            Transcript ID
+        """
+        payload: dict[str, Any] = {"audio_url": audio_url}
+        if settings.assemblyai_webhook_url:
+            payload["webhook_url"] = settings.assemblyai_webhook_url
+            if settings.assemblyai_webhook_secret:
+                payload["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+                payload["webhook_auth_header_value"] = settings.assemblyai_webhook_secret
+
+        async def attempt() -> str:
+            response = await self.http_client.post("/v2/transcript", json=payload)
+            response.raise_for_status()
+            return response.json()["id"]
+
+        transcript_id = await call_with_retry(attempt, self.retry_policy, RETRY_LABEL, self.retry_metrics)
+        self.metrics["submitted"] += 1
+        logger.info(f"🎤 AssemblyAI transcript {transcript_id} submitted")
+        return transcript_id
+
+    async def get_transcript(self, transcript_id: str) -> dict[str, Any]:
+        """Fetch a transcript (status, and text once completed).
+
+        Args:
+            transcript_id: Transcript ID
+
+        Returns:
+            Transcript resource
+        """
+        async def attempt() -> dict[str, Any]:
+            response = await self.http_client.get(f"/v2/transcript/{transcript_id}")
+            response.raise_for_status()
+            return response.json()
+
+        return await call_with_retry(attempt, self.retry_policy, RETRY_LABEL, self.retry_metrics)
+
+    async def wait(self, transcript_id: str) -> dict[str, Any]:
+        """Wait for a transcript to finish.
+
+        Args:
+            transcript_id: Transcript ID
+
+        Returns:
+            Completed transcript resource
+
+        Raises:
+            TranscriptionError: If the transcript failed or did not finish
+                within ASSEMBLYAI_MAX_WAIT_SECONDS
+        """
+        event = self.waiters.setdefault(transcript_id, asyncio.Event())
+        deadline = time.monotonic() + settings.assemblyai_max_wait_seconds
+        polls = 0
+        try:
+            while True:
+                # Cleared before the poll so a webhook arriving meanwhile is not missed
+                event.clear()
+                transcript = await self.get_transcript(transcript_id)
+                polls += 1
+                status = transcript.get("status")
+                if status == "completed":
+                    self.metrics["completed"] += 1
+                    logger.info(f"✅ AssemblyAI transcript {transcript_id} completed after {polls} poll(s)")
+                    return transcript
+                if status == "error":
+                    self.metrics["failed"] += 1
+                    raise TranscriptionError(f"Transcript {transcript_id} failed: {transcript.get('error')}")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.metrics["timed_out"] += 1
+                    raise TranscriptionError(
+                        f"Transcript {transcript_id} not finished after {settings.assemblyai_max_wait_seconds}s"
+                    )
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(self.poll_policy.backoff(polls), remaining))
+                    self.metrics["webhook_wakeups"] += 1
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.waiters.pop(transcript_id, None)
+
+    def notify(self, transcript_id: str) -> bool:
+        """Wake up the wait of a transcript whose webhook was received.
+
+        Args:
+            transcript_id: Transcript ID
+
+        Returns:
+            True if this instance is waiting for the transcript
+        """
+        event = self.waiters.get(transcript_id)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        await self.http_client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Get client statistics.
+
+        Returns:
+            Transcripts awaited, job counters and retry counters
+        """
+        return {
+            "waiting": len(self.waiters),
+            **self.metrics,
+            "retries": self.retry_metrics.snapshot(),
+        }
+
+
+# Global singleton
+_assemblyai_client: Optional[AssemblyAIClient] = None
+
+
+def get_assemblyai_client() -> AssemblyAIClient:
+    """Get or create AssemblyAI client singleton.
+
+    Returns:
+        AssemblyAIClient instance
+    """
+    global _assemblyai_client
+    if _assemblyai_client is None:
+        _assemblyai_client = AssemblyAIClient()
+    return _assemblyai_client
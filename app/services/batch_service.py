@@ -0,0 +1,153 @@
+"""Service for generating many scripts in one request."""
+
+import asyncio
+import logging
+from typing import AsyncGenerator, Optional
+
+from app.core.config import settings
+from app.models.script import ScriptBatchItemResult, ScriptGenerationRequest
+from app.services.script_orchestrator import get_orchestrator
+from app.services.transcription_service import TranscriptionService, VideoTranscript, get_transcription_service
+
+logger = logging.getLogger(__name__)
+
+
+class SharedTranscriber:
+    """Transcribes each distinct video URL once for all items of a batch.
+
+    Exposes the same transcribe_video_list() call as TranscriptionService so
+    it can be handed to the orchestrator in its place.
+    """
+
+    def __init__(self, transcription_service: TranscriptionService):
+        """Initialize shared transcriber.
+
+        Args:
+            transcription_service: Underlying transcription service
+        """
+        self.transcription_service = transcription_service
+        self.tasks: dict[tuple[str, Optional[int]], asyncio.Task] = {}
+
+    async def transcribe_video_list(
+        self,
+        video_urls: list[str],
+        project_title: str,
+        clip_minutes: Optional[int] = None
+    ) -> list[VideoTranscript]:
+        """Transcribe videos concurrently, reusing transcriptions already started by the batch.
+
+        The transcription service's global concurrency limit applies; a video
+        that fails is logged and left out without affecting the others.
+
+        Args:
+            video_urls: List of video URLs
+            project_title: Project title (cache directory of the first requester)
+            clip_minutes: Only use the first minutes of each video (None = whole videos)
+
+        Returns:
+            Transcripts of the videos that could be transcribed, in URL order
+        """
+        tasks = []
+        for url in video_urls:
+            task = self.tasks.get((url, clip_minutes))
+            if task is None:
+                task = asyncio.create_task(
+                    self.transcription_service.transcribe_video_url(url, project_title, clip_minutes)
+                )
+                self.tasks[(url, clip_minutes)] = task
+            else:
+                logger.info(f"Reusing batch transcription of {url}")
+            tasks.append(task)
+
+        # Shielded so a cancelled item does not cancel other items' transcription
+        texts = await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+
+        transcripts = []
+        for url, text in zip(video_urls, texts):
+            if isinstance(text, BaseException):
+                logger.error(f"❌ Transcription of {url} failed: {text!r}")
+            elif text:
+                transcripts.append(VideoTranscript.from_url(url, text))
+
+        return transcripts
+
+    async def close(self) -> None:
+        """Cancel transcriptions nobody is waiting for anymore."""
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+
+class BatchScriptService:
+    """Runs batches of script generation requests under a global concurrency limit."""
+
+    def __init__(self) -> None:
+        """Initialize batch service."""
+        # Shared by every batch so concurrent batches cannot exceed the limit together
+        self.semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+        logger.info(f"BatchScriptService initialized (max concurrency {settings.batch_max_concurrency})")
+
+    async def generate_batch(
+        self,
+        requests: list[ScriptGenerationRequest]
+    ) -> AsyncGenerator[ScriptBatchItemResult, None]:
+        """Generate scripts for all requests, yielding results as items complete.
+
+        Identical inspiration videos are transcribed once per batch. Item
+        failures are reported in their result and do not stop the batch.
+        Closing the iterator cancels the remaining items.
+
+        Args:
+            requests: Script generation requests
+
+        Yields:
+            Item results in completion order
+        """
+        orchestrator = get_orchestrator()
+        transcriber = SharedTranscriber(get_transcription_service())
+
+        async def run_item(index: int, request: ScriptGenerationRequest) -> ScriptBatchItemResult:
+            async with self.semaphore:
+                try:
+                    response = await orchestrator.generate_script(request, transcriber=transcriber)
+                    return ScriptBatchItemResult(index=index, status="completed", result=response)
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}")
+                    return ScriptBatchItemResult(
+                        index=index,
+                        status="failed",
+                        error=f"Script generation failed: {e}"
+                    )
+
+        logger.info(f"Starting batch of {len(requests)} script(s)")
+        tasks = [asyncio.create_task(run_item(i, request)) for i, request in enumerate(requests)]
+        completed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                completed += 1
+                yield result
+            logger.info(f"Batch completed: {len(requests)} script(s)")
+        finally:
+            if completed < len(tasks):
+                logger.info(f"Batch interrupted after {completed}/{len(tasks)} item(s), cancelling the rest")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await transcriber.close()
+
+
+# Global singleton
+_batch_service: Optional[BatchScriptService] = None
+
+
+def get_batch_service() -> BatchScriptService:
+    """Get or create batch script service singleton.
+
+    Returns:
+        BatchScriptService instance
+    """
+    global _batch_service
+    if _batch_service is None:
+        _batch_service = BatchScriptService()
+    return _batch_service
@@ -0,0 +1,195 @@
+"""Service for condensing long inspiration transcripts into cached briefs."""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.agents.condensation_agent import CondensationAgent
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.request_context import llm_cache_bypassed
+from app.core.singleflight import SingleFlight
+from app.core.tokens import count_tokens, split_into_chunks
+from app.helpers.datetime_utils import now_utc
+from app.services.transcription_service import TRANSCRIPT_SEPARATOR, VideoTranscript, transcript_hash
+
+logger = logging.getLogger(__name__)
+
+
+class InspirationCondenser:
+    """Condenses inspiration transcripts into compact briefs with a map-reduce.
+
+    Map: transcripts longer than CONDENSE_MIN_TOKENS are split into
+    CONDENSE_CHUNK_TOKENS chunks summarized in parallel by the
+    CondensationAgent. Reduce: the notes are merged into one brief, in several
+    rounds when they do not fit a single call.
+
+    Briefs are stored in the inspiration_briefs collection keyed by platform
+    and video ID, so every project using a video reuses them; a brief is
+    rebuilt when the transcript it was made from changed. Condensation errors
+    are logged and the raw transcript is used instead: condensation never
+    fails a request.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize condenser.
+
+        Args:
+            database: MongoDB database
+        """
+        self.collection = database["inspiration_briefs"]
+        self.agent = CondensationAgent()
+        self.ttl = settings.inspiration_brief_ttl_seconds
+        # Projects condensing the same video at the same time share one map-reduce
+        self.singleflight: SingleFlight[str] = SingleFlight("inspiration_briefs")
+        self.metrics: Counter = Counter()
+
+    async def start(self) -> None:
+        """Create the TTL index of the brief collection."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def condense_all(self, transcripts: list[VideoTranscript]) -> list[str]:
+        """Condense the transcripts of several videos concurrently.
+
+        Args:
+            transcripts: Inspiration transcripts
+
+        Returns:
+            Brief (or short transcript) of each video, in the same order
+        """
+        return list(await asyncio.gather(*(self.condense(transcript) for transcript in transcripts)))
+
+    async def condense(self, transcript: VideoTranscript) -> str:
+        """Get the brief of one video, building it if needed.
+
+        Args:
+            transcript: Inspiration transcript
+
+        Returns:
+            Brief, or the transcript itself if it is short or condensation failed
+        """
+        tokens = count_tokens(transcript.text)
+        if tokens <= settings.condense_min_tokens:
+            self.metrics["short"] += 1
+            return transcript.text
+
+        digest = transcript_hash(transcript.text)
+        try:
+            brief = await self.singleflight.do(
+                (transcript.key, digest),
+                lambda: self._get_or_build(transcript, digest),
+            )
+        except Exception as e:
+            logger.warning(f"Condensation of video {transcript.key} failed, using its transcript: {e}")
+            self.metrics["failures"] += 1
+            return transcript.text
+
+        logger.info(f"Video {transcript.key}: {tokens} transcript tokens condensed to {count_tokens(brief)}")
+        return brief
+
+    async def _get_or_build(self, transcript: VideoTranscript, digest: str) -> str:
+        """Load a video's brief from the cache, or build and store it."""
+        if self.ttl > 0 and not llm_cache_bypassed():
+            brief = await self._load(transcript.key, digest)
+            if brief is not None:
+                self.metrics["cache_hits"] += 1
+                return brief
+
+        self.metrics["condensed"] += 1
+        brief = await self._build(transcript.text)
+        if self.ttl > 0:
+            await self._store(transcript, digest, brief)
+        return brief
+
+    async def _build(self, text: str) -> str:
+        """Run the map-reduce on a transcript."""
+        chunks = split_into_chunks(text, settings.condense_chunk_tokens)
+        if len(chunks) == 1:
+            return await self.agent.write_brief(chunks[0])
+
+        semaphore = asyncio.Semaphore(settings.condense_max_parallel_chunks)
+
+        async def summarize(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self.agent.summarize_chunk(chunk, f"{index + 1}/{len(chunks)}")
+
+        notes = list(await asyncio.gather(*(summarize(i, chunk) for i, chunk in enumerate(chunks))))
+        logger.info(f"Summarized {len(chunks)} transcript chunk(s), merging notes")
+        while True:
+            groups = self._group(notes)
+            if len(groups) == 1:
+                return await self.agent.write_brief(TRANSCRIPT_SEPARATOR.join(groups[0]))
+            notes = list(await asyncio.gather(
+                *(self.agent.write_brief(TRANSCRIPT_SEPARATOR.join(group)) for group in groups)
+            ))
+
+    def _group(self, notes: list[str]) -> list[list[str]]:
+        """Pack notes into groups that fit one reduce call (at least two notes per group)."""
+        groups: list[list[str]] = [[]]
+        size = 0
+        for note in notes:
+            tokens = count_tokens(note)
+            if len(groups[-1]) >= 2 and size + tokens > settings.condense_chunk_tokens:
+                groups.append([])
+                size = 0
+            groups[-1].append(note)
+            size += tokens
+        return groups
+
+    async def _load(self, key: str, digest: str) -> Optional[str]:
+        """Read a brief from MongoDB (errors count as misses)."""
+        try:
+            document = await self.collection.find_one({
+                "_id": key,
+                "transcript_hash": digest,
+                "expires_at": {"$gt": now_utc()},
+            })
+        except Exception as e:
+            logger.warning(f"Inspiration brief lookup failed: {e}")
+            return None
+        return document["brief"] if document else None
+
+    async def _store(self, transcript: VideoTranscript, digest: str, brief: str) -> None:
+        """Write a brief to MongoDB (errors are logged)."""
+        now = now_utc()
+        try:
+            await self.collection.replace_one(
+                {"_id": transcript.key},
+                {
+                    "url": transcript.url,
+                    "transcript_hash": digest,
+                    "brief": brief,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"Inspiration brief store failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Get condensation statistics.
+
+        Returns:
+            Counters of short transcripts, cache hits, condensations and failures
+        """
+        return {**self.metrics, "singleflight": self.singleflight.stats()}
+
+
+# Singleton instance
+_condenser: Optional[InspirationCondenser] = None
+
+
+async def get_condensation_service() -> InspirationCondenser:
+    """
+    Dependency to get a singleton instance of InspirationCondenser.
+    """
+    global _condenser
+    if _condenser is None:
+        database = await get_database()
+        _condenser = InspirationCondenser(database)
+    return _condenser
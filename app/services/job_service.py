@@ -0,0 +1,239 @@
+"""Service for running script generation as asynchronous jobs."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.helpers.datetime_utils import now_utc
+from app.models.job import ScriptJob
+from app.models.script import ScriptGenerationRequest
+from app.services.script_orchestrator import get_orchestrator
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has reached its maximum depth."""
+
+
+class ScriptJobService:
+    """Queues script generation jobs and runs them on an in-process worker pool.
+
+    Job documents live in MongoDB (with a TTL index on expires_at) so status
+    and results can be polled; the queue itself is in memory. Each job records
+    the instance that owns it, and every instance refreshes the heartbeat_at
+    of its pending jobs every JOBS_HEARTBEAT_INTERVAL_SECONDS. Pending jobs
+    whose heartbeat is older than JOBS_HEARTBEAT_TIMEOUT_SECONDS belong to an
+    instance that died, and are marked as failed by any live instance.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize job service.
+
+        Args:
+            database: MongoDB database
+        """
+        self.collection = database["script_jobs"]
+        # Unique per process, like lease owners
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.jobs_queue_max_size)
+        self.workers: list[asyncio.Task] = []
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self.result_ttl = timedelta(seconds=settings.jobs_result_ttl_seconds)
+
+    async def start(self) -> None:
+        """Create indexes, fail jobs of dead instances and start workers."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index([("status", 1), ("heartbeat_at", 1)])
+        await self._fail_orphaned_jobs()
+
+        for i in range(settings.jobs_worker_concurrency):
+            self.workers.append(asyncio.create_task(self._worker(i), name=f"script-job-worker-{i}"))
+        self.heartbeat_task = asyncio.create_task(self._heartbeat(), name="script-job-heartbeat")
+        logger.info(
+            f"ScriptJobService {self.owner} started with {settings.jobs_worker_concurrency} worker(s), "
+            f"queue max size {settings.jobs_queue_max_size}"
+        )
+
+    async def stop(self) -> None:
+        """Cancel all workers and fail the jobs still waiting in the queue."""
+        tasks = [*self.workers, *([self.heartbeat_task] if self.heartbeat_task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers.clear()
+        self.heartbeat_task = None
+
+        # Running jobs were failed by their worker; queued ones are lost with the queue
+        now = now_utc()
+        await self.collection.update_many(
+            {"owner": self.owner, "status": "queued"},
+            {"$set": {
+                "status": "failed",
+                "error": "Job interrupted by a service shutdown",
+                "finished_at": now,
+                "expires_at": now + self.result_ttl,
+            }},
+        )
+        logger.info("ScriptJobService stopped")
+
+    async def submit(self, request: ScriptGenerationRequest) -> ScriptJob:
+        """Enqueue a script generation request.
+
+        Args:
+            request: Script generation request
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If the queue is at maximum depth
+        """
+        if self.queue.full():
+            raise JobQueueFullError(f"Job queue is full ({self.queue.maxsize} jobs)")
+
+        now = now_utc()
+        job = ScriptJob(
+            _id=uuid.uuid4().hex,
+            status="queued",
+            request=request,
+            owner=self.owner,
+            created_at=now,
+            heartbeat_at=now,
+            expires_at=now + self.result_ttl,
+        )
+        await self.collection.insert_one(job.model_dump(by_alias=True))
+
+        try:
+            self.queue.put_nowait(job.job_id)
+        except asyncio.QueueFull:
+            # Filled up while the document was being inserted
+            await self.collection.delete_one({"_id": job.job_id})
+            raise JobQueueFullError(f"Job queue is full ({self.queue.maxsize} jobs)")
+
+        logger.info(f"Enqueued script job {job.job_id} (queue depth {self.queue.qsize()})")
+        return job
+
+    async def get(self, job_id: str) -> Optional[ScriptJob]:
+        """Get a job by id.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown or expired
+        """
+        document = await self.collection.find_one({"_id": job_id})
+        return ScriptJob(**document) if document else None
+
+    async def _worker(self, index: int) -> None:
+        """Worker loop: run queued jobs one at a time until cancelled."""
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index} failed to process job {job_id}: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        """Run a single job and persist its outcome.
+
+        Args:
+            job_id: Job identifier
+        """
+        document = await self.collection.find_one_and_update(
+            {"_id": job_id, "owner": self.owner, "status": "queued"},
+            {"$set": {"status": "running", "started_at": now_utc()}},
+        )
+        if not document:
+            logger.warning(f"Job {job_id} no longer queued, skipping")
+            return
+
+        job = ScriptJob(**document)
+        logger.info(f"Running script job {job_id}")
+        try:
+            response = await get_orchestrator().generate_script(job.request)
+        except asyncio.CancelledError:
+            await self._finish(job_id, {"status": "failed", "error": "Job cancelled during shutdown"})
+            raise
+        except Exception as e:
+            logger.error(f"Script job {job_id} failed: {e}", exc_info=True)
+            await self._finish(job_id, {"status": "failed", "error": f"Script generation failed: {e}"})
+            return
+
+        await self._finish(job_id, {"status": "completed", "result": response.model_dump()})
+        logger.info(f"Script job {job_id} completed")
+
+    async def _heartbeat(self) -> None:
+        """Heartbeat loop: keep this instance's jobs alive and fail orphaned ones."""
+        while True:
+            await asyncio.sleep(settings.jobs_heartbeat_interval_seconds)
+            try:
+                await self.collection.update_many(
+                    {"owner": self.owner, "status": {"$in": ["queued", "running"]}},
+                    {"$set": {"heartbeat_at": now_utc()}},
+                )
+                await self._fail_orphaned_jobs()
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+
+    async def _fail_orphaned_jobs(self) -> None:
+        """Mark as failed the pending jobs of instances that stopped heartbeating."""
+        now = now_utc()
+        cutoff = now - timedelta(seconds=settings.jobs_heartbeat_timeout_seconds)
+        pending = {"$in": ["queued", "running"]}
+        orphaned = await self.collection.update_many(
+            {"$or": [
+                {"status": pending, "heartbeat_at": {"$lt": cutoff}},
+                # Jobs created before heartbeats were recorded
+                {"status": pending, "heartbeat_at": None, "created_at": {"$lt": cutoff}},
+            ]},
+            {"$set": {
+                "status": "failed",
+                "error": "Job interrupted: the instance running it stopped",
+                "finished_at": now,
+                "expires_at": now + self.result_ttl,
+            }},
+        )
+        if orphaned.modified_count:
+            logger.warning(f"Marked {orphaned.modified_count} orphaned job(s) as failed")
+
+    async def _finish(self, job_id: str, fields: dict) -> None:
+        """Mark a job as finished and restart its TTL from now.
+
+        Args:
+            job_id: Job identifier
+            fields: Fields to set (status, result or error)
+        """
+        now = now_utc()
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {**fields, "finished_at": now, "expires_at": now + self.result_ttl}},
+        )
+
+
+# Singleton instance
+_job_service: Optional[ScriptJobService] = None
+
+
+async def get_job_service() -> ScriptJobService:
+    """
+    Dependency to get a singleton instance of ScriptJobService.
+    """
+    global _job_service
+    if _job_service is None:
+        database = await get_database()
+        _job_service = ScriptJobService(database)
+    return _job_service
@@ -0,0 +1,528 @@
+"""Global cache of inspiration video audio and transcripts, shared by all projects."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from slugify import slugify
+
+from app.core.config import settings
+from app.helpers.datetime_utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+# Per-project directory (files of the legacy layout, then the manifest)
+PROJECT_SUBDIR = "video-inspiration"
+MANIFEST_NAME = "manifest.json"
+
+# File names inside a cache entry
+AUDIO_NAME = "audio.mp3"
+TRANSCRIPT_NAME = "transcript.txt"
+
+# Sidecar of a cache file ({name}.meta.json), and in-progress writes (.{name}.{id}.part)
+SIDECAR_SUFFIX = ".meta.json"
+PARTIAL_SUFFIX = ".part"
+
+# In-progress writes not modified for this long are leftovers of a crashed process
+STALE_PARTIAL_SECONDS = 3600
+
+# Read size when checksumming files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Extensions of the legacy per-project files and the cache file they map to
+LEGACY_FILES = {".mp3": AUDIO_NAME, ".txt": TRANSCRIPT_NAME}
+
+# Last characters of a complete transcript (AssemblyAI punctuates its output)
+TRANSCRIPT_ENDINGS = (".", "!", "?", "…", '"', "”", "»", ")", "。", "！", "？")
+
+
+def clip_file_name(name: str, clip_minutes: Optional[int]) -> str:
+    """Name of a cache file for a clip of the video's first minutes.
+
+    Args:
+        name: Name of the whole-video file (AUDIO_NAME, TRANSCRIPT_NAME)
+        clip_minutes: Clip length in minutes (None = whole video)
+
+    Returns:
+        File name, e.g. "audio-5min.mp3" for a 5 minute clip
+    """
+    if not clip_minutes:
+        return name
+    stem, extension = name.rsplit(".", 1)
+    return f"{stem}-{clip_minutes}min.{extension}"
+
+
+def media_key(platform: str, video_id: str, clip_minutes: Optional[int] = None) -> str:
+    """Identity of a video's media (whole or clipped), for deduplication.
+
+    Args:
+        platform: Platform name
+        video_id: Canonical video ID
+        clip_minutes: Clip length in minutes (None = whole video)
+
+    Returns:
+        Key like "youtube/dQw4w9WgXcQ" or "youtube/dQw4w9WgXcQ@5min"
+    """
+    key = f"{platform}/{video_id}"
+    return f"{key}@{clip_minutes}min" if clip_minutes else key
+
+
+def guess_platform(video_id: str) -> str:
+    """Guess the platform of a legacy cache file from its video ID.
+
+    Facebook video IDs are numeric, YouTube ones are not.
+
+    Args:
+        video_id: Video ID
+
+    Returns:
+        Platform name
+    """
+    return "facebook" if video_id.isdigit() else "youtube"
+
+
+class MediaCache:
+    """Files of inspiration videos keyed by platform and canonical video ID.
+
+    Audio and transcript of a video are stored once under
+    {MEDIA_CACHE_PATH}/{platform}/{video_id}/, whichever projects use it.
+    Project directories ({VIDEOS_STORAGE_PATH}/{project}/video-inspiration/)
+    only hold a manifest.json listing the videos the project used and where
+    their files are.
+
+    Files are written to a temporary file, then renamed into place once
+    complete, after a sidecar {name}.meta.json recording their size, SHA-256,
+    source URL and timestamps. Reads check the file against its sidecar: a
+    truncated or altered file is deleted and treated as missing, so it is
+    fetched again. Files from before sidecars existed cannot be checked that
+    way: a transcript is kept (and given a sidecar) if it is non-empty UTF-8
+    text ending like a complete transcript, audio is dropped and downloaded
+    again.
+
+    Clips of the first minutes of a video (INSPIRATION_MAX_MINUTES) are
+    cached next to the whole-video files as audio-{N}min.mp3 and
+    transcript-{N}min.txt.
+
+    Files of the former per-project layout ({video_id}.mp3 / {video_id}.txt
+    in the project directory) are moved into the cache when first looked up,
+    or all at once with migrate_legacy_files().
+
+    Methods touch the filesystem synchronously: async code calls them
+    through the disk executor (app.core.executors.run_disk).
+    """
+
+    def __init__(self, root: Path, projects_root: Path):
+        """Initialize media cache.
+
+        Args:
+            root: Cache directory
+            projects_root: Directory of the per-project directories
+        """
+        self.root = root
+        self.projects_root = projects_root
+        self.metrics: Counter = Counter()
+        # One lock per project manifest: concurrent link_project() calls would lose entries
+        self.manifest_locks: dict[Path, threading.Lock] = {}
+        self.manifest_locks_guard = threading.Lock()
+
+    def entry_dir(self, platform: str, video_id: str) -> Path:
+        """Get (and create) the cache directory of a video.
+
+        Args:
+            platform: Platform name (youtube, facebook)
+            video_id: Canonical video ID
+
+        Returns:
+            Directory holding the video's files
+        """
+        path = self.root / platform / video_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def audio_path(
+        self,
+        platform: str,
+        video_id: str,
+        project_title: Optional[str] = None,
+        clip_minutes: Optional[int] = None
+    ) -> Path:
+        """Get the cached audio path of a video.
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+            project_title: Project whose legacy audio file is adopted if the cache has none
+            clip_minutes: Length of the clip in minutes (None = whole video)
+
+        Returns:
+            Path to the audio file (may not exist yet)
+        """
+        return self._path(platform, video_id, AUDIO_NAME, project_title, clip_minutes)
+
+    def transcript_path(
+        self,
+        platform: str,
+        video_id: str,
+        project_title: Optional[str] = None,
+        clip_minutes: Optional[int] = None
+    ) -> Path:
+        """Get the cached transcript path of a video.
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+            project_title: Project whose legacy transcript is adopted if the cache has none
+            clip_minutes: Length of the clip in minutes (None = whole video)
+
+        Returns:
+            Path to the transcript file (may not exist yet)
+        """
+        return self._path(platform, video_id, TRANSCRIPT_NAME, project_title, clip_minutes)
+
+    def partial_path(self, path: Path) -> Path:
+        """Get a unique temporary path to write a cache file to before commit().
+
+        Args:
+            path: Final cache file path
+
+        Returns:
+            Temporary path in the same directory (same filesystem: atomic rename)
+        """
+        return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}{PARTIAL_SUFFIX}")
+
+    def commit(self, partial: Path, path: Path, source_url: Optional[str], started_at: datetime) -> None:
+        """Move a completely written temporary file into place, with its sidecar.
+
+        Args:
+            partial: Temporary file (see partial_path)
+            path: Final cache file path
+            source_url: URL the content was fetched from
+            started_at: Time the fetch started
+        """
+        size, digest = self._checksum(partial, sync=True)
+        if size == 0:
+            partial.unlink(missing_ok=True)
+            raise ValueError(f"Refusing to cache empty file {path}")
+        # Sidecar first: a cache file without sidecar is never a half-committed one
+        self._write_sidecar(path, {
+            "size": size,
+            "sha256": digest,
+            "source_url": source_url,
+            "started_at": started_at.isoformat(),
+            "created_at": now_utc().isoformat(),
+        })
+        os.replace(partial, path)
+        self.metrics["committed"] += 1
+
+    def verify(self, path: Path) -> bool:
+        """Check that a cache file is complete and intact.
+
+        A file that does not match its sidecar is deleted.
+
+        Args:
+            path: Cache file path
+
+        Returns:
+            True if the file can be used
+        """
+        if not path.exists():
+            return False
+        size, digest = self._checksum(path)
+        return self._check(path, size, digest)
+
+    def read_text(self, path: Path) -> Optional[str]:
+        """Read a cached text file (transcript), checked against its sidecar.
+
+        Args:
+            path: Cache file path
+
+        Returns:
+            Content, or None if the file is missing or corrupt
+        """
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if not self._check(path, len(data), hashlib.sha256(data).hexdigest()):
+            return None
+        return data.decode("utf-8")
+
+    def write_text(self, path: Path, text: str, source_url: Optional[str], started_at: datetime) -> None:
+        """Write a cached text file (transcript) atomically, with its sidecar.
+
+        Args:
+            path: Cache file path
+            text: Content
+            source_url: URL of the video the text comes from
+            started_at: Time the fetch started
+        """
+        partial = self.partial_path(path)
+        try:
+            partial.write_text(text, encoding="utf-8")
+            self.commit(partial, path, source_url, started_at)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+    def sweep_partials(self) -> int:
+        """Delete the temporary files left over by writes that never finished.
+
+        Interrupted writes clean up after themselves, but not when the process
+        dies mid-write. Files still being written are recent: only those not
+        modified for STALE_PARTIAL_SECONDS are deleted.
+
+        Returns:
+            Number of files deleted
+        """
+        cutoff = time.time() - STALE_PARTIAL_SECONDS
+        pattern = f".*{PARTIAL_SUFFIX}"
+        partials = [*self.root.glob(f"*/*/{pattern}"), *self.projects_root.glob(f"*/{PROJECT_SUBDIR}/{pattern}")]
+        swept = 0
+        for partial in partials:
+            try:
+                if partial.stat().st_mtime < cutoff:
+                    partial.unlink()
+                    swept += 1
+            except FileNotFoundError:
+                pass  # Committed or cleaned up meanwhile
+        if swept:
+            self.metrics["partials_swept"] += swept
+            logger.info(f"Media cache: deleted {swept} stale temporary file(s)")
+        return swept
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache integrity statistics.
+
+        Returns:
+            Counters of committed files, corrupt files dropped, sidecars
+            backfilled and stale temporary files swept
+        """
+        return dict(self.metrics)
+
+    def link_project(
+        self,
+        project_title: str,
+        platform: str,
+        video_id: str,
+        url: Optional[str],
+        clip_minutes: Optional[int] = None
+    ) -> None:
+        """Record in a project's manifest that it uses a cached video.
+
+        Args:
+            project_title: Project title
+            platform: Platform name
+            video_id: Canonical video ID
+            url: Video URL as given by the project (None if unknown)
+            clip_minutes: Length of the clip the project used (None = whole video)
+        """
+        manifest_path = self._project_dir(project_title) / MANIFEST_NAME
+        entry = self.root / platform / video_id
+        audio = entry / clip_file_name(AUDIO_NAME, clip_minutes)
+        transcript = entry / clip_file_name(TRANSCRIPT_NAME, clip_minutes)
+        with self._manifest_lock(manifest_path):
+            manifest = self._read_manifest(manifest_path)
+            # Whole video and clips have their own files: one entry per variant
+            key = media_key(platform, video_id, clip_minutes)
+            previous = manifest["videos"].get(key, {})
+            manifest["videos"][key] = {
+                "platform": platform,
+                "video_id": video_id,
+                "url": url or previous.get("url"),
+                "clip_minutes": clip_minutes,
+                "audio": str(audio) if audio.exists() else None,
+                "transcript": str(transcript) if transcript.exists() else None,
+                "linked_at": now_utc().isoformat(),
+            }
+            partial = self.partial_path(manifest_path)
+            try:
+                partial.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+                os.replace(partial, manifest_path)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+
+    def migrate_legacy_files(self) -> dict[str, int]:
+        """Move every file of the legacy per-project layout into the cache.
+
+        Files of a video the cache already has are deleted (duplicates), and
+        each project gets manifest entries for its videos. Safe to run again.
+
+        Returns:
+            Counts of moved files, deleted duplicates and linked entries
+        """
+        counts: Counter = Counter()
+        for legacy in sorted(self.projects_root.glob(f"*/{PROJECT_SUBDIR}/*")):
+            name = LEGACY_FILES.get(legacy.suffix)
+            if name is None or not legacy.is_file():
+                continue
+            video_id = legacy.stem
+            platform = guess_platform(video_id)
+            target = self.entry_dir(platform, video_id) / name
+            counts["moved" if self._adopt(legacy, target) else "duplicates"] += 1
+            # The project directory name is already a slug: slugify() keeps it as is
+            self.link_project(legacy.parent.parent.name, platform, video_id, None)
+            counts["linked"] += 1
+        logger.info(f"Media cache migration: {dict(counts)}")
+        return dict(counts)
+
+    def _path(
+        self,
+        platform: str,
+        video_id: str,
+        name: str,
+        project_title: Optional[str],
+        clip_minutes: Optional[int]
+    ) -> Path:
+        """Get a cache file path, adopting the project's legacy file if the cache has none."""
+        if clip_minutes:
+            # Legacy files are whole videos: nothing to adopt for a clip
+            return self.entry_dir(platform, video_id) / clip_file_name(name, clip_minutes)
+        path = self.entry_dir(platform, video_id) / name
+        if project_title and not path.exists():
+            extension = next(ext for ext, cached in LEGACY_FILES.items() if cached == name)
+            self._adopt(self._project_dir(project_title) / f"{video_id}{extension}", path)
+        return path
+
+    def _check(self, path: Path, size: int, digest: str) -> bool:
+        """Compare a cache file's size and checksum with its sidecar, dropping it on mismatch."""
+        sidecar = self._read_sidecar(path)
+        if sidecar is None:
+            # Cached before sidecars existed: may have been truncated by a crash
+            reason = self._check_legacy(path, size)
+            if reason:
+                self._drop(path, reason)
+                return False
+            self._write_sidecar(path, {
+                "size": size,
+                "sha256": digest,
+                "source_url": None,
+                "started_at": None,
+                "created_at": now_utc().isoformat(),
+            })
+            self.metrics["backfilled"] += 1
+            return True
+        if sidecar.get("size") != size or sidecar.get("sha256") != digest:
+            self._drop(path, f"{size} bytes, sidecar expects {sidecar.get('size')}")
+            return False
+        return True
+
+    def _check_legacy(self, path: Path, size: int) -> Optional[str]:
+        """Check a cache file that has no sidecar.
+
+        Returns:
+            Why the file cannot be trusted, or None if it looks complete
+        """
+        if size == 0:
+            return "empty file without sidecar"
+        if path.suffix != ".txt":
+            # Nothing tells a complete audio file from a truncated one
+            return "audio file without sidecar"
+        try:
+            text = path.read_bytes().decode("utf-8").rstrip()
+        except UnicodeDecodeError:
+            return "transcript without sidecar is not valid UTF-8"
+        if not text.endswith(TRANSCRIPT_ENDINGS):
+            return "transcript without sidecar does not end a sentence"
+        return None
+
+    def _drop(self, path: Path, reason: str) -> None:
+        """Delete a corrupt cache file and its sidecar, so it is fetched again."""
+        logger.warning(f"Corrupt media cache file {path} ({reason}), dropping it")
+        self.metrics["corrupt"] += 1
+        path.unlink(missing_ok=True)
+        self._sidecar_path(path).unlink(missing_ok=True)
+
+    def _checksum(self, path: Path, sync: bool = False) -> tuple[int, str]:
+        """Size and SHA-256 of a file (flushed to disk first if sync)."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            if sync:
+                os.fsync(f.fileno())
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest()
+
+    def _sidecar_path(self, path: Path) -> Path:
+        """Get the sidecar path of a cache file."""
+        return path.with_name(f"{path.name}{SIDECAR_SUFFIX}")
+
+    def _read_sidecar(self, path: Path) -> Optional[dict[str, Any]]:
+        """Read the sidecar of a cache file (None if missing, empty if unreadable)."""
+        try:
+            return json.loads(self._sidecar_path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            # Matches no file: the entry is dropped and fetched again
+            logger.warning(f"Unreadable sidecar of {path}: {e}")
+            return {}
+
+    def _write_sidecar(self, path: Path, sidecar: dict[str, Any]) -> None:
+        """Write the sidecar of a cache file atomically."""
+        sidecar_path = self._sidecar_path(path)
+        partial = self.partial_path(sidecar_path)
+        partial.write_text(json.dumps(sidecar, indent=2), encoding="utf-8")
+        os.replace(partial, sidecar_path)
+
+    def _adopt(self, legacy: Path, target: Path) -> bool:
+        """Move a legacy project file into the cache (dropping it if the cache already has one).
+
+        Returns:
+            True if the file was moved
+        """
+        if not legacy.exists():
+            return False
+        if target.exists():
+            legacy.unlink()
+            return False
+        shutil.move(legacy, target)
+        logger.info(f"Moved {legacy} to the media cache ({target})")
+        return True
+
+    def _project_dir(self, project_title: str) -> Path:
+        """Get (and create) the inspiration directory of a project."""
+        path = self.projects_root / slugify(project_title) / PROJECT_SUBDIR
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _manifest_lock(self, path: Path) -> threading.Lock:
+        """Get the lock serializing updates of a project manifest."""
+        with self.manifest_locks_guard:
+            return self.manifest_locks.setdefault(path, threading.Lock())
+
+    def _read_manifest(self, path: Path) -> dict[str, Any]:
+        """Read a project manifest (a missing or unreadable one starts empty)."""
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable project manifest {path}, recreating it: {e}")
+        return {"videos": {}}
+
+
+# Global singleton
+_media_cache: Optional[MediaCache] = None
+
+
+def get_media_cache() -> MediaCache:
+    """Get or create media cache singleton.
+
+    Returns:
+        MediaCache instance
+    """
+    global _media_cache
+    if _media_cache is None:
+        _media_cache = MediaCache(settings.media_cache_dir, settings.videos_storage_dir)
+    return _media_cache
@@ -1,9 +1,12 @@
 import logging
+import time
 from typing import Optional, List
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.singleflight import SingleFlight
 from app.models.prompt import Prompt
 
 logger = logging.getLogger(__name__)
@@ -14,8 +17,44 @@ class PromptService:
     """
     def __init__(self, database: AsyncIOMotorDatabase):
         self.collection = database["prompts"]
+        # (prompt_name, language) -> (expiry timestamp, content)
+        self._cache: dict[tuple[str, str], tuple[float, str]] = {}
+        # Lookups currently running, shared by concurrent callers
+        self.singleflight: SingleFlight[Optional[str]] = SingleFlight("prompts")
 
     async def get_prompt_content(self, prompt_name: str, language: str) -> Optional[str]:
+        """
+        Retrieves the content of a prompt by its name and language.
+
+        Found prompts are kept in memory for settings.prompt_cache_ttl_seconds
+        (missing ones are looked up again on every call), and concurrent
+        lookups of the same prompt share a single MongoDB query. clear_cache()
+        only clears this replica: other replicas see an updated prompt once
+        their cached copy expires.
+
+        Args:
+            prompt_name: The base name of the prompt (e.g., "description_prompt").
+            language: The target language of the prompt (e.g., "en", "fr").
+
+        Returns:
+            The prompt content as a string, or None if not found.
+        """
+        key = (prompt_name, language)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        content = await self.singleflight.do(key, lambda: self._fetch_prompt_content(prompt_name, language))
+        # A missing prompt is not cached: it is used as soon as someone creates it
+        if content is not None and settings.prompt_cache_ttl_seconds > 0:
+            self._cache[key] = (time.monotonic() + settings.prompt_cache_ttl_seconds, content)
+        return content
+
+    def clear_cache(self) -> None:
+        """Drop cached prompt contents (e.g. after a prompt migration)."""
+        self._cache.clear()
+
+    async def _fetch_prompt_content(self, prompt_name: str, language: str) -> Optional[str]:
         """
         Retrieves the content of a prompt from MongoDB by its name and language.
 
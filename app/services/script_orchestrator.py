@@ -1,14 +1,20 @@
 """Orchestrator for coordinating all script generation agents."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
 
-from app.models.script import ScriptGenerationRequest, ScriptGenerationResponse
+from app.core.config import settings
+from app.core.pipeline import Stage, StageEvent, StageListener, StagePipeline
+from app.core.request_context import bypass_llm_cache, collect_usage, use_agent_overrides
+from app.core.usage import UsageCollector
+from app.models.script import ScriptGenerationRequest, ScriptGenerationResponse, ScriptUsage
 from app.agents.title_agent import TitleAgent
 from app.agents.sections_agent import SectionsAgent
 from app.agents.description_agent import DescriptionAgent
 from app.agents.keywords_agent import KeywordsAgent
-from app.services.transcription_service import get_transcription_service
+from app.services.condensation_service import get_condensation_service
+from app.services.transcription_service import VideoTranscript, get_transcription_service
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,9 @@ logger = logging.getLogger(__name__)
 class ScriptOrchestrator:
     """Orchestrates the script generation pipeline."""
 
+    # Stage outputs forwarded to streaming clients as soon as they are ready
+    STREAMED_OUTPUTS = ("title", "keywords", "description")
+
     def __init__(self):
         """Initialize orchestrator with all agents."""
         self.title_agent = TitleAgent()
@@ -27,7 +36,8 @@ class ScriptOrchestrator:
 
     async def generate_script(
         self,
-        request: ScriptGenerationRequest
+        request: ScriptGenerationRequest,
+        transcriber: Optional[Any] = None
     ) -> ScriptGenerationResponse:
         """Generate complete script with all metadata.
 
@@ -35,6 +45,97 @@ class ScriptOrchestrator:
 
         Args:
             request: Script generation request
+            transcriber: Object providing transcribe_video_list(urls, project_title, clip_minutes),
+                e.g. to share transcriptions across a batch (defaults to the
+                transcription service)
+
+        Returns:
+            Complete script generation response
+        """
+        return await self._run_pipeline(request, transcriber=transcriber)
+
+    async def generate_script_stream(
+        self,
+        request: ScriptGenerationRequest
+    ) -> AsyncGenerator[tuple[str, dict[str, Any]], None]:
+        """Generate a script, yielding progress events as the pipeline runs.
+
+        Events are (name, payload) tuples: "stage_started", "stage_completed",
+        "stage_failed", "token" (script deltas), "section" (each script section
+        as soon as it is complete), one event per finished output
+        ("script", "title", "keywords", "description"), then "result" with the
+        full response or "error". Closing the iterator cancels the pipeline.
+
+        Args:
+            request: Script generation request
+
+        Yields:
+            Pipeline events
+        """
+        queue: asyncio.Queue[Optional[tuple[str, dict[str, Any]]]] = asyncio.Queue()
+
+        def on_stage_event(event: StageEvent) -> None:
+            if event.status == "started":
+                queue.put_nowait(("stage_started", {"stage": event.stage}))
+                return
+            payload: dict[str, Any] = {"stage": event.stage, "duration": round(event.duration or 0.0, 3)}
+            if event.status != "completed":
+                queue.put_nowait((f"stage_{event.status}", payload))
+                return
+            queue.put_nowait(("stage_completed", payload))
+            if event.stage == "script":
+                script_sections, script_text = event.result
+                queue.put_nowait(("script", {"script_sections": script_sections, "script_text": script_text}))
+            elif event.stage in self.STREAMED_OUTPUTS:
+                queue.put_nowait((event.stage, {event.stage: event.result}))
+
+        async def on_section_delta(delta: str) -> None:
+            queue.put_nowait(("token", {"stage": "script", "delta": delta}))
+
+        async def on_section(index: int, text: str) -> None:
+            queue.put_nowait(("section", {"index": index, "text": text}))
+
+        async def run() -> None:
+            try:
+                response = await self._run_pipeline(request, on_stage_event, on_section_delta, on_section)
+                queue.put_nowait(("result", response.model_dump()))
+            except Exception as e:
+                logger.error(f"Streaming script generation failed: {e}", exc_info=True)
+                queue.put_nowait(("error", {
+                    "stage": getattr(e, "stage", None),
+                    "message": f"Script generation failed: {e}",
+                }))
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+        finally:
+            # Client went away (or the consumer stopped early): stop the pipeline
+            if not task.done():
+                logger.info("Stream consumer closed, cancelling script generation pipeline")
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run_pipeline(
+        self,
+        request: ScriptGenerationRequest,
+        listener: Optional[StageListener] = None,
+        on_section_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_section: Optional[Callable[[int, str], Awaitable[None]]] = None,
+        transcriber: Optional[Any] = None
+    ) -> ScriptGenerationResponse:
+        """Run the stage graph for a request and build the response.
+
+        Args:
+            request: Script generation request
+            listener: Optional pipeline stage listener
+            on_section_delta: Optional callback receiving script text deltas
+            on_section: Optional callback receiving each completed script section
+            transcriber: Object providing transcribe_video_list(urls, project_title, clip_minutes)
+                (defaults to the transcription service)
 
         Returns:
             Complete script generation response
@@ -43,26 +144,115 @@ class ScriptOrchestrator:
         logger.info(f"Request: regenerer_script={request.regenerer_script}, "
                    f"use_case={request.use_case}, language={request.language}")
 
-        # Step 1: Transcribe inspiration videos (if provided)
-        inspiration_content = ""
-        if request.video_inspirations:
-            logger.info(f"Transcribing {len(request.video_inspirations)} inspiration video(s)")
-            inspiration_content = await self.transcription_service.transcribe_videos(
-                request.video_inspirations,
-                request.title  # Pass title for cache directory
+        if not request.regenerer_script and not request.script_text:
+            raise ValueError("script_text must be provided when regenerer_script=False")
+
+        stages = self._build_stages(
+            request, on_section_delta, on_section, transcriber or self.transcription_service
+        )
+        pipeline = StagePipeline(stages, listener=listener)
+        # Stage tasks inherit the request options from this context
+        usage = UsageCollector(request.language, request.use_case)
+        with (
+            bypass_llm_cache(request.bypass_cache),
+            use_agent_overrides(request.agent_overrides),
+            collect_usage(usage),
+        ):
+            result = await pipeline.run()
+        outputs = result.results
+
+        timings = result.durations()
+        logger.info(f"Pipeline stage timings (s): {timings}, total={result.total_duration:.3f}s")
+        usage_summary = usage.summary()
+        logger.info(f"Pipeline LLM usage: {usage_summary['total']}")
+
+        script_sections, script_text = outputs["script"]
+
+        # Build response
+        response = ScriptGenerationResponse(
+            script_sections=script_sections,
+            script_text=script_text,
+            status="script_generated",
+            keywords=outputs["keywords"],
+            video_description=outputs["description"],
+            title=outputs["title"],
+            stage_timings=timings,
+            usage=ScriptUsage(**usage_summary) if request.include_usage else None
+        )
+
+        logger.info("Script generation pipeline completed successfully")
+        return response
+
+    def _build_stages(
+        self,
+        request: ScriptGenerationRequest,
+        on_section_delta: Optional[Callable[[str], Awaitable[None]]],
+        on_section: Optional[Callable[[int, str], Awaitable[None]]],
+        transcriber: Any
+    ) -> list[Stage]:
+        """Build the stage graph for a request.
+
+        Title only depends on the request, so it runs alongside transcription
+        and sections. With the condense inspiration strategy, a condensation
+        stage turns transcripts into briefs before sections are generated;
+        with retrieve, a retrieval stage keeps the most relevant chunks.
+        Keywords need the script, description needs keywords.
+
+        Args:
+            request: Script generation request
+            on_section_delta: Optional callback receiving script text deltas
+            on_section: Optional callback receiving each completed script section
+            transcriber: Object providing transcribe_video_list(urls, project_title, clip_minutes)
+
+        Returns:
+            List of pipeline stages
+        """
+
+        async def transcription_stage(results: dict[str, Any]) -> list[VideoTranscript]:
+            logger.info(f"Transcribing {len(request.video_inspirations or [])} inspiration video(s)")
+            transcripts = await transcriber.transcribe_video_list(
+                request.video_inspirations or [],
+                request.title,  # Pass title for cache directory
+                request.max_inspiration_minutes or settings.inspiration_max_minutes or None
             )
-            if inspiration_content:
-                logger.info(f"Transcription completed: {len(inspiration_content)} chars")
+            if transcripts:
+                logger.info(
+                    f"Transcription completed: {len(transcripts)} video(s), "
+                    f"{sum(len(transcript.text) for transcript in transcripts)} chars"
+                )
             else:
                 logger.warning("No transcription content obtained from videos")
+            return transcripts
+
+        async def condensation_stage(results: dict[str, Any]) -> list[str]:
+            transcripts = results["transcription"]
+            if not transcripts:
+                return []
+            logger.info(f"Condensing {len(transcripts)} inspiration transcript(s)")
+            condenser = await get_condensation_service()
+            return await condenser.condense_all(transcripts)
 
-        # Step 2: Generate or use existing script
-        script_text: str
-        script_sections: Optional[list[str]] = None
+        async def retrieval_stage(results: dict[str, Any]) -> list[str]:
+            transcripts = results["transcription"]
+            if not transcripts:
+                return []
+            query = " ".join(filter(None, (request.description, request.use_case)))
+            return self.transcription_service.retrieve_passages(
+                transcripts, query, settings.retrieval_top_k
+            )
+
+        async def script_stage(results: dict[str, Any]) -> tuple[Optional[list[str]], str]:
+            if not request.regenerer_script:
+                logger.info("Using provided script text (skipping script generation)")
+                return None, request.script_text or ""
 
-        if request.regenerer_script:
-            # Generate new script
             logger.info("Generating new script sections")
+            if "condensation" in results:
+                inspirations = results["condensation"]
+            elif "retrieval" in results:
+                inspirations = results["retrieval"]
+            else:
+                inspirations = [transcript.text for transcript in results.get("transcription") or []]
             sections, script_text = await self.sections_agent.generate_section(
                 description=request.description,
                 use_case=request.use_case,
@@ -70,57 +260,63 @@ class ScriptOrchestrator:
                 language=request.language,
                 duration=request.duration,
                 nb_section=request.nb_section,
-                inspiration_content=inspiration_content
+                inspirations=inspirations,
+                on_delta=on_section_delta,
+                on_section=on_section
             )
-            
             # Only include sections list if more than 1 section
             if request.nb_section and request.nb_section > 1:
-                script_sections = sections
-        else:
-            # Use provided script
-            if not request.script_text:
-                raise ValueError("script_text must be provided when regenerer_script=False")
-            logger.info("Using provided script text (skipping script generation)")
-            script_text = request.script_text
-
-        # Step 3: Generate title (always)
-        logger.info("Generating video title")
-        title = await self.title_agent.generate_title(
-            description=request.description,
-            use_case=request.use_case,
-            style=request.style,
-            language=request.language
-        )
+                return sections, script_text
+            return None, script_text
 
-        # Step 4: Generate keywords (always)
-        logger.info("Generating SEO keywords")
-        keywords = await self.keywords_agent.generate_keywords(
-            script_text=script_text,
-            description=request.description,
-            use_case=request.use_case,
-            language=request.language
-        )
+        async def title_stage(results: dict[str, Any]) -> str:
+            logger.info("Generating video title")
+            return await self.title_agent.generate_title(
+                description=request.description,
+                use_case=request.use_case,
+                style=request.style,
+                language=request.language
+            )
 
-        # Step 5: Generate video description (always)
-        logger.info("Generating video description")
-        video_description = await self.description_agent.generate_description(
-            script_text=script_text,
-            keywords=keywords,
-            language=request.language
-        )
+        async def keywords_stage(results: dict[str, Any]) -> str:
+            logger.info("Generating SEO keywords")
+            _, script_text = results["script"]
+            return await self.keywords_agent.generate_keywords(
+                script_text=script_text,
+                description=request.description,
+                use_case=request.use_case,
+                language=request.language
+            )
 
-        # Build response
-        response = ScriptGenerationResponse(
-            script_sections=script_sections,
-            script_text=script_text,
-            status="script_generated",
-            keywords=keywords,
-            video_description=video_description,
-            title=title
-        )
+        async def description_stage(results: dict[str, Any]) -> str:
+            logger.info("Generating video description")
+            _, script_text = results["script"]
+            return await self.description_agent.generate_description(
+                script_text=script_text,
+                keywords=results["keywords"],
+                language=request.language
+            )
 
-        logger.info("Script generation pipeline completed successfully")
-        return response
+        stages = [
+            Stage("title", title_stage),
+            Stage("keywords", keywords_stage, depends_on=("script",)),
+            Stage("description", description_stage, depends_on=("script", "keywords")),
+        ]
+        # Inspiration transcripts only feed section generation
+        if request.regenerer_script and request.video_inspirations:
+            stages.append(Stage("transcription", transcription_stage))
+            strategy = request.inspiration_strategy or settings.inspiration_strategy
+            if strategy == "condense":
+                stages.append(Stage("condensation", condensation_stage, depends_on=("transcription",)))
+                stages.append(Stage("script", script_stage, depends_on=("condensation",)))
+            elif strategy == "retrieve":
+                stages.append(Stage("retrieval", retrieval_stage, depends_on=("transcription",)))
+                stages.append(Stage("script", script_stage, depends_on=("retrieval",)))
+            else:
+                stages.append(Stage("script", script_stage, depends_on=("transcription",)))
+        else:
+            stages.append(Stage("script", script_stage))
+        return stages
 
 
 # Global singleton
@@ -2,18 +2,88 @@
 
 import logging
 import asyncio
+import hashlib
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
-from slugify import slugify
-
-import assemblyai as aai
 
+from app.core.bm25 import BM25Index, term_counts
 from app.core.config import settings
-from app.core.utils import extract_youtube_id, extract_facebook_video_id
+from app.core.executors import run_disk
+from app.core.lease import get_media_leases
+from app.core.singleflight import SingleFlight
+from app.core.tokens import split_into_chunks
+from app.core.utils import parse_video_url
+from app.helpers.datetime_utils import now_utc
+from app.services.assemblyai_client import get_assemblyai_client
+from app.services.media_cache import get_media_cache, media_key
 from app.services.video_download_service import get_video_download_service
 
 logger = logging.getLogger(__name__)
 
+# Separator between transcripts of multiple inspiration videos
+TRANSCRIPT_SEPARATOR = "\n\n---\n\n"
+
+# Separator between non-contiguous passages retrieved from one transcript
+PASSAGE_SEPARATOR = "\n[...]\n"
+
+
+@dataclass
+class VideoTranscript:
+    """Transcript of one inspiration video."""
+
+    platform: str
+    video_id: str
+    url: str
+    text: str
+
+    @classmethod
+    def from_url(cls, url: str, text: str) -> "VideoTranscript":
+        """Build the transcript record of a (recognized) video URL.
+
+        Args:
+            url: Video URL
+            text: Transcript text
+
+        Returns:
+            VideoTranscript
+
+        Raises:
+            ValueError: If the URL is not a recognized video URL
+        """
+        parsed = parse_video_url(url)
+        if parsed is None:
+            raise ValueError(f"Unrecognized video URL: {url}")
+        platform, video_id = parsed
+        return cls(platform=platform, video_id=video_id, url=url, text=text)
+
+    @property
+    def key(self) -> str:
+        """Platform-qualified video ID, e.g. "youtube/dQw4w9WgXcQ"."""
+        return f"{self.platform}/{self.video_id}"
+
+
+def transcript_hash(text: str) -> str:
+    """Fingerprint a transcript, to tell apart derived data built from different texts.
+
+    Args:
+        text: Transcript text
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TranscriptChunks:
+    """A transcript segmented for retrieval, with the term frequencies of each chunk."""
+
+    chunks: list[str]
+    terms: list[Counter]
+
 
 class TranscriptionService:
     """Service for transcribing audio files using AssemblyAI."""
@@ -24,45 +94,59 @@ class TranscriptionService:
             logger.warning("ASSEMBLYAI_API_KEY not set. Transcription will not work.")
             self.client = None
         else:
-            aai.settings.api_key = settings.assemblyai_api_key
-            self.client = aai.Transcriber()
+            self.client = get_assemblyai_client()
             logger.info("TranscriptionService initialized with AssemblyAI")
+        # Downloads in flight across all requests (bandwidth, download threads)
+        self.download_semaphore = asyncio.Semaphore(settings.transcription_max_concurrency)
+        # AssemblyAI transcripts awaited across all requests (cheap: no thread, no bandwidth)
+        self.pending_semaphore = asyncio.Semaphore(settings.transcription_max_pending)
+        # Transcriptions in flight per platform/video ID
+        self.singleflight: SingleFlight[Optional[str]] = SingleFlight("transcriptions")
+        # Segmented transcripts by transcript hash (LRU), reused by every request citing the video
+        self.chunk_cache: OrderedDict[str, TranscriptChunks] = OrderedDict()
 
     def _get_transcription_path(
         self,
         project_title: str,
-        video_id: str
+        video_id: str,
+        platform: str = "youtube",
+        clip_minutes: Optional[int] = None
     ) -> Path:
         """Get transcription file path.
 
+        Transcripts live in the global media cache, shared by all projects.
+
         Args:
-            project_title: Project title for directory naming
+            project_title: Project title (its legacy transcript file is
+                moved to the cache if the cache has none)
             video_id: Video ID
+            platform: Platform name (youtube, facebook)
+            clip_minutes: Length of the clip in minutes (None = whole video)
 
         Returns:
             Path to transcription text file
         """
-        # Slugify title for safe directory name
-        slug_title = slugify(project_title)
-        
-        # Create path: resources/videos/{slug_title}/video-inspiration/{video_id}.txt
-        trans_dir = settings.videos_storage_dir / slug_title / "video-inspiration"
-        trans_dir.mkdir(parents=True, exist_ok=True)
-        
-        return trans_dir / f"{video_id}.txt"
+        # Create path: resources/media-cache/{platform}/{video_id}/transcript.txt (transcript-{N}min.txt for clips)
+        return get_media_cache().transcript_path(platform, video_id, project_title, clip_minutes)
 
     async def transcribe_audio_file(
         self,
         audio_path: Path,
         project_title: str,
-        video_id: str
+        video_id: str,
+        platform: str = "youtube",
+        clip_minutes: Optional[int] = None,
+        url: Optional[str] = None
     ) -> Optional[str]:
         """Transcribe an audio file.
 
         Args:
             audio_path: Path to audio file
-            project_title: Project title for cache directory
+            project_title: Project title
             video_id: Video ID for cache filename
+            platform: Platform name for cache directory
+            clip_minutes: Length of the clip the audio holds (None = whole video)
+            url: URL of the video, recorded in the transcript's cache sidecar
 
         Returns:
             Transcribed text or None if failed
@@ -72,30 +156,26 @@ class TranscriptionService:
             return None
 
         # Check if transcription already exists
-        trans_path = self._get_transcription_path(project_title, video_id)
-        if trans_path.exists():
+        media_cache = get_media_cache()
+        trans_path = await run_disk(self._get_transcription_path, project_title, video_id, platform, clip_minutes)
+        cached = await run_disk(media_cache.read_text, trans_path)
+        if cached is not None:
             logger.info(f"✅ Transcription already exists (cached): {trans_path}")
-            with open(trans_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return cached
 
         logger.info(f"🎤 Transcribing audio: {audio_path.name}")
+        started_at = now_utc()
 
         try:
-            # Transcribe with AssemblyAI
-            transcript = await asyncio.to_thread(
-                self.client.transcribe,
-                str(audio_path)
-            )
-            
-            if transcript.status == aai.TranscriptStatus.error:
-                logger.error(f"Transcription failed: {transcript.error}")
+            # Transcribe with AssemblyAI (polls the job without holding a thread)
+            async with self.pending_semaphore:
+                transcription_text = await self.client.transcribe(audio_path)
+            if not transcription_text:
+                logger.warning(f"Empty transcription for {audio_path.name}, not cached")
                 return None
 
-            transcription_text = transcript.text
-            
-            # Save to cache
-            with open(trans_path, 'w', encoding='utf-8') as f:
-                f.write(transcription_text)
+            # Save to cache (atomic write, checked on read)
+            await run_disk(media_cache.write_text, trans_path, transcription_text, url, started_at)
             
             logger.info(f"✅ Transcription completed and cached: {len(transcription_text)} chars")
             return transcription_text
@@ -107,43 +187,228 @@ class TranscriptionService:
     async def transcribe_video_url(
         self,
         url: str,
-        project_title: str
+        project_title: str,
+        clip_minutes: Optional[int] = None
     ) -> Optional[str]:
         """Transcribe a video from URL.
 
         Args:
             url: Video URL (YouTube/Facebook)
             project_title: Project title
+            clip_minutes: Only download and transcribe the first minutes of the video (None = whole video)
 
         Returns:
             Transcribed text or None if failed
         """
-        # Extract video ID
-        video_id = extract_youtube_id(url)
-        if not video_id:
-            video_id = extract_facebook_video_id(url)
-        
-        if not video_id:
+        # Extract platform and canonical video ID
+        video_ref = parse_video_url(url)
+        if not video_ref:
             logger.error(f"Failed to extract video ID from: {url}")
             return None
+        platform, video_id = video_ref
+        media_cache = get_media_cache()
 
-        # Check if transcription already cached
-        trans_path = self._get_transcription_path(project_title, video_id)
-        if trans_path.exists():
+        # Check if transcription already cached (by any project)
+        trans_path = await run_disk(self._get_transcription_path, project_title, video_id, platform, clip_minutes)
+        text = await run_disk(media_cache.read_text, trans_path)
+        if text is not None:
             logger.info(f"✅ Transcription already exists (cached): {trans_path}")
-            with open(trans_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            await run_disk(media_cache.link_project, project_title, platform, video_id, url, clip_minutes)
+            return text
+
+        # Concurrent requests for the same video share one download + transcription
+        text = await self.singleflight.do(
+            media_key(platform, video_id, clip_minutes),
+            lambda: self._fetch_transcript(url, project_title, platform, video_id, clip_minutes)
+        )
+        if text:
+            await run_disk(media_cache.link_project, project_title, platform, video_id, url, clip_minutes)
+        return text
+
+    async def _fetch_transcript(
+        self,
+        url: str,
+        project_title: str,
+        platform: str,
+        video_id: str,
+        clip_minutes: Optional[int] = None
+    ) -> Optional[str]:
+        """Download and transcribe a video, once for all replicas if MEDIA_LEASE_ENABLED.
+
+        Args:
+            url: Video URL
+            project_title: Project title
+            platform: Platform name
+            video_id: Canonical video ID
+            clip_minutes: Length of the clip in minutes (None = whole video)
+
+        Returns:
+            Transcribed text or None if failed
+        """
+        if not settings.media_lease_enabled:
+            return await self._download_and_transcribe(url, project_title, platform, video_id, clip_minutes)
+
+        leases = await get_media_leases()
+        text = await leases.run_exclusive(
+            media_key(platform, video_id, clip_minutes),
+            lambda: self._download_and_transcribe(url, project_title, platform, video_id, clip_minutes)
+        )
+        # Transcribed by another replica: keep a local copy
+        media_cache = get_media_cache()
+        trans_path = await run_disk(self._get_transcription_path, project_title, video_id, platform, clip_minutes)
+        if text and not await run_disk(media_cache.verify, trans_path):
+            await run_disk(media_cache.write_text, trans_path, text, url, now_utc())
+        return text
+
+    async def _download_and_transcribe(
+        self,
+        url: str,
+        project_title: str,
+        platform: str,
+        video_id: str,
+        clip_minutes: Optional[int] = None
+    ) -> Optional[str]:
+        """Download the audio of a video and transcribe it.
+
+        Args:
+            url: Video URL
+            project_title: Project title
+            platform: Platform name
+            video_id: Canonical video ID
+            clip_minutes: Length of the clip in minutes (None = whole video)
+
+        Returns:
+            Transcribed text or None if failed
+        """
+        # Another caller may have finished the transcription since our cache check
+        trans_path = await run_disk(self._get_transcription_path, project_title, video_id, platform, clip_minutes)
+        text = await run_disk(get_media_cache().read_text, trans_path)
+        if text is not None:
+            return text
+
+        # Download audio first; the download slot is released before the (long) transcription wait
+        async with self.download_semaphore:
+            video_service = get_video_download_service()
+            audio_path = await video_service.download_video_audio(url, project_title, clip_minutes)
 
-        # Download audio first
-        video_service = get_video_download_service()
-        audio_path = await video_service.download_video_audio(url, project_title)
-        
         if not audio_path:
             logger.error(f"Failed to download audio from: {url}")
             return None
 
         # Transcribe the audio
-        return await self.transcribe_audio_file(audio_path, project_title, video_id)
+        return await self.transcribe_audio_file(
+            audio_path, project_title, video_id, platform, clip_minutes, url
+        )
+
+    async def transcribe_video_list(
+        self,
+        video_urls: list[str],
+        project_title: str,
+        clip_minutes: Optional[int] = None
+    ) -> list[VideoTranscript]:
+        """Transcribe multiple videos concurrently.
+
+        At most TRANSCRIPTION_MAX_CONCURRENCY_PER_REQUEST videos of the call
+        are processed at once; overall, TRANSCRIPTION_MAX_CONCURRENCY videos
+        are downloaded and TRANSCRIPTION_MAX_PENDING transcripts awaited at
+        once. A repeated URL is transcribed once. A video that
+        fails is logged and left out without affecting the others.
+
+        Args:
+            video_urls: List of video URLs
+            project_title: Project title
+            clip_minutes: Only use the first minutes of each video (None = whole videos)
+
+        Returns:
+            Transcripts of the videos that could be transcribed, in URL order
+        """
+        semaphore = asyncio.Semaphore(settings.transcription_max_concurrency_per_request)
+
+        async def transcribe(url: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.transcribe_video_url(url, project_title, clip_minutes)
+                except Exception as e:
+                    logger.error(f"❌ Transcription of {url} failed: {e}")
+                    return None
+
+        unique_urls = list(dict.fromkeys(video_urls))
+        texts = dict(zip(unique_urls, await asyncio.gather(*(transcribe(url) for url in unique_urls))))
+
+        return [
+            VideoTranscript.from_url(url, text)
+            for url in video_urls
+            if (text := texts[url])
+        ]
+
+    def segment_transcript(self, text: str) -> TranscriptChunks:
+        """Split a transcript into retrieval chunks and count their terms.
+
+        Args:
+            text: Transcript text
+
+        Returns:
+            Chunks of RETRIEVAL_CHUNK_TOKENS tokens with their term frequencies
+        """
+        key = transcript_hash(text)
+        segmented = self.chunk_cache.get(key)
+        if segmented is not None:
+            self.chunk_cache.move_to_end(key)
+            return segmented
+
+        chunks = split_into_chunks(text, settings.retrieval_chunk_tokens)
+        segmented = TranscriptChunks(chunks=chunks, terms=[term_counts(chunk) for chunk in chunks])
+        if settings.retrieval_cache_max_transcripts > 0:
+            self.chunk_cache[key] = segmented
+            while len(self.chunk_cache) > settings.retrieval_cache_max_transcripts:
+                self.chunk_cache.popitem(last=False)
+        return segmented
+
+    def retrieve_passages(
+        self,
+        transcripts: list[VideoTranscript],
+        query: str,
+        top_k: int
+    ) -> list[str]:
+        """Keep only the transcript chunks most relevant to a query (BM25).
+
+        Chunks of all videos are ranked together; the selected ones are put
+        back in transcript order so each video's passages still read in sequence.
+
+        Args:
+            transcripts: Inspiration transcripts
+            query: Query text (e.g. description and use case)
+            top_k: Number of chunks to keep
+
+        Returns:
+            Retrieved passages of each video having a selected chunk, in
+            video order (the full transcripts if no chunk matches the query)
+        """
+        start = time.perf_counter()
+        segmented = [self.segment_transcript(transcript.text) for transcript in transcripts]
+        documents = [
+            (video, position)
+            for video, transcript_chunks in enumerate(segmented)
+            for position in range(len(transcript_chunks.chunks))
+        ]
+        index = BM25Index([segmented[video].terms[position] for video, position in documents])
+        hits = index.search(query, top_k)
+        if not hits:
+            logger.warning("No transcript chunk matches the request, using whole transcripts")
+            return [transcript.text for transcript in transcripts]
+
+        selected: dict[int, list[int]] = {}
+        for video, position in sorted(documents[document] for document, _ in hits):
+            selected.setdefault(video, []).append(position)
+        passages = [
+            PASSAGE_SEPARATOR.join(segmented[video].chunks[position] for position in positions)
+            for video, positions in selected.items()
+        ]
+        logger.info(
+            f"Retrieved {len(hits)}/{len(documents)} transcript chunk(s) from "
+            f"{len(selected)}/{len(transcripts)} video(s) in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return passages
 
     async def transcribe_videos(
         self,
@@ -159,16 +424,8 @@ class TranscriptionService:
         Returns:
             Concatenated transcription text
         """
-        if not video_urls:
-            return ""
-
-        transcriptions = []
-        for url in video_urls:
-            text = await self.transcribe_video_url(url, project_title)
-            if text:
-                transcriptions.append(text)
-
-        return "\n\n---\n\n".join(transcriptions)
+        transcripts = await self.transcribe_video_list(video_urls, project_title)
+        return TRANSCRIPT_SEPARATOR.join(transcript.text for transcript in transcripts)
 
 
 # Global singleton
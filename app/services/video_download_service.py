@@ -1,63 +1,151 @@
 """Service for downloading videos and extracting audio."""
 
 import logging
-import asyncio
 import tempfile
 from pathlib import Path
 from typing import Optional
-from slugify import slugify
 
-from pytubefix import YouTube
+import httpx
+from pytubefix import Stream, YouTube
 import pytubefix.exceptions as pytubefix_exceptions # Changed import
 
 from app.core.config import settings
+from app.core.executors import DOWNLOADS, get_executor, run_disk
+from app.core.singleflight import SingleFlight
 from app.core.utils import extract_youtube_id, extract_facebook_video_id
+from app.helpers.datetime_utils import now_utc
+from app.services.media_cache import get_media_cache, media_key
 
 logger = logging.getLogger(__name__)
 
+# Extra bytes fetched for a clip (container overhead, bitrate variations)
+CLIP_BYTES_MARGIN = 1.1
+
+# Timeout of the ranged request downloading a clip
+CLIP_DOWNLOAD_TIMEOUT = 120.0
+
+
+def _stream_bitrate(stream: Stream) -> int:
+    """Bitrate of a stream in bits per second (0 if unknown)."""
+    if stream.bitrate:
+        return stream.bitrate
+    if stream.abr:
+        return int(stream.abr.removesuffix("kbps")) * 1000
+    return 0
+
+
+def select_audio_stream(streams: list[Stream]) -> Optional[Stream]:
+    """Pick the smallest audio stream that is good enough for transcription.
+
+    The lowest-bitrate stream at or above AUDIO_MIN_BITRATE_KBPS wins, the
+    order of AUDIO_PREFERRED_CODECS breaking ties. When every stream is below
+    that floor, the best of them is used.
+
+    Args:
+        streams: Audio-only streams of a video
+
+    Returns:
+        Selected stream, or None if there is none
+    """
+    preferred = settings.audio_preferred_codecs
+
+    def codec_rank(stream: Stream) -> int:
+        codec = (stream.audio_codec or "").split(".")[0]
+        return preferred.index(codec) if codec in preferred else len(preferred)
+
+    floor = settings.audio_min_bitrate_kbps * 1000
+    adequate = [stream for stream in streams if _stream_bitrate(stream) >= floor]
+    if adequate:
+        return min(adequate, key=lambda stream: (_stream_bitrate(stream), codec_rank(stream)))
+    if streams:
+        return max(streams, key=lambda stream: (_stream_bitrate(stream), -codec_rank(stream)))
+    return None
+
+
+def clip_byte_count(stream: Stream, clip_minutes: int) -> Optional[int]:
+    """Estimate the bytes holding the first minutes of a stream.
+
+    Args:
+        stream: Audio stream
+        clip_minutes: Clip length in minutes
+
+    Returns:
+        Byte count, or None if the whole stream is needed (video shorter than
+        the clip, or size unknown)
+    """
+    clip_ms = clip_minutes * 60_000
+    duration_ms = int(stream.durationMs or 0)
+    if duration_ms and clip_ms >= duration_ms:
+        return None
+    if duration_ms and stream.filesize:
+        return int(stream.filesize * clip_ms / duration_ms * CLIP_BYTES_MARGIN)
+    bitrate = _stream_bitrate(stream)
+    if bitrate:
+        return int(bitrate / 8 * clip_ms / 1000 * CLIP_BYTES_MARGIN)
+    return None
+
+
+def _download_range(url: str, destination: Path, byte_count: int) -> None:
+    """Download the first bytes of a stream (blocking).
+
+    Args:
+        url: Signed stream URL
+        destination: File to write
+        byte_count: Number of bytes to fetch
+    """
+    # Same range parameter pytubefix uses for its chunked downloads
+    with httpx.stream("GET", f"{url}&range=0-{byte_count - 1}", timeout=CLIP_DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(destination, "wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+
 
 class VideoDownloadService:
     """Service for downloading and caching video audio."""
 
     def __init__(self):
         """Initialize video download service."""
+        # Downloads in flight per platform/video ID
+        self.singleflight: SingleFlight[Optional[Path]] = SingleFlight("audio_downloads")
         logger.info("VideoDownloadService initialized")
 
     def _get_audio_path(
         self,
         project_title: str,
         video_id: str,
-        platform: str = "youtube"
+        platform: str = "youtube",
+        clip_minutes: Optional[int] = None
     ) -> Path:
         """Get audio file path for a video.
 
+        Audio files live in the global media cache, shared by all projects.
+
         Args:
-            project_title: Project title for directory naming
+            project_title: Project title (its legacy audio file is moved to
+                the cache if the cache has none)
             video_id: Video ID (YouTube ID, Facebook ID, etc.)
             platform: Platform name (youtube, facebook)
+            clip_minutes: Length of the clip in minutes (None = whole video)
 
         Returns:
             Path to audio file
         """
-        # Slugify title for safe directory name
-        slug_title = slugify(project_title)
-        
-        # Create path: resources/videos/{slug_title}/video-inspiration/{video_id}.mp3
-        audio_dir = settings.videos_storage_dir / slug_title / "video-inspiration"
-        audio_dir.mkdir(parents=True, exist_ok=True)
-        
-        return audio_dir / f"{video_id}.mp3"
+        # Create path: resources/media-cache/{platform}/{video_id}/audio.mp3 (audio-{N}min.mp3 for clips)
+        return get_media_cache().audio_path(platform, video_id, project_title, clip_minutes)
 
     async def download_youtube_audio(
         self,
         url: str,
-        project_title: str
+        project_title: str,
+        clip_minutes: Optional[int] = None
     ) -> Optional[Path]:
         """Download audio from YouTube video.
 
         Args:
             url: YouTube video URL
             project_title: Project title for directory naming
+            clip_minutes: Only download the first minutes of the video (None = whole video)
 
         Returns:
             Path to downloaded audio file or None if failed
@@ -68,39 +156,86 @@ class VideoDownloadService:
             logger.error(f"Failed to extract YouTube ID from: {url}")
             return None
 
-        # Check if already downloaded
-        audio_path = self._get_audio_path(project_title, video_id, "youtube")
-        if audio_path.exists():
+        # Check if already downloaded (path lookup may move legacy files: off the event loop)
+        audio_path = await run_disk(self._get_audio_path, project_title, video_id, "youtube", clip_minutes)
+        if await run_disk(get_media_cache().verify, audio_path):
             logger.info(f"✅ Audio already exists (cached): {audio_path}")
             return audio_path
 
+        # Concurrent callers for the same video share one download
+        return await self.singleflight.do(
+            media_key("youtube", video_id, clip_minutes),
+            lambda: self._download_youtube_audio(url, video_id, audio_path, clip_minutes)
+        )
+
+    async def _download_youtube_audio(
+        self,
+        url: str,
+        video_id: str,
+        audio_path: Path,
+        clip_minutes: Optional[int] = None
+    ) -> Optional[Path]:
+        """Download the audio of a YouTube video to its cache path.
+
+        The smallest adequate audio stream is used (see select_audio_stream);
+        for a clip, only the bytes covering its minutes are fetched. The file
+        is downloaded to a temporary path and committed to the media cache
+        once complete, so an interrupted download never looks cached.
+
+        Args:
+            url: YouTube video URL
+            video_id: YouTube video ID
+            audio_path: Destination path
+            clip_minutes: Only download the first minutes of the video (None = whole video)
+
+        Returns:
+            Path to downloaded audio file or None if failed
+        """
+        # Another caller may have finished the download since our cache check
+        media_cache = get_media_cache()
+        if await run_disk(media_cache.verify, audio_path):
+            return audio_path
+
         logger.info(f"📥 Downloading YouTube audio: {video_id}")
+        partial_path = media_cache.partial_path(audio_path)
+        started_at = now_utc()
 
         try:
             # Download with pytube
             def download():
-                yt = YouTube(url, use_oauth=False, allow_oauth_cache=True) # Add oauth params
-                audio_stream = yt.streams.filter(only_audio=True).first()
-                if not audio_stream:
-                    raise pytubefix_exceptions.PytubeError("No audio stream found") # Use full path
-
-                # Download directly to the final location
-                # pytubefix's download method returns the full path of the downloaded file
-                downloaded_file_path = audio_stream.download(
-                    output_path=audio_path.parent,
-                    filename=audio_path.name
-                )
-                return Path(downloaded_file_path)
-
-            final_audio_path = await asyncio.to_thread(download)
-
-            if final_audio_path and final_audio_path.exists():
-                logger.info(f"✅ Downloaded YouTube audio: {final_audio_path}")
-                return final_audio_path
-            return None
+                # The temporary file is committed or deleted by this job, not by the awaiting
+                # coroutine: a cancelled caller stops waiting but the thread keeps writing
+                try:
+                    yt = YouTube(url, use_oauth=False, allow_oauth_cache=True) # Add oauth params
+                    audio_stream = select_audio_stream(list(yt.streams.filter(only_audio=True)))
+                    if not audio_stream:
+                        raise pytubefix_exceptions.PytubeFixError("No audio stream found") # Use full path
+                    logger.info(
+                        f"Selected audio stream {audio_stream.itag} of {video_id}: "
+                        f"{audio_stream.audio_codec}, {_stream_bitrate(audio_stream) // 1000} kbps"
+                    )
+
+                    byte_count = clip_byte_count(audio_stream, clip_minutes) if clip_minutes else None
+                    if byte_count is not None:
+                        _download_range(audio_stream.url, partial_path, byte_count)
+                        logger.info(f"Downloaded first {clip_minutes} min of {video_id} ({byte_count} bytes)")
+                    else:
+                        # Download to the temporary path, committed to the cache below
+                        audio_stream.download(
+                            output_path=partial_path.parent,
+                            filename=partial_path.name
+                        )
+                    media_cache.commit(partial_path, audio_path, url, started_at)
+                except BaseException:
+                    partial_path.unlink(missing_ok=True)
+                    raise
+
+            await get_executor(DOWNLOADS).run(download)
+            logger.info(f"✅ Downloaded YouTube audio: {audio_path}")
+            return audio_path
 
-        except pytubefix_exceptions.PytubeError as e: # Catch specific pytube errors
-            logger.error(f"❌ YouTube audio download (PytubeError) error: {e}")
+        except pytubefix_exceptions.PytubeFixError as e: # Catch specific pytubefix errors
+            logger.error(f"❌ YouTube audio download (PytubeFixError) error: {e}")
             return None
         except Exception as e:
             logger.error(f"❌ YouTube audio download (General Error) error: {e}")
@@ -129,19 +264,21 @@ class VideoDownloadService:
     async def download_video_audio(
         self,
         url: str,
-        project_title: str
+        project_title: str,
+        clip_minutes: Optional[int] = None
     ) -> Optional[Path]:
         """Download audio from video URL (auto-detect platform).
 
         Args:
             url: Video URL (YouTube/Facebook)
             project_title: Project title for directory naming
+            clip_minutes: Only download the first minutes of the video (None = whole video)
 
         Returns:
             Path to downloaded audio file or None if failed
         """
         if "youtube.com" in url or "youtu.be" in url:
-            return await self.download_youtube_audio(url, project_title)
+            return await self.download_youtube_audio(url, project_title, clip_minutes)
         elif "facebook.com" in url or "fb.watch" in url:
             return await self.download_facebook_video(url, project_title)
         else:
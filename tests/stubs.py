@@ -0,0 +1,115 @@
+"""Local stand-ins for the HTTP services the app talks to."""
+
+import json
+from typing import Any, Awaitable, Callable
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.llm_providers import LLMProvider
+
+Handler = Callable[[httpx.Request], Awaitable[httpx.Response]]
+
+
+def chat_completion_body(content: str, model: str = "stub-model", total_tokens: int = 30) -> dict[str, Any]:
+    """Build an OpenAI chat completion response body.
+
+    Args:
+        content: Assistant message content
+        model: Model reported by the provider
+        total_tokens: Total tokens reported in usage (split 2/3 prompt, 1/3 completion)
+
+    Returns:
+        JSON body
+    """
+    completion_tokens = total_tokens // 3
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": total_tokens - completion_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        },
+    }
+
+
+def error_response(status_code: int) -> httpx.Response:
+    """Build an OpenAI-style error response."""
+    return httpx.Response(status_code, json={"error": {"message": f"stub error {status_code}"}})
+
+
+def stub_provider(provider: LLMProvider, handler: Handler) -> None:
+    """Route a provider's requests to a local handler instead of the network.
+
+    Args:
+        provider: Provider to rewire
+        handler: Coroutine function answering each request
+    """
+    provider.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider.client = AsyncOpenAI(
+        api_key=provider.config.api_key,
+        base_url=provider.config.base_url,
+        http_client=provider.http_client,
+        max_retries=0,
+    )
+
+
+
+class StubAssemblyAI:
+    """In-memory AssemblyAI REST API: upload, transcript submission and status.
+
+    Transcripts stay "processing" until complete() or fail() is called.
+
+    Attributes:
+        uploads: Bodies of the uploaded files
+        submissions: Bodies of the transcript creation requests
+        polls: Number of status requests per transcript ID
+        upload_failures: Number of upload requests to answer with a 503
+    """
+
+    def __init__(self) -> None:
+        self.uploads: list[bytes] = []
+        self.submissions: list[dict[str, Any]] = []
+        self.polls: dict[str, int] = {}
+        self.upload_failures = 0
+        self.transcripts: dict[str, dict[str, Any]] = {}
+
+    def complete(self, transcript_id: str, text: str) -> None:
+        self.transcripts[transcript_id].update(status="completed", text=text)
+
+    def fail(self, transcript_id: str, error: str) -> None:
+        self.transcripts[transcript_id].update(status="error", error=error)
+
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client whose requests are answered by this stub."""
+        return httpx.AsyncClient(base_url="https://assemblyai.stub", transport=httpx.MockTransport(self.handle))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == "/v2/upload":
+            if self.upload_failures:
+                self.upload_failures -= 1
+                return httpx.Response(503, json={"error": "unavailable"})
+            self.uploads.append(await request.aread())
+            return httpx.Response(200, json={"upload_url": f"https://cdn.stub/upload-{len(self.uploads)}"})
+        if request.method == "POST" and path == "/v2/transcript":
+            body = json.loads(await request.aread())
+            self.submissions.append(body)
+            transcript_id = f"transcript-{len(self.submissions)}"
+            self.transcripts[transcript_id] = {"id": transcript_id, "status": "processing", "audio_url": body["audio_url"]}
+            return httpx.Response(200, json=self.transcripts[transcript_id])
+        if request.method == "GET" and path.startswith("/v2/transcript/"):
+            transcript_id = path.rsplit("/", 1)[1]
+            if transcript_id not in self.transcripts:
+                return httpx.Response(404, json={"error": "not found"})
+            self.polls[transcript_id] = self.polls.get(transcript_id, 0) + 1
+            return httpx.Response(200, json=self.transcripts[transcript_id])
+        return httpx.Response(404, json={"error": f"no route {request.method} {path}"})
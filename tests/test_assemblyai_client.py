@@ -0,0 +1,131 @@
+"""Tests for the AssemblyAI client against a stub AssemblyAI API."""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.retry import RetryPolicy
+from app.routes import webhooks
+from app.services import assemblyai_client as assemblyai_module
+from app.services.assemblyai_client import WEBHOOK_AUTH_HEADER, AssemblyAIClient, TranscriptionError
+from tests.stubs import StubAssemblyAI
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def stub() -> StubAssemblyAI:
+    return StubAssemblyAI()
+
+
+@pytest.fixture
+def audio(tmp_path: Path) -> Path:
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(b"ID3 fake audio " * 100)
+    return path
+
+
+@pytest.fixture
+async def client(stub: StubAssemblyAI, monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AssemblyAIClient]:
+    monkeypatch.setattr(settings, "assemblyai_poll_initial_interval", 0.01)
+    monkeypatch.setattr(settings, "assemblyai_poll_max_interval", 0.01)
+    client = AssemblyAIClient()
+    await client.http_client.aclose()
+    client.http_client = stub.client()
+    client.retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.01)
+    monkeypatch.setattr(assemblyai_module, "_assemblyai_client", client)
+    yield client
+    await client.aclose()
+
+
+async def complete_after_polls(stub: StubAssemblyAI, transcript_id: str, polls: int, text: str) -> None:
+    while stub.polls.get(transcript_id, 0) < polls:
+        await asyncio.sleep(0.005)
+    stub.complete(transcript_id, text)
+
+
+async def test_transcribe_uploads_submits_and_polls(client: AssemblyAIClient, stub: StubAssemblyAI, audio: Path) -> None:
+    completing = asyncio.create_task(complete_after_polls(stub, "transcript-1", 3, "Bonjour"))
+
+    text = await asyncio.wait_for(client.transcribe(audio), timeout=2)
+    await completing
+
+    assert text == "Bonjour"
+    assert stub.uploads == [audio.read_bytes()]
+    assert stub.submissions == [{"audio_url": "https://cdn.stub/upload-1"}]
+    assert stub.polls["transcript-1"] == 4
+    assert client.metrics["completed"] == 1
+    assert client.waiters == {}
+
+
+async def test_upload_is_retried_on_server_errors(client: AssemblyAIClient, stub: StubAssemblyAI, audio: Path) -> None:
+    stub.upload_failures = 2
+
+    assert await client.upload(audio) == "https://cdn.stub/upload-1"
+    assert stub.uploads == [audio.read_bytes()]
+
+
+async def test_failed_transcript_raises(client: AssemblyAIClient, stub: StubAssemblyAI) -> None:
+    transcript_id = await client.submit("https://cdn.stub/upload-1")
+    stub.fail(transcript_id, "audio too short")
+
+    with pytest.raises(TranscriptionError, match="audio too short"):
+        await client.wait(transcript_id)
+    assert client.metrics["failed"] == 1
+
+
+async def test_wait_gives_up_after_max_wait(
+    client: AssemblyAIClient, stub: StubAssemblyAI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "assemblyai_max_wait_seconds", 0.05)
+    transcript_id = await client.submit("https://cdn.stub/upload-1")
+
+    with pytest.raises(TranscriptionError, match="not finished"):
+        await asyncio.wait_for(client.wait(transcript_id), timeout=2)
+    assert client.metrics["timed_out"] == 1
+    assert client.waiters == {}
+
+
+async def test_submit_registers_the_webhook(
+    client: AssemblyAIClient, stub: StubAssemblyAI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "assemblyai_webhook_url", "https://app.example/api/v1/webhooks/assemblyai")
+    monkeypatch.setattr(settings, "assemblyai_webhook_secret", "s3cret")
+
+    await client.submit("https://cdn.stub/upload-1")
+
+    assert stub.submissions[0]["webhook_url"] == "https://app.example/api/v1/webhooks/assemblyai"
+    assert stub.submissions[0]["webhook_auth_header_name"] == WEBHOOK_AUTH_HEADER
+    assert stub.submissions[0]["webhook_auth_header_value"] == "s3cret"
+
+
+async def test_webhook_wakes_up_the_wait(
+    client: AssemblyAIClient, stub: StubAssemblyAI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Polls alone would not see the result before the test times out
+    client.poll_policy = RetryPolicy(base_delay=30, max_delay=30, jitter=0)
+    monkeypatch.setattr(settings, "assemblyai_webhook_secret", "s3cret")
+    app = FastAPI()
+    app.include_router(webhooks.router)
+    transcript_id = await client.submit("https://cdn.stub/upload-1")
+    waiting = asyncio.create_task(client.wait(transcript_id))
+    while stub.polls.get(transcript_id, 0) < 1:
+        await asyncio.sleep(0.005)
+    stub.complete(transcript_id, "Bonjour")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as http:
+        payload = {"transcript_id": transcript_id, "status": "completed"}
+        rejected = await http.post("/webhooks/assemblyai", json=payload, headers={WEBHOOK_AUTH_HEADER: "wrong"})
+        accepted = await http.post("/webhooks/assemblyai", json=payload, headers={WEBHOOK_AUTH_HEADER: "s3cret"})
+
+    transcript = await asyncio.wait_for(waiting, timeout=2)
+    assert rejected.status_code == 401
+    assert accepted.json() == {"transcript_id": transcript_id, "awaited": True}
+    assert transcript["text"] == "Bonjour"
+    assert stub.polls[transcript_id] == 2
+    assert client.metrics["webhook_wakeups"] == 1
@@ -0,0 +1,102 @@
+"""Tests for hedged LLM requests and their budget."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.hedging import HedgeBudget, Hedger
+
+pytestmark = pytest.mark.anyio
+
+AGENT = "TitleAgent"
+
+
+@pytest.fixture
+def hedger(monkeypatch: pytest.MonkeyPatch) -> Hedger:
+    """A hedger for AGENT that hedges after 10ms once it has seen two calls."""
+    monkeypatch.setattr(settings, "llm_hedge_agents", [AGENT])
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 2)
+    monkeypatch.setattr(settings, "llm_hedge_min_delay", 0.01)
+    monkeypatch.setattr(settings, "llm_hedge_budget_ratio", 1.0)
+    monkeypatch.setattr(settings, "llm_hedge_budget_burst", 5.0)
+    hedger = Hedger()
+    for _ in range(2):
+        hedger.latencies.record((AGENT, "<=256"), 0.001)
+    return hedger
+
+
+async def test_slow_request_is_hedged_and_loser_cancelled(hedger: Hedger) -> None:
+    attempts = 0
+    primary_cancelled = asyncio.Event()
+
+    async def request() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return f"attempt {attempts}"
+
+    assert await hedger.run(AGENT, 100, request) == "attempt 2"
+    assert primary_cancelled.is_set()
+    assert hedger.metrics[AGENT]["hedges"] == 1
+    assert hedger.metrics[AGENT]["hedge_wins"] == 1
+
+
+async def test_failed_request_waits_for_the_other(hedger: Hedger) -> None:
+    attempts = 0
+
+    async def request() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise RuntimeError("hedge failed")
+
+    assert await hedger.run(AGENT, 100, request) == "primary"
+
+
+async def test_hedge_is_denied_without_budget(hedger: Hedger) -> None:
+    hedger.budget = HedgeBudget(ratio=0.1, max_credits=5.0)
+    attempts = 0
+
+    async def request() -> str:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.03)
+        return "primary"
+
+    assert await hedger.run(AGENT, 100, request) == "primary"
+    assert attempts == 1
+    assert hedger.metrics[AGENT]["budget_denied"] == 1
+
+
+async def test_agents_not_listed_are_never_hedged(hedger: Hedger) -> None:
+    attempts = 0
+
+    async def request() -> str:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.03)
+        return "primary"
+
+    assert await hedger.run("SectionsAgent", 100, request) == "primary"
+    assert attempts == 1
+
+
+def test_budget_caps_hedges_to_a_fraction_of_calls() -> None:
+    budget = HedgeBudget(ratio=0.25, max_credits=2.0)
+    for _ in range(4):
+        budget.deposit()
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    for _ in range(100):
+        budget.deposit()
+    assert budget.credits == 2.0
@@ -0,0 +1,147 @@
+"""Tests for cross-replica leases, against an in-memory lease collection."""
+
+import asyncio
+import copy
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.lease import DONE, RUNNING, LeaseManager
+from app.helpers.datetime_utils import now_utc
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeLeaseCollection:
+    """Implements the few collection operations LeaseManager uses."""
+
+    def __init__(self) -> None:
+        self.documents: dict[str, dict[str, Any]] = {}
+
+    def _matches(self, document: dict[str, Any], query: dict[str, Any]) -> bool:
+        for field, condition in query.items():
+            value = document.get(field)
+            if isinstance(condition, dict):
+                if not value <= condition["$lte"]:
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def _find(self, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        document = self.documents.get(query["_id"])
+        return document if document is not None and self._matches(document, query) else None
+
+    async def create_index(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def insert_one(self, document: dict[str, Any]) -> None:
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError("duplicate key")
+        self.documents[document["_id"]] = dict(document)
+
+    async def find_one(self, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        document = self._find(query)
+        return copy.deepcopy(document)
+
+    async def find_one_and_update(self, query: dict[str, Any], update: dict[str, Any]) -> Optional[dict[str, Any]]:
+        document = self._find(query)
+        if document is None:
+            return None
+        previous = copy.deepcopy(document)
+        document.update(update["$set"])
+        return previous
+
+    async def update_one(self, query: dict[str, Any], update: dict[str, Any]) -> None:
+        document = self._find(query)
+        if document is not None:
+            document.update(update["$set"])
+
+    async def delete_one(self, query: dict[str, Any]) -> None:
+        if self._find(query) is not None:
+            del self.documents[query["_id"]]
+
+
+@pytest.fixture
+def collection(monkeypatch: pytest.MonkeyPatch) -> FakeLeaseCollection:
+    monkeypatch.setattr(settings, "lease_ttl_seconds", 0.15)
+    monkeypatch.setattr(settings, "lease_poll_interval", 0.01)
+    return FakeLeaseCollection()
+
+
+def replica(collection: FakeLeaseCollection) -> LeaseManager:
+    return LeaseManager({"leases": collection}, "leases")  # type: ignore[arg-type]
+
+
+def running_lease(owner: str, expires_at: datetime) -> dict[str, Any]:
+    return {"_id": "key", "owner": owner, "state": RUNNING, "result": None, "expires_at": expires_at}
+
+
+async def test_expired_lease_of_a_crashed_replica_is_taken_over(collection: FakeLeaseCollection) -> None:
+    collection.documents["key"] = running_lease("crashed", now_utc() - timedelta(seconds=1))
+    leases = replica(collection)
+
+    async def work() -> str:
+        return "result"
+
+    assert await leases.run_exclusive("key", work) == "result"
+    assert leases.metrics["taken_over"] == 1
+    assert collection.documents["key"]["owner"] == leases.owner
+    assert collection.documents["key"]["state"] == DONE
+
+
+async def test_waiter_takes_over_when_the_holder_stops_renewing(collection: FakeLeaseCollection) -> None:
+    collection.documents["key"] = running_lease("crashed", now_utc() + timedelta(seconds=0.1))
+    leases = replica(collection)
+
+    async def work() -> str:
+        return "result"
+
+    assert await asyncio.wait_for(leases.run_exclusive("key", work), timeout=2) == "result"
+    assert leases.metrics["waits"] == 1
+    assert leases.metrics["taken_over"] == 1
+
+
+async def test_renewed_lease_is_not_taken_over(collection: FakeLeaseCollection) -> None:
+    holder, waiter = replica(collection), replica(collection)
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        # Outlives several lease TTLs: only the heartbeat keeps the lease
+        await asyncio.sleep(0.5)
+        return "result"
+
+    results = await asyncio.gather(holder.run_exclusive("key", work), waiter.run_exclusive("key", work))
+
+    assert results == ["result", "result"]
+    assert calls == 1
+    assert waiter.metrics["reused"] == 1
+    assert waiter.metrics["taken_over"] == 0
+
+
+async def test_cancelled_holder_hands_the_lease_over(collection: FakeLeaseCollection) -> None:
+    holder, waiter = replica(collection), replica(collection)
+    started = asyncio.Event()
+
+    async def stuck() -> str:
+        started.set()
+        await asyncio.Event().wait()
+        return "never"
+
+    async def work() -> str:
+        return "result"
+
+    holding = asyncio.create_task(holder.run_exclusive("key", stuck))
+    await started.wait()
+    waiting = asyncio.create_task(waiter.run_exclusive("key", work))
+    await asyncio.sleep(0.03)
+    holding.cancel()
+
+    assert await asyncio.wait_for(waiting, timeout=1) == "result"
+    assert waiter.metrics["acquired"] == 1
+    assert waiter.metrics["taken_over"] == 0
@@ -0,0 +1,75 @@
+"""Tests for LLMClient completions against a local stub provider."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import LLMProviderConfig, settings
+from app.core.llm_client import LLMClient
+from app.core.request_context import collect_usage
+from app.core.usage import UsageCollector
+from tests.stubs import chat_completion_body, stub_provider
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [{"role": "user", "content": "Write a title"}]
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> LLMClient:
+    """An LLMClient with one stub provider and no cache, hedging or rate limits."""
+    monkeypatch.setattr(settings, "llm_providers", [
+        LLMProviderConfig(name="stub", base_url="http://llm.test/v1", api_key="test", model="stub-model"),
+    ])
+    monkeypatch.setattr(settings, "llm_cache_agents", [])
+    monkeypatch.setattr(settings, "llm_hedge_agents", [])
+    monkeypatch.setattr(settings, "llm_rate_limit_rpm", 0)
+    monkeypatch.setattr(settings, "llm_rate_limit_tpm", 0)
+    monkeypatch.setattr(settings, "llm_singleflight_enabled", True)
+    return LLMClient()
+
+
+async def test_coalesced_callers_account_a_coalesced_call(client: LLMClient) -> None:
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=chat_completion_body("A title", total_tokens=30))
+
+    stub_provider(client.providers.providers[0], handler)
+
+    async def generate(collector: UsageCollector) -> str:
+        with collect_usage(collector):
+            return await client.chat_completion(MESSAGES, agent="TitleAgent")
+
+    leader, follower = UsageCollector(), UsageCollector()
+    results = await asyncio.gather(generate(leader), generate(follower))
+
+    assert results == ["A title", "A title"]
+    assert requests == 1
+    assert leader.summary()["total"]["calls"] == 1
+    assert leader.summary()["total"]["prompt_tokens"] == 20
+    assert follower.summary()["total"]["calls"] == 0
+    assert follower.summary()["total"]["coalesced"] == 1
+
+
+async def test_calls_with_different_timeouts_are_not_coalesced(client: LLMClient) -> None:
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=chat_completion_body("A title"))
+
+    stub_provider(client.providers.providers[0], handler)
+
+    await asyncio.gather(
+        client.chat_completion(MESSAGES, agent="TitleAgent", timeout=5),
+        client.chat_completion(MESSAGES, agent="TitleAgent", timeout=60),
+    )
+
+    assert requests == 2
@@ -0,0 +1,175 @@
+"""Tests for provider failover and circuit breaking against local stub providers."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+from openai.types.chat import ChatCompletion
+
+from app.core.config import LLMProviderConfig, settings
+from app.core.llm_providers import CLOSED, HALF_OPEN, OPEN, LLMProvider, ProviderRegistry
+from tests.stubs import chat_completion_body, error_response, stub_provider
+
+pytestmark = pytest.mark.anyio
+
+
+class StubServer:
+    """An OpenAI-compatible endpoint answering with a configurable status."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.status_code = 200
+        self.requests = 0
+        self.gate: asyncio.Event | None = None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.status_code != 200:
+            return error_response(self.status_code)
+        return httpx.Response(200, json=chat_completion_body(f"from {self.name}"))
+
+
+@pytest.fixture(autouse=True)
+def circuit_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "llm_circuit_failure_threshold", 2)
+    monkeypatch.setattr(settings, "llm_circuit_min_samples", 100)
+    monkeypatch.setattr(settings, "llm_circuit_cooldown", 0.05)
+
+
+def make_registry(*servers: StubServer) -> ProviderRegistry:
+    """Build a registry whose providers (in priority order) are the given stub servers."""
+    registry = ProviderRegistry([
+        LLMProviderConfig(name=server.name, base_url=f"http://{server.name}.test/v1", api_key="test",
+                          model="stub-model", priority=index)
+        for index, server in enumerate(servers)
+    ])
+    for provider, server in zip(registry.providers, servers):
+        stub_provider(provider, server.handle)
+    return registry
+
+
+async def complete(provider: LLMProvider) -> str:
+    response: ChatCompletion = await provider.client.chat.completions.create(
+        model=provider.resolve_model(None),
+        messages=[{"role": "user", "content": "hi"}],
+    )
+    return response.choices[0].message.content or ""
+
+
+async def test_provider_errors_fail_over_to_the_next_provider() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 503
+    registry = make_registry(primary, secondary)
+
+    assert await registry.call(complete) == "from secondary"
+    assert primary.requests == 1
+    assert registry.providers[0].health.consecutive_failures == 1
+
+
+async def test_client_errors_are_raised_without_failover() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 400
+    registry = make_registry(primary, secondary)
+
+    with pytest.raises(openai.BadRequestError):
+        await registry.call(complete)
+    assert secondary.requests == 0
+    assert registry.providers[0].health.state == CLOSED
+
+
+async def test_last_provider_error_is_raised_when_all_fail() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = secondary.status_code = 502
+    registry = make_registry(primary, secondary)
+
+    with pytest.raises(openai.InternalServerError):
+        await registry.call(complete)
+    assert primary.requests == secondary.requests == 1
+
+
+async def test_open_circuit_is_skipped_until_cooldown() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 503
+    registry = make_registry(primary, secondary)
+    health = registry.providers[0].health
+
+    await registry.call(complete)
+    await registry.call(complete)
+    assert health.state == OPEN
+
+    assert await registry.call(complete) == "from secondary"
+    assert primary.requests == 2
+
+
+async def test_half_open_lets_a_single_probe_through_and_closes_on_success() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 503
+    registry = make_registry(primary, secondary)
+    health = registry.providers[0].health
+    await registry.call(complete)
+    await registry.call(complete)
+    assert health.state == OPEN
+
+    await asyncio.sleep(0.06)
+    primary.status_code = 200
+    primary.gate = asyncio.Event()
+    probe = asyncio.create_task(registry.call(complete))
+    await asyncio.sleep(0.01)
+    assert health.state == HALF_OPEN
+
+    # While the probe is in flight, other calls go elsewhere
+    assert await registry.call(complete) == "from secondary"
+    assert primary.requests == 3
+
+    primary.gate.set()
+    assert await probe == "from primary"
+    assert health.state == CLOSED
+
+
+async def test_failed_probe_reopens_the_circuit() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 503
+    registry = make_registry(primary, secondary)
+    health = registry.providers[0].health
+    await registry.call(complete)
+    await registry.call(complete)
+
+    await asyncio.sleep(0.06)
+    assert await registry.call(complete) == "from secondary"
+    assert primary.requests == 3
+    assert health.state == OPEN
+
+
+async def test_cancelled_probe_is_given_back() -> None:
+    primary, secondary = StubServer("primary"), StubServer("secondary")
+    primary.status_code = 503
+    registry = make_registry(primary, secondary)
+    health = registry.providers[0].health
+    await registry.call(complete)
+    await registry.call(complete)
+
+    await asyncio.sleep(0.06)
+    primary.gate = asyncio.Event()
+    probe = asyncio.create_task(registry.call(complete))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+
+    assert health.state == HALF_OPEN
+    assert not health.probing
+
+
+async def test_every_circuit_open_still_tries_the_oldest() -> None:
+    only = StubServer("only")
+    only.status_code = 503
+    registry = make_registry(only)
+    for _ in range(2):
+        with pytest.raises(openai.InternalServerError):
+            await registry.call(complete)
+    assert registry.providers[0].health.state == OPEN
+
+    only.status_code = 200
+    assert await registry.call(complete) == "from only"
@@ -0,0 +1,40 @@
+"""Tests for the shared media cache."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from app.services.media_cache import MANIFEST_NAME, PARTIAL_SUFFIX, STALE_PARTIAL_SECONDS, MediaCache
+
+
+def test_project_manifest_keeps_whole_video_and_clips_apart(tmp_path: Path) -> None:
+    cache = MediaCache(tmp_path / "cache", tmp_path / "projects")
+
+    cache.link_project("Mon projet", "youtube", "abc123", "https://youtu.be/abc123")
+    cache.link_project("Mon projet", "youtube", "abc123", None, clip_minutes=5)
+
+    manifest_path = next((tmp_path / "projects").rglob(MANIFEST_NAME))
+    videos = json.loads(manifest_path.read_text(encoding="utf-8"))["videos"]
+    assert set(videos) == {"youtube/abc123", "youtube/abc123@5min"}
+    assert videos["youtube/abc123"]["clip_minutes"] is None
+    assert videos["youtube/abc123@5min"]["clip_minutes"] == 5
+
+
+def test_sweep_deletes_only_stale_partial_files(tmp_path: Path) -> None:
+    cache = MediaCache(tmp_path / "cache", tmp_path / "projects")
+    entry = tmp_path / "cache" / "youtube" / "abc123"
+    entry.mkdir(parents=True)
+    stale = entry / f".audio.mp3.0a1b2c3d{PARTIAL_SUFFIX}"
+    fresh = entry / f".audio.mp3.4e5f6a7b{PARTIAL_SUFFIX}"
+    audio = entry / "audio.mp3"
+    for path in (stale, fresh, audio):
+        path.write_bytes(b"audio")
+    old = time.time() - STALE_PARTIAL_SECONDS - 60
+    os.utime(stale, (old, old))
+    os.utime(audio, (old, old))
+
+    assert cache.sweep_partials() == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    assert audio.exists()
@@ -0,0 +1,106 @@
+"""Tests for the stage dependency-graph executor."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.pipeline import Stage, StageEvent, StageFailedError, StagePipeline
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stages_receive_results_of_their_dependencies() -> None:
+    async def a(results: dict[str, Any]) -> int:
+        return 1
+
+    async def b(results: dict[str, Any]) -> int:
+        return results["a"] + 1
+
+    result = await StagePipeline([Stage("b", b, ("a",)), Stage("a", a)]).run()
+
+    assert result.results == {"a": 1, "b": 2}
+    assert set(result.durations()) == {"a", "b"}
+
+
+async def test_independent_stages_run_concurrently() -> None:
+    started: list[str] = []
+    both_started = asyncio.Event()
+
+    async def stage(results: dict[str, Any]) -> None:
+        started.append("x")
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+
+    await StagePipeline([Stage("a", stage), Stage("b", stage)]).run()
+
+    assert len(started) == 2
+
+
+async def test_failure_cancels_running_stages_and_skips_dependents() -> None:
+    sibling_cancelled = asyncio.Event()
+    dependent_ran = False
+    events: list[StageEvent] = []
+
+    async def failing(results: dict[str, Any]) -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def slow(results: dict[str, Any]) -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            sibling_cancelled.set()
+            raise
+
+    async def dependent(results: dict[str, Any]) -> None:
+        nonlocal dependent_ran
+        dependent_ran = True
+
+    pipeline = StagePipeline(
+        [Stage("failing", failing), Stage("slow", slow), Stage("dependent", dependent, ("failing",))],
+        listener=events.append,
+    )
+    with pytest.raises(StageFailedError) as excinfo:
+        await pipeline.run()
+
+    assert excinfo.value.stage == "failing"
+    assert isinstance(excinfo.value.__cause__, RuntimeError)
+    assert sibling_cancelled.is_set()
+    assert not dependent_ran
+    assert ("failing", "failed") in [(e.stage, e.status) for e in events]
+    assert ("slow", "cancelled") in [(e.stage, e.status) for e in events]
+
+
+async def test_cancelling_the_caller_cancels_every_stage() -> None:
+    cancelled: list[str] = []
+    running = asyncio.Event()
+
+    async def stage(results: dict[str, Any]) -> None:
+        running.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("stage")
+            raise
+
+    task = asyncio.create_task(StagePipeline([Stage("a", stage), Stage("b", stage)]).run())
+    await running.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert cancelled == ["stage", "stage"]
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    async def noop(results: dict[str, Any]) -> None:
+        return None
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        StagePipeline([Stage("a", noop), Stage("a", noop)])
+    with pytest.raises(ValueError, match="unknown stage"):
+        StagePipeline([Stage("a", noop, ("missing",))])
+    with pytest.raises(ValueError, match="Cycle"):
+        StagePipeline([Stage("a", noop, ("b",)), Stage("b", noop, ("a",))])
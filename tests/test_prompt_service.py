@@ -0,0 +1,53 @@
+"""Tests for prompt lookups and their in-memory cache."""
+
+import asyncio
+from typing import Any, Optional
+
+import pytest
+
+from app.services.prompt_service import PromptService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakePromptCollection:
+    """Stands in for the prompts collection, counting queries."""
+
+    def __init__(self) -> None:
+        self.document: Optional[dict[str, Any]] = None
+        self.queries = 0
+
+    async def find_one(self, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        self.queries += 1
+        await asyncio.sleep(0.01)
+        return self.document
+
+
+@pytest.fixture
+def collection() -> FakePromptCollection:
+    return FakePromptCollection()
+
+
+@pytest.fixture
+def service(collection: FakePromptCollection) -> PromptService:
+    return PromptService({"prompts": collection})  # type: ignore[arg-type]
+
+
+async def test_concurrent_lookups_share_one_query(service: PromptService, collection: FakePromptCollection) -> None:
+    collection.document = {"name": "title_prompt_fr", "language": "fr", "type": "title", "content": "Titre"}
+
+    contents = await asyncio.gather(*(service.get_prompt_content("title_prompt", "fr") for _ in range(5)))
+
+    assert contents == ["Titre"] * 5
+    assert collection.queries == 1
+    assert await service.get_prompt_content("title_prompt", "fr") == "Titre"
+    assert collection.queries == 1
+
+
+async def test_missing_prompt_is_not_cached(service: PromptService, collection: FakePromptCollection) -> None:
+    assert await service.get_prompt_content("title_prompt", "fr") is None
+
+    collection.document = {"name": "title_prompt_fr", "language": "fr", "type": "title", "content": "Titre"}
+
+    assert await service.get_prompt_content("title_prompt", "fr") == "Titre"
+    assert collection.queries == 2
@@ -0,0 +1,125 @@
+"""Tests for the client-side LLM rate limiter."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.core.config import settings
+from app.core.llm_client import AdaptiveConcurrency, LLMRateLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def limiter(monkeypatch: pytest.MonkeyPatch) -> LLMRateLimiter:
+    """A limiter allowing one call at a time, without rate buckets."""
+    monkeypatch.setattr(settings, "llm_rate_limit_rpm", 0)
+    monkeypatch.setattr(settings, "llm_rate_limit_tpm", 0)
+    monkeypatch.setattr(settings, "llm_concurrency_initial", 1)
+    monkeypatch.setattr(settings, "llm_concurrency_min", 1)
+    monkeypatch.setattr(settings, "llm_concurrency_max", 1)
+    return LLMRateLimiter()
+
+
+async def test_calls_are_granted_in_fifo_order(limiter: LLMRateLimiter) -> None:
+    order: list[int] = []
+
+    async def call(index: int) -> None:
+        async with limiter.acquire(10):
+            order.append(index)
+            await asyncio.sleep(0.001)
+
+    tasks = []
+    for index in range(5):
+        tasks.append(asyncio.create_task(call(index)))
+        await asyncio.sleep(0)  # Queue them in a known order
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_use == 0
+    assert limiter.granted == 5
+
+
+async def test_cancelled_waiter_is_skipped(limiter: LLMRateLimiter) -> None:
+    granted: list[str] = []
+
+    async def call(name: str) -> None:
+        async with limiter.acquire(10):
+            granted.append(name)
+
+    holder = limiter.acquire(10)
+    await holder.__aenter__()
+    waiting = asyncio.create_task(call("cancelled"))
+    queued = asyncio.create_task(call("next"))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    await asyncio.sleep(0)
+    await holder.__aexit__(None, None, None)
+    await asyncio.wait_for(queued, timeout=1)
+
+    assert granted == ["next"]
+    assert limiter.in_use == 0
+
+
+async def test_slot_granted_to_a_cancelled_caller_is_returned(limiter: LLMRateLimiter) -> None:
+    granted: list[str] = []
+
+    async def call(name: str) -> None:
+        async with limiter.acquire(10):
+            granted.append(name)
+
+    holder = limiter.acquire(10)
+    await holder.__aenter__()
+    first = asyncio.create_task(call("first"))
+    second = asyncio.create_task(call("second"))
+    await asyncio.sleep(0)
+
+    # Releasing grants the slot to "first", which is cancelled before it runs
+    await holder.__aexit__(None, None, None)
+    first.cancel()
+    await asyncio.wait_for(asyncio.gather(first, second, return_exceptions=True), timeout=1)
+
+    assert first.cancelled()
+    assert granted == ["second"]
+    assert limiter.in_use == 0
+
+
+async def test_requests_per_minute_bucket_delays_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "llm_rate_limit_rpm", 600)  # 10/s, burst of 600
+    monkeypatch.setattr(settings, "llm_rate_limit_tpm", 0)
+    limiter = LLMRateLimiter()
+    assert limiter.requests is not None
+    limiter.requests.level = 0.0
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with limiter.acquire(10):
+        pass
+
+    assert loop.time() - started >= 0.05
+
+
+async def test_rate_limited_call_halves_the_window(limiter: LLMRateLimiter) -> None:
+    limiter.concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=16, latency_tolerance=2.0)
+    response = httpx.Response(429, request=httpx.Request("POST", "https://llm.test/v1/chat/completions"))
+
+    with pytest.raises(openai.RateLimitError):
+        async with limiter.acquire(10):
+            raise openai.RateLimitError("slow down", response=response, body=None)
+
+    assert limiter.concurrency.limit == 4
+    assert limiter.throttled == 1
+    assert limiter.in_use == 0
+
+
+def test_window_grows_additively_and_backs_off_on_latency() -> None:
+    window = AdaptiveConcurrency(initial=2, minimum=1, maximum=4, latency_tolerance=2.0)
+    for _ in range(20):
+        window.on_success(latency=1.0, completion_tokens=100)
+    assert window.limit == 4
+
+    window.on_success(latency=10.0, completion_tokens=100)
+    assert window.limit == 2
@@ -0,0 +1,87 @@
+"""Tests for the coalescing of identical concurrent calls."""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_callers_share_one_call() -> None:
+    group: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(group.do("key", func) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert calls == 1
+    assert group.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+async def test_every_waiter_gets_the_error() -> None:
+    group: SingleFlight[int] = SingleFlight()
+
+    async def func() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(group.do("key", func) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not group.calls
+
+
+async def test_cancelled_waiter_does_not_cancel_the_shared_call() -> None:
+    group: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def func() -> int:
+        await release.wait()
+        return 1
+
+    first = asyncio.create_task(group.do("key", func))
+    second = asyncio.create_task(group.do("key", func))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == 1
+    assert first.cancelled()
+
+
+async def test_last_waiter_leaving_cancels_the_call() -> None:
+    group: SingleFlight[int] = SingleFlight()
+    call_cancelled = asyncio.Event()
+
+    async def func() -> int:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            call_cancelled.set()
+            raise
+        return 1
+
+    waiters = [asyncio.create_task(group.do("key", func)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+
+    await asyncio.wait_for(call_cancelled.wait(), timeout=1)
+    assert not group.calls
+    assert group.metrics["abandoned"] == 1
+
+    # A new call for the key starts afresh
+    async def quick() -> int:
+        return 2
+
+    assert await group.do("key", quick) == 2
@@ -0,0 +1,38 @@
+"""Tests for fitting prompt inputs into a token budget."""
+
+from app.core.tokens import MAIN_INPUT_MIN_SHARE, count_tokens, fit_prompt_inputs
+
+
+def words(count: int) -> str:
+    return " ".join(["word"] * count) + "."
+
+
+def test_inputs_within_budget_are_kept() -> None:
+    main, others = fit_prompt_inputs([words(50)], [words(20)], 1000)
+
+    assert main == [words(50)]
+    assert others == [words(20)]
+
+
+def test_long_secondary_input_leaves_the_main_share() -> None:
+    budget = 200
+    main, others = fit_prompt_inputs([words(500)], [words(500)], budget)
+
+    assert count_tokens(main[0]) >= budget * MAIN_INPUT_MIN_SHARE * 0.9
+    assert count_tokens(main[0]) + count_tokens(others[0]) <= budget
+
+
+def test_short_main_input_leaves_the_rest_to_secondary_inputs() -> None:
+    budget = 200
+    main, others = fit_prompt_inputs([words(10)], [words(500)], budget)
+
+    assert main == [words(10)]
+    assert count_tokens(others[0]) > budget * MAIN_INPUT_MIN_SHARE
+    assert count_tokens(main[0]) + count_tokens(others[0]) <= budget
+
+
+def test_no_main_input_gives_the_whole_budget_to_secondary_inputs() -> None:
+    main, others = fit_prompt_inputs([], [words(100)], 1000)
+
+    assert main == []
+    assert others == [words(100)]
@@ -0,0 +1,111 @@
+"""Tests for the cleanup of interrupted audio downloads."""
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pytest
+
+from app.services import media_cache as media_cache_module
+from app.services import video_download_service as download_module
+from app.services.media_cache import PARTIAL_SUFFIX, MediaCache
+from app.services.video_download_service import VideoDownloadService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeStream:
+    """Audio stream whose download blocks until released, then finishes or fails."""
+
+    itag = 140
+    audio_codec = "mp4a.40.2"
+    bitrate = 128_000
+    abr = None
+    url = "https://stream.stub/audio"
+    durationMs = None
+    filesize = None
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error: Optional[Exception] = None
+
+    def download(self, output_path: Path, filename: str) -> None:
+        path = Path(output_path) / filename
+        path.write_bytes(b"first chunk ")
+        self.started.set()
+        self.release.wait(timeout=5)
+        # Writes go on after the caller was cancelled
+        with open(path, "ab") as f:
+            f.write(b"last chunk")
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def stream(monkeypatch: pytest.MonkeyPatch) -> FakeStream:
+    stream = FakeStream()
+
+    class FakeYouTube:
+        def __init__(self, url: str, **kwargs: Any) -> None:
+            self.streams = self
+
+        def filter(self, only_audio: bool) -> list[FakeStream]:
+            return [stream]
+
+    monkeypatch.setattr(download_module, "YouTube", FakeYouTube)
+    return stream
+
+
+@pytest.fixture
+def cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> MediaCache:
+    cache = MediaCache(tmp_path / "cache", tmp_path / "projects")
+    monkeypatch.setattr(media_cache_module, "_media_cache", cache)
+    return cache
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+async def cancel_mid_download(stream: FakeStream, audio_path: Path) -> None:
+    """Start a download, cancel its caller while the file is being written, then let the job end."""
+    service = VideoDownloadService()
+    downloading = asyncio.create_task(
+        service._download_youtube_audio("https://youtu.be/abc123", "abc123", audio_path)
+    )
+    await asyncio.to_thread(stream.started.wait, 5)
+    downloading.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await downloading
+    stream.release.set()
+
+
+async def test_download_finished_after_cancellation_is_committed(stream: FakeStream, cache: MediaCache) -> None:
+    audio_path = cache.audio_path("youtube", "abc123", "Projet")
+
+    await cancel_mid_download(stream, audio_path)
+
+    await wait_until(lambda: cache.verify(audio_path))
+    assert audio_path.read_bytes() == b"first chunk last chunk"
+    assert list(audio_path.parent.glob(f"*{PARTIAL_SUFFIX}")) == []
+
+
+async def test_download_failed_after_cancellation_leaves_no_partial_file(
+    stream: FakeStream, cache: MediaCache
+) -> None:
+    stream.error = OSError("connection reset")
+    audio_path = cache.audio_path("youtube", "abc123", "Projet")
+
+    await cancel_mid_download(stream, audio_path)
+
+    await wait_until(lambda: list(audio_path.parent.glob(f"*{PARTIAL_SUFFIX}")) == [])
+    # Let the job's cleanup finish before checking nothing was cached
+    await asyncio.sleep(0.05)
+    assert not audio_path.exists()
+    assert list(audio_path.parent.glob(f"*{PARTIAL_SUFFIX}")) == []